@@ -0,0 +1 @@
+"""Бенчмарки Insight Bot (запуск: python -m benchmarks.<имя>)."""
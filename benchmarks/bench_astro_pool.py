@@ -0,0 +1,94 @@
+"""Задержка event loop при 100 одновременных расчётах натальных карт.
+
+Сравнивает расчёт прямо в event loop (как раньше в хендлерах) и через
+пул процессов. Пока идут расчёты, тикер каждые 10 мс замеряет, насколько
+позже положенного он проснулся, — это и есть задержка для остальных
+пользователей бота.
+
+    python -m benchmarks.bench_astro_pool
+"""
+
+import asyncio
+import random
+import statistics
+import time
+from datetime import date
+
+from bot.services.astro_pool import AstroPool
+from bot.services.astrology_engine import astrology
+
+REQUESTS = 100
+TICK = 0.01
+
+
+def _requests() -> list[tuple]:
+    rnd = random.Random(42)
+    return [
+        (
+            date(rnd.randint(1950, 2010), rnd.randint(1, 12), rnd.randint(1, 28)),
+            f"{rnd.randint(0, 23):02d}:{rnd.randint(0, 59):02d}",
+            rnd.uniform(40, 65),
+            rnd.uniform(20, 140),
+        )
+        for _ in range(REQUESTS)
+    ]
+
+
+async def _measure(work) -> tuple[float, list[float]]:
+    lags: list[float] = []
+    done = asyncio.Event()
+
+    async def ticker() -> None:
+        loop = asyncio.get_running_loop()
+        while not done.is_set():
+            expected = loop.time() + TICK
+            await asyncio.sleep(TICK)
+            lags.append(max(0.0, loop.time() - expected))
+
+    tick_task = asyncio.create_task(ticker())
+    await asyncio.sleep(TICK * 2)
+    started = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - started
+    done.set()
+    await tick_task
+    return elapsed, lags
+
+
+def _report(name: str, elapsed: float, lags: list[float]) -> None:
+    lags_ms = sorted(x * 1000 for x in lags) or [0.0]
+    p99 = lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))]
+    print(
+        f"{name:<14} total {elapsed * 1000:8.1f} ms | "
+        f"loop lag median {statistics.median(lags_ms):7.2f} ms, "
+        f"p99 {p99:7.2f} ms, max {lags_ms[-1]:7.2f} ms"
+    )
+
+
+async def main() -> None:
+    reqs = _requests()
+
+    async def inline_handler(args) -> None:
+        # Так хендлеры считали карту раньше — синхронно в event loop
+        astrology.calculate_natal_chart(*args)
+
+    async def inline() -> None:
+        await asyncio.gather(*(inline_handler(args) for args in reqs))
+
+    elapsed, lags = await _measure(inline)
+    _report("inline", elapsed, lags)
+
+    pool = AstroPool()
+    await pool.start()
+    try:
+        async def pooled() -> None:
+            await asyncio.gather(*(pool.natal_chart(*args) for args in reqs))
+
+        elapsed, lags = await _measure(pooled)
+        _report(f"pool x{pool.workers}", elapsed, lags)
+    finally:
+        await pool.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,53 @@
+"""Размер и скорость разбора кэша карт: JSON-список долгот против PackedChart.
+
+Сравнивает прежний формат chart_cache (JSON со списком долгот и pickle
+полного NatalChart, как он живёт в памяти) с упакованной картой и время
+разбора долгот для пакетных задач.
+
+    python -m benchmarks.bench_chart_packing
+"""
+
+import json
+import math
+import pickle
+import time
+from datetime import date
+
+import numpy as np
+
+from bot.services.astrology_engine import PackedChart, astrology, unpack_longitudes_many
+
+USERS = 10_000
+
+
+def main() -> None:
+    chart = astrology.calculate_natal_chart(date(1990, 5, 17), "14:30", 55.75, 37.61)
+    packed = PackedChart.from_chart(chart)
+
+    as_json = json.dumps([None if math.isnan(x) else round(float(x), 4) for x in chart.longitudes()])
+    print(f"JSON долгот:      {len(as_json.encode()):>5} байт")
+    print(f"pickle NatalChart: {len(pickle.dumps(chart)):>5} байт")
+    print(f"PackedChart:      {len(packed.to_bytes()):>5} байт")
+
+    error = np.abs((packed.longitudes() - chart.longitudes() + 180) % 360 - 180)
+    print(f"Погрешность долгот: {np.nanmax(error):.4f}°")
+    restored = PackedChart.from_bytes(packed.to_bytes())
+    for name in ("sun", "moon", "ascendant", "mercury"):
+        assert getattr(restored, name).display == getattr(chart, name).display, name
+
+    blobs = [packed.to_bytes()] * USERS
+    rows = [as_json] * USERS
+
+    started = time.perf_counter()
+    np.array([[math.nan if v is None else v for v in json.loads(row)] for row in rows], dtype=float)
+    json_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    unpack_longitudes_many(blobs)
+    packed_time = time.perf_counter() - started
+
+    print(f"Разбор {USERS} карт: JSON {json_time * 1000:.1f} мс, packed {packed_time * 1000:.2f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Загрузка колод: всё сразу в память против реестра decks.sqlite.
+
+«Всё сразу» — как было с литералом колоды в tarot.py: каждая колода
+целиком, со значениями, разбирается при старте. Реестр открывает базу,
+читает индекс одной колоды, а значения подгружает по карте.
+
+    python -m benchmarks.bench_deck_loading
+"""
+
+import json
+import time
+import tracemalloc
+
+from bot.data import build_decks
+from bot.services.tarot import ArcanaType, DeckRegistry, Suit
+
+ROUNDS = 20
+
+
+def _eager_load() -> dict:
+    decks = {}
+    for path in build_decks.source_paths():
+        deck = json.loads(path.read_text(encoding="utf-8"))
+        decks[deck["id"]] = [
+            (card["id"], card["name"], card["name_ru"], ArcanaType(card["arcana"]), Suit(card["suit"]),
+             card["number"], tuple(card["keywords"]), card["element"], card["upright"], card["reversed"])
+            for card in deck["cards"]
+        ]
+    return decks
+
+
+def _registry_load(deck_ids: tuple) -> DeckRegistry:
+    registry = DeckRegistry()
+    for deck_id in deck_ids:
+        registry.get(deck_id)
+    return registry
+
+
+def _measure(name: str, load) -> None:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        load()
+    elapsed = (time.perf_counter() - started) / ROUNDS
+    tracemalloc.start()
+    result = load()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f"  {name:<28} {elapsed * 1000:>7.2f} мс  {size / 1024:>7.1f} КБ")
+
+
+def main() -> None:
+    all_decks = tuple(info.id for info in DeckRegistry().available())
+    print(f"Колоды: {', '.join(all_decks)}")
+    _measure("всё сразу, со значениями", _eager_load)
+    _measure("реестр: только rws", lambda: _registry_load(("rws",)))
+    _measure("реестр: все колоды", lambda: _registry_load(all_decks))
+
+    registry = _registry_load(all_decks)
+    cards = [card for deck_id in all_decks for card in registry.get(deck_id)]
+    started = time.perf_counter()
+    for card in cards:
+        registry.meaning(card.deck, card.id)
+    cold = (time.perf_counter() - started) / len(cards)
+    started = time.perf_counter()
+    for _ in range(100):
+        for card in cards[:128]:
+            registry.meaning(card.deck, card.id)
+    warm = (time.perf_counter() - started) / (100 * 128)
+    print(f"Значение карты: из базы {cold * 1e6:.1f} мкс, из кэша {warm * 1e6:.2f} мкс")
+
+
+if __name__ == "__main__":
+    main()
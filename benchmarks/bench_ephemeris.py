@@ -0,0 +1,102 @@
+"""Точность и скорость аналитических эфемерид.
+
+Сверяет долготы планет, Асцендент и MC со Swiss Ephemeris (через flatlib)
+на случайных моментах 1900–2050, куспиды домов — с swe.houses, и замеряет,
+сколько карт в секунду считается пачкой.
+
+    python -m benchmarks.bench_ephemeris
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from bot.services import ephemeris, houses
+from bot.services.astrology_engine import CHART_POINTS, PLANET_NAMES
+
+SAMPLES = 300
+BATCH = 10_000
+
+
+def _moments(n: int, seed: int = 1) -> list[tuple[datetime, float, float]]:
+    rnd = random.Random(seed)
+    start, span = datetime(1900, 1, 1), 150 * 365 * 24 * 60
+    return [
+        (start + timedelta(minutes=rnd.randrange(span)), rnd.uniform(-60, 65), rnd.uniform(-180, 180))
+        for _ in range(n)
+    ]
+
+
+def accuracy() -> None:
+    try:
+        from flatlib import const
+        from flatlib.chart import Chart
+        from flatlib.datetime import Datetime
+        from flatlib.geopos import GeoPos
+    except ImportError:
+        print("flatlib не установлен — сверка пропущена")
+        return
+
+    samples = _moments(SAMPLES)
+    reference = []
+    for moment, lat, lon in samples:
+        chart = Chart(
+            Datetime(moment.strftime("%Y/%m/%d"), moment.strftime("%H:%M"), "+00:00"),
+            GeoPos(lat, lon),
+            IDs=list(PLANET_NAMES),
+        )
+        reference.append([chart.get(p).lon for p in PLANET_NAMES] + [chart.get(const.ASC).lon])
+
+    jd = ephemeris.julian_days([m for m, _, _ in samples])
+    lats = np.array([lat for _, lat, _ in samples])
+    lons = np.array([lon for _, _, lon in samples])
+    ours, _ = ephemeris.chart_longitudes(jd, lats, lons)
+
+    error = np.abs((ours - np.array(reference) + 180) % 360 - 180)
+    print(f"Отклонение от Swiss Ephemeris, {SAMPLES} моментов 1900–2050 (градусы):")
+    for i, name in enumerate(CHART_POINTS):
+        print(f"  {name:<10} среднее {error[:, i].mean():.4f}  макс {error[:, i].max():.4f}")
+
+
+def house_accuracy() -> None:
+    try:
+        import swisseph as swe
+    except ImportError:
+        print("swisseph не установлен — сверка домов пропущена")
+        return
+
+    codes = {houses.PLACIDUS: b"P", houses.KOCH: b"K", houses.WHOLE_SIGN: b"W"}
+    samples = _moments(SAMPLES, seed=3)
+    print(f"Куспиды домов против swe.houses, {SAMPLES} карт (градусы):")
+    for system, code in codes.items():
+        errors = []
+        started = time.perf_counter()
+        for moment, lat, lon in samples:
+            jd = float(ephemeris.julian_day(moment))
+            ours = houses.cusps_at(jd, lat, lon, system)
+            reference = np.array(swe.houses(jd, lat, lon, code)[0])
+            errors.append(np.abs((ours - reference + 180) % 360 - 180).max())
+        elapsed = (time.perf_counter() - started) / SAMPLES
+        print(f"  {system:<10} среднее {np.mean(errors):.5f}  макс {np.max(errors):.5f}  "
+              f"{elapsed * 1e6:.0f} мкс/карта")
+
+
+def throughput() -> None:
+    samples = _moments(BATCH, seed=2)
+    jd = ephemeris.julian_days([m for m, _, _ in samples])
+    lats = np.array([lat for _, lat, _ in samples])
+    lons = np.array([lon for _, _, lon in samples])
+
+    ephemeris.chart_longitudes(jd[:10], lats[:10], lons[:10])
+    started = time.perf_counter()
+    ephemeris.chart_longitudes(jd, lats, lons)
+    elapsed = time.perf_counter() - started
+    print(f"Пачка {BATCH} карт: {elapsed * 1000:.1f} мс, {BATCH / elapsed:,.0f} карт/с")
+
+
+if __name__ == "__main__":
+    accuracy()
+    house_accuracy()
+    throughput()
@@ -0,0 +1,37 @@
+"""Время матрицы совместимости группы.
+
+N·(N−1)/2 сеток аспектов 11×11 считаются одним тензором; для группы
+из 200 человек это ~20 тыс. пар.
+
+    python -m benchmarks.bench_group_matrix
+"""
+
+import time
+
+import numpy as np
+
+from bot.services import ephemeris
+from bot.services.synastry import synastry
+
+SIZES = (10, 50, 100, 200, 500)
+REPEATS = 5
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    for n in SIZES:
+        lons, _ = ephemeris.chart_longitudes(
+            rng.uniform(2415020, 2460000, n), rng.uniform(-50, 60, n), rng.uniform(-180, 180, n)
+        )
+        synastry.matrix(lons[:3])
+        timings = []
+        for _ in range(REPEATS):
+            started = time.perf_counter()
+            synastry.matrix(lons)
+            timings.append(time.perf_counter() - started)
+        pairs = n * (n - 1) // 2
+        print(f"N={n:>4} ({pairs:>6} пар): {min(timings) * 1000:8.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""История раскладов: OFFSET против keyset-страниц на 10 000 раскладов пользователя.
+
+Нужен Postgres из настроек бота (DATABASE_URL / .env) с актуальной схемой.
+Бенчмарк пишет расклады синтетическим пользователям с отрицательными id,
+делает VACUUM ANALYZE (для index-only scan нужна карта видимости) и в
+конце удаляет их.
+
+    python -m benchmarks.bench_reading_history
+"""
+
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from bot.config import settings
+from bot.database import TarotReading
+from bot.services.reading_history import PAGE_SIZE, history_query
+
+READINGS_PER_USER = 10_000
+USERS = 10
+TARGET_USER = -1
+DEPTHS = (0, 10, 100, 500, 999)
+REPEATS = 30
+
+_FILL = text("""
+    INSERT INTO tarot_readings
+        (user_id, spread_type, seed, deck_version, question, ai_interpretation, is_premium, created_at)
+    SELECT -u, 'three_cards', (random() * 1e15)::bigint, 1,
+           'Что меня ждёт в этом месяце?', repeat('Развёрнутая AI-трактовка расклада. ', 60),
+           true, now() - g * interval '37 minutes'
+    FROM generate_series(1, :users) AS u, generate_series(1, :per_user) AS g
+""")
+
+# Тот же запрос, что history_query() с курсором, — для EXPLAIN
+_EXPLAIN_KEYSET = text("""
+    EXPLAIN (ANALYZE, BUFFERS)
+    SELECT id, created_at, spread_type, seed, deck_version, cards
+    FROM tarot_readings
+    WHERE user_id = :user_id AND (created_at, id) < (:created_at, :id)
+    ORDER BY created_at DESC, id DESC
+    LIMIT :limit
+""")
+
+
+def _offset_query(page: int):
+    """Прежний подход: полные строки и OFFSET."""
+    return (
+        select(TarotReading)
+        .where(TarotReading.user_id == TARGET_USER)
+        .order_by(TarotReading.created_at.desc(), TarotReading.id.desc())
+        .offset(page * PAGE_SIZE)
+        .limit(PAGE_SIZE)
+    )
+
+
+async def _timed(conn, query) -> float:
+    samples = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        (await conn.execute(query)).all()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+async def main() -> None:
+    engine = create_async_engine(settings.database_url)
+    cleanup = delete(TarotReading).where(TarotReading.user_id < 0)
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(cleanup)
+            await conn.execute(_FILL, {"users": USERS, "per_user": READINGS_PER_USER})
+        async with engine.connect() as conn:
+            await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text("VACUUM ANALYZE tarot_readings"))
+
+        async with engine.connect() as conn:
+            print(f"{'страница':>9} {'OFFSET, мс':>11} {'keyset, мс':>11}")
+            for page in DEPTHS:
+                cursor = None
+                if page:
+                    row = (await conn.execute(
+                        select(TarotReading.created_at, TarotReading.id)
+                        .where(TarotReading.user_id == TARGET_USER)
+                        .order_by(TarotReading.created_at.desc(), TarotReading.id.desc())
+                        .offset(page * PAGE_SIZE - 1)
+                        .limit(1)
+                    )).one()
+                    cursor = (row.created_at, row.id)
+                offset_ms = await _timed(conn, _offset_query(page))
+                keyset_ms = await _timed(conn, history_query(TARGET_USER, cursor))
+                print(f"{page + 1:>9} {offset_ms:>11.2f} {keyset_ms:>11.2f}")
+
+            plan = await conn.execute(_EXPLAIN_KEYSET, {
+                "user_id": TARGET_USER, "created_at": cursor[0], "id": cursor[1], "limit": PAGE_SIZE + 1,
+            })
+            print("\nПлан последней keyset-страницы:")
+            for (line,) in plan:
+                print(f"  {line}")
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(cleanup)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,44 @@
+"""Размер сохранённого расклада: прежний cards_json, pack_cards и зерно.
+
+Прежний формат — JSON с полной копией каждой карты (названия, ключевые
+слова, оба абзаца значения), как его писал обработчик. Проекция на
+таблицу — только полезная нагрузка колонок, без заголовков строк. Зерно
+с версией колоды — BIGINT + SMALLINT, 10 байт на любой расклад.
+
+    python -m benchmarks.bench_reading_size
+"""
+
+import json
+import struct
+
+from bot.services.tarot import SPREADS, pack_cards, tarot
+
+READINGS = 1_000_000
+SEED_BYTES = struct.calcsize("<qh")
+
+
+def main() -> None:
+    print(f"{'расклад':<16} {'JSON':>7} {'packed':>7} {'seed':>5} {'на 1M раскладов, МБ':>28}")
+    for spread_type in SPREADS:
+        result = tarot.do_spread(spread_type)
+        as_json = json.dumps(
+            [{"position": item["position"], "card": item["card"].to_dict()} for item in result["cards"]],
+            ensure_ascii=False,
+        ).encode()
+        packed = pack_cards([item["card"] for item in result["cards"]])
+
+        restored = tarot.restore_spread(spread_type, packed)
+        assert [r["card"] for r in restored] == [item["card"] for item in result["cards"]]
+        assert [r["position"] for r in restored] == [item["position"] for item in result["cards"]]
+        replayed = tarot.replay_spread(spread_type, result["seed"], result["deck_version"])
+        assert replayed["cards"] == result["cards"]
+
+        mb = READINGS / 2**20
+        print(
+            f"{spread_type:<16} {len(as_json):>7} {len(packed):>7} {SEED_BYTES:>5}"
+            f"   {len(as_json) * mb:>8.0f} → {len(packed) * mb:>5.1f} → {SEED_BYTES * mb:>4.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Скорость рендера раскладов: сборка текста на каждый запрос против готовых фрагментов.
+
+Прежний рендер (история карты, метка перевёрнутой, склейка ключевых слов
+на каждую карту) воспроизведён здесь для сравнения с tarot_render.
+
+    python -m benchmarks.bench_spread_render
+"""
+
+import time
+
+from bot.services import tarot_render
+from bot.services.tarot import SPREADS, DrawnCard, decks, tarot
+from bot.utils.personalization import get_card_story
+
+ROUNDS = 50_000
+
+
+def _legacy_story_block(label: str, card) -> str:
+    reversed_mark = " (перевёрнутая)" if card.reversed else ""
+    story = get_card_story(card.name_ru, card.reversed)
+    return f"<b>{label} — {card.name_ru}{reversed_mark}:</b>\n{story}"
+
+
+def _legacy_three_cards(result: dict) -> str:
+    return "\n\n".join(
+        _legacy_story_block(label, item["card"])
+        for label, item in zip(("Прошлое", "Настоящее", "Будущее"), result["cards"])
+    )
+
+
+def _fragment_three_cards(result: dict) -> str:
+    block = tarot_render.card_block
+    return "\n\n".join(
+        block(item["card"], style)
+        for style, item in zip(("past", "present", "future"), result["cards"])
+    )
+
+
+def _legacy_list(spread_result: dict) -> str:
+    lines = [f"🃏 <b>{spread_result['spread']['name_ru']}</b>\n"]
+    for item in spread_result["cards"]:
+        card = item["card"]
+        rev_text = " (перевёрнутая)" if card.reversed else ""
+        kw = ", ".join(card.keywords) if card.keywords else ""
+        lines.append("━━━━━━━━━━━━━━━")
+        lines.append(f"<b>{item['position']}:</b> {card.display_name}{rev_text}")
+        if kw:
+            lines.append(f"🔑 <i>{kw}</i>")
+        lines.append("")
+        meaning = card.get_meaning()
+        if meaning:
+            lines.append(f"💬 {meaning}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _measure(name: str, render, spreads: list) -> None:
+    started = time.perf_counter()
+    for spread in spreads:
+        render(spread)
+    elapsed = time.perf_counter() - started
+    print(f"  {name:<10} {len(spreads) / elapsed:>10,.0f} раскладов/с")
+
+
+def _check_handler_formatters() -> None:
+    """Каждый расклад из SPREADS проходит через форматтер хендлера."""
+    from bot.handlers.tarot import _format_spread
+
+    for spread_type in SPREADS:
+        for seed in range(200):
+            result = tarot.do_spread(spread_type, seed=seed)
+            assert _format_spread(spread_type, result, "Друг", "Вопрос?")
+
+
+def main() -> None:
+    _check_handler_formatters()
+    started = time.perf_counter()
+    fragments = tarot_render.FRAGMENTS
+    for card in decks.get():
+        for reversed_ in (False, True):
+            tarot_render.card_block(DrawnCard(card, reversed_), tarot_render.LIST)
+    print(f"Фрагментов: {len(fragments)}, сборка {(time.perf_counter() - started) * 1000:.1f} мс")
+
+    three = [tarot.do_spread("three_cards", seed=seed) for seed in range(ROUNDS)]
+    for spread in three[:1000]:
+        assert _legacy_three_cards(spread) == _fragment_three_cards(spread)
+    print("three_cards, блоки карт:")
+    _measure("прежний", _legacy_three_cards, three)
+    _measure("фрагменты", _fragment_three_cards, three)
+
+    cross = [tarot.do_spread("celtic_cross", seed=seed) for seed in range(ROUNDS)]
+    for spread in cross[:1000]:
+        assert _legacy_list(spread) == tarot_render.render_list(spread)
+    print("celtic_cross, format_spread_text:")
+    _measure("прежний", _legacy_list, cross)
+    _measure("фрагменты", tarot_render.render_list, cross)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Скорость раскладов и память на расклад.
+
+Прежняя схема (фильтр всей колоды списком и копия dataclass на каждую
+вытянутую карту) воспроизведена здесь для сравнения с флайвейтами
+TarotCard и представлениями DrawnCard. Подколоды (только Старшие арканы,
+одна масть, веса карт) сравниваются с фильтром колоды на каждый расклад.
+
+    python -m benchmarks.bench_tarot_draws
+"""
+
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+from bot.services.tarot import (
+    MAJOR_ARCANA,
+    SPREADS,
+    ArcanaType,
+    DeckConfig,
+    Suit,
+    decks,
+    suit_deck,
+    tarot,
+)
+
+ROUNDS = 20_000
+DECK = decks.get()
+
+
+@dataclass
+class _CopiedCard:
+    id: int
+    name: str
+    name_ru: str
+    arcana: object
+    suit: object
+    number: int
+    keywords: list
+    element: str
+    meaning_upright: str = ""
+    meaning_reversed: str = ""
+    reversed: bool = False
+
+
+def _legacy_draw(count: int, exclude=None) -> list:
+    available = [c for c in DECK if (exclude is None or c.id not in exclude)]
+    chosen = random.sample(available, min(count, len(available)))
+    return [
+        _CopiedCard(
+            id=card.id, name=card.name, name_ru=card.name_ru,
+            arcana=card.arcana, suit=card.suit, number=card.number,
+            keywords=list(card.keywords), element=card.element,
+            meaning_upright=card.meaning_upright,
+            meaning_reversed=card.meaning_reversed,
+            reversed=random.random() < 0.3,
+        )
+        for card in chosen
+    ]
+
+
+def _legacy_subset_draw(predicate, weights=None):
+    """Подколода списком на каждый расклад; веса — random.choices с отбрасыванием повторов."""
+    def draw(count: int) -> list:
+        cards = [c for c in DECK if predicate(c)]
+        if weights is None:
+            chosen = random.sample(cards, min(count, len(cards)))
+        else:
+            chosen = []
+            card_weights = [weights.get(c.id, 1.0) for c in cards]
+            while len(chosen) < count:
+                card = random.choices(cards, card_weights)[0]
+                if card not in chosen:
+                    chosen.append(card)
+        return [(card, random.random() < 0.3) for card in chosen]
+    return draw
+
+
+def _measure(name: str, draw, count: int) -> None:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        draw(count)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [draw(count) for _ in range(100)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del kept
+
+    print(f"  {name:<10} {ROUNDS / elapsed:>10,.0f} раскладов/с   {allocated / 100:>6.0f} байт на расклад")
+
+
+def main() -> None:
+    for spread in ("three_cards", "celtic_cross"):
+        count = SPREADS[spread]["cards_count"]
+        print(f"{spread} (карт: {count}):")
+        _measure("прежняя", _legacy_draw, count)
+        _measure("флайвейт", tarot.draw_cards, count)
+
+    weights = {card.id: 3.0 for card in DECK if card.arcana is ArcanaType.MAJOR and card.number % 2 == 0}
+    subsets = (
+        ("Старшие арканы", lambda c: c.arcana is ArcanaType.MAJOR, None, MAJOR_ARCANA),
+        ("масть Кубков", lambda c: c.suit is Suit.CUPS, None, suit_deck(Suit.CUPS)),
+        ("веса карт", lambda c: True, weights, DeckConfig(weights=tuple(weights.items()))),
+    )
+    for title, predicate, card_weights, config in subsets:
+        print(f"{title} (карт: 3):")
+        _measure("фильтр", _legacy_subset_draw(predicate, card_weights), 3)
+        _measure("сэмплер", lambda count, config=config: tarot.draw_cards(count, config=config), 3)
+
+if __name__ == "__main__":
+    main()
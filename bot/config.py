@@ -40,6 +40,13 @@ class Settings(BaseSettings):
     rate_limit_premium_daily: int = 50
     log_level: str = "INFO"
 
+    # Astrology
+    astro_workers: int = 2
+    # Система домов: placidus, koch, whole_sign
+    house_system: str = "placidus"
+    # Дневные гороскопы знаков пишет AI (12 запросов в сутки), иначе — шаблон
+    horoscope_ai: bool = True
+
     # Superadmin
     super_admin_username: str = "ALTLPU"
 
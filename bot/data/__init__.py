@@ -0,0 +1 @@
+"""Данные колод: исходники в decks/*.json, рабочая база — decks.sqlite."""
@@ -0,0 +1,101 @@
+"""Сборка decks.sqlite из исходников колод decks/*.json.
+
+Индекс карт (имена, масти, ключевые слова) и значения лежат в разных
+таблицах: реестр колод читает индекс при первом обращении к колоде, а
+длинные тексты значений — по одной карте, когда они понадобились.
+
+    python -m bot.data.build_decks
+"""
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parent
+SOURCES_DIR = DATA_DIR / "decks"
+DB_PATH = DATA_DIR / "decks.sqlite"
+# Порядок колод в списке выбора; колода по умолчанию — первая
+DECK_ORDER = ("rws", "thoth", "lenormand")
+
+SCHEMA = """
+CREATE TABLE decks (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    name_ru TEXT NOT NULL,
+    reversed_rate REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE cards (
+    deck TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    name_ru TEXT NOT NULL,
+    arcana TEXT NOT NULL,
+    suit TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    element TEXT NOT NULL,
+    keywords TEXT NOT NULL,
+    PRIMARY KEY (deck, id)
+) WITHOUT ROWID;
+CREATE TABLE meanings (
+    deck TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    upright TEXT NOT NULL,
+    reversed TEXT NOT NULL,
+    PRIMARY KEY (deck, id)
+) WITHOUT ROWID;
+"""
+
+KEYWORD_SEPARATOR = "|"
+
+
+def source_paths() -> list[Path]:
+    return sorted(SOURCES_DIR.glob("*.json"))
+
+
+def _load_sources() -> list[dict]:
+    decks = [json.loads(path.read_text(encoding="utf-8")) for path in source_paths()]
+    order = {deck_id: i for i, deck_id in enumerate(DECK_ORDER)}
+    return sorted(decks, key=lambda deck: (order.get(deck["id"], len(order)), deck["id"]))
+
+
+def build(db_path: Path = DB_PATH) -> Path:
+    """Собрать базу во временный файл и атомарно заменить прежнюю."""
+    tmp_path = db_path.with_suffix(f".tmp{os.getpid()}")
+    tmp_path.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        for position, deck in enumerate(_load_sources()):
+            cards = deck["cards"]
+            if [card["id"] for card in cards] != list(range(len(cards))):
+                raise ValueError(f"Deck {deck['id']}: card ids must be 0..{len(cards) - 1} in order")
+            conn.execute(
+                "INSERT INTO decks VALUES (?, ?, ?, ?, ?, ?)",
+                (deck["id"], position, deck["name"], deck["name_ru"], deck["reversed_rate"], len(cards)),
+            )
+            conn.executemany(
+                "INSERT INTO cards VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (deck["id"], card["id"], card["name"], card["name_ru"], card["arcana"], card["suit"],
+                     card["number"], card["element"], KEYWORD_SEPARATOR.join(card["keywords"]))
+                    for card in cards
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO meanings VALUES (?, ?, ?, ?)",
+                [(deck["id"], card["id"], card["upright"], card["reversed"]) for card in cards],
+            )
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+    return db_path
+
+
+if __name__ == "__main__":
+    path = build()
+    print(f"{path}: {path.stat().st_size} bytes")
@@ -3,7 +3,7 @@
 from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import BigInteger, Boolean, DateTime, Integer, String, Text, Date, Time, JSON, Float, func
+from sqlalchemy import BigInteger, Boolean, DateTime, Integer, String, Text, Date, Time, JSON, Float, Index, LargeBinary, SmallInteger, UniqueConstraint, func, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -60,19 +60,121 @@ class NumerologyCache(Base):
     personal_year_for: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
 
+class ChartCache(Base):
+    __tablename__ = "chart_cache"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(Integer, unique=True, index=True)
+    birth_key: Mapped[str] = mapped_column(String(64))
+    # PackedChart: долготы uint16 в сотых градуса, маска ретроградности, дома
+    packed: Mapped[bytes] = mapped_column(LargeBinary)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class SavedPartner(Base):
+    __tablename__ = "saved_partners"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(Integer, index=True)
+    name: Mapped[str] = mapped_column(String(64))
+    birth_date: Mapped[datetime] = mapped_column(Date)
+    birth_time: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
+    birth_place: Mapped[Optional[str]] = mapped_column(String(256), nullable=True)
+    birth_lat: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    birth_lon: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    longitudes: Mapped[list] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class GroupMember(Base):
+    __tablename__ = "group_members"
+    __table_args__ = (UniqueConstraint("chat_id", "user_id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    chat_id: Mapped[int] = mapped_column(BigInteger, index=True)
+    user_id: Mapped[int] = mapped_column(Integer, index=True)
+    joined_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class DailyHoroscope(Base):
+    __tablename__ = "daily_horoscopes"
+    __table_args__ = (UniqueConstraint("day", "sign"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    day: Mapped[datetime] = mapped_column(Date, index=True)
+    sign: Mapped[str] = mapped_column(String(16))
+    text: Mapped[str] = mapped_column(Text)
+    html: Mapped[str] = mapped_column(Text)
+    source: Mapped[str] = mapped_column(String(16))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
 class TarotReading(Base):
     __tablename__ = "tarot_readings"
+    # История: ключ страницы (user_id, created_at, id), колонки списка — в INCLUDE
+    __table_args__ = (
+        Index(
+            "ix_tarot_readings_history", "user_id", "created_at", "id",
+            postgresql_include=["spread_type", "seed", "deck_version", "cards"],
+        ),
+        # Карта дня — одна строка на пользователя и местную дату
+        Index(
+            "uq_tarot_readings_daily", "user_id", "daily_date",
+            unique=True, postgresql_where=text("daily_date IS NOT NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    user_id: Mapped[int] = mapped_column(Integer, index=True)
+    user_id: Mapped[int] = mapped_column(Integer)
     spread_type: Mapped[str] = mapped_column(String(32))
-    cards_json: Mapped[dict] = mapped_column(JSON)
+    # Расклад восстанавливается по зерну и версии колоды (tarot.replay_spread)
+    seed: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    deck_version: Mapped[Optional[int]] = mapped_column(SmallInteger, nullable=True)
+    # Только у записей до зёрен — pack_cards: по uint16 на карту
+    cards: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    # Только у карты дня: местная дата, на которую она выдана
+    daily_date: Mapped[Optional[datetime]] = mapped_column(Date, nullable=True)
     question: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     ai_interpretation: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     is_premium: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
 
+class ReadingCard(Base):
+    """Карты раскладов построчно — поиск раскладов по карте и статистика мастей."""
+
+    __tablename__ = "reading_cards"
+    __table_args__ = (
+        # «Все мои расклады, где выпала Башня перевёрнутой»
+        Index("ix_reading_cards_search", "user_id", "card_id", "reversed", "created_at"),
+        # Карты пользователя за период — только из индекса
+        Index(
+            "ix_reading_cards_period", "user_id", "created_at",
+            postgresql_include=["card_id", "reversed", "reading_id"],
+        ),
+        # Период по всем пользователям (админ): строки пишутся по времени, BRIN крошечный
+        Index("ix_reading_cards_created", "created_at", postgresql_using="brin"),
+    )
+
+    reading_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    position: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    user_id: Mapped[int] = mapped_column(Integer)
+    card_id: Mapped[int] = mapped_column(SmallInteger)
+    reversed: Mapped[bool] = mapped_column(Boolean)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class TarotCardCount(Base):
+    """Сколько раз карта выпадала пользователю — свёртка счётчиков из Redis."""
+
+    __tablename__ = "tarot_card_counts"
+
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    card_id: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
 class JournalEntry(Base):
     __tablename__ = "journal_entries"
 
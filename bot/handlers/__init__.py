@@ -2,6 +2,7 @@
 
 from bot.handlers import admin
 from bot.handlers import astrology
+from bot.handlers import groups
 from bot.handlers import journal
 from bot.handlers import numerology
 from bot.handlers import profile
@@ -12,6 +13,7 @@ from bot.handlers import tarot
 __all__ = [
     "admin",
     "astrology",
+    "groups",
     "journal",
     "numerology",
     "profile",
@@ -4,7 +4,9 @@ from aiogram import F, Router
 from aiogram.filters import Command
 from aiogram.types import CallbackQuery, Message
 
-from bot.database import User
+from bot.database import User, async_session
+from bot.services.card_search import card_frequency, month_start
+from bot.services.tarot import SUIT_NAMES, Suit, decks
 
 router = Router(name="admin")
 
@@ -21,6 +23,7 @@ async def cmd_admin(message: Message, db_user: User) -> None:
         "🔧 <b>Админ-панель</b>\n\n"
         "Команды:\n"
         "/stats — статистика\n"
+        "/card_stats — карты таро за месяц\n"
         "/give_sub — выдать подписку"
     )
 
@@ -32,3 +35,32 @@ async def cmd_stats(message: Message, db_user: User) -> None:
         return
     
     await message.answer("📊 Статистика будет здесь")
+
+
+@router.message(Command("card_stats"))
+async def cmd_card_stats(message: Message, db_user: User) -> None:
+    """Частые карты и масти по всем раскладам месяца."""
+    if db_user.telegram_id != ADMIN_ID:
+        return
+
+    async with async_session() as session:
+        rows = await card_frequency(session, month_start())
+    if not rows:
+        await message.answer("🃏 В этом месяце раскладов ещё не было")
+        return
+
+    total = sum(count for _, _, count in rows)
+    cards = decks.get()
+    suits = {suit: 0 for suit in SUIT_NAMES}
+    for card_id, _, count in rows:
+        suit = cards[card_id].suit
+        if suit is not Suit.NONE:
+            suits[suit] += count
+
+    lines = [f"🃏 <b>Карты за месяц</b> (всего {total})\n"]
+    for card_id, reversed_, count in rows[:10]:
+        mark = " ↺" if reversed_ else ""
+        lines.append(f"{cards[card_id].name_ru}{mark} — {count}")
+    lines.append("")
+    lines.extend(f"{SUIT_NAMES[suit]}: {count * 100 / total:.0f}%" for suit, count in suits.items())
+    await message.answer("\n".join(lines), parse_mode="HTML")
@@ -1,18 +1,38 @@
 """Хендлер астрологии — натальная карта, транзиты, совместимость."""
 
+import hashlib
+import html
+import json
 import re
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
+from zoneinfo import ZoneInfo
 
 from aiogram import F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import CallbackQuery, Message
-from sqlalchemy import select
+import numpy as np
+from sqlalchemy import delete, select
 
-from bot.database import Profile, User, async_session
+from bot.database import Profile, SavedPartner, User, async_session
 from bot.keyboards.inline import back_to_menu_kb
+from bot.services.astro_pool import astro_pool
 from bot.services.astrology_engine import astrology, NatalChart
+from bot.services.charts import (
+    DEFAULT_LAT,
+    DEFAULT_LON,
+    birth_key,
+    get_or_calculate_chart,
+    pack_longitudes,
+    unpack_longitudes,
+)
+from bot.services.geocoder import geocoder
+from bot.services.horoscopes import SIGN_ADVICE, horoscopes
+from bot.services.sky import DaySky, HourSky, sky
+from bot.services.synastry import SPHERES, synastry
+from bot.services.timezones import tz_resolver
+from bot.services.transit_calendar import event_text, transit_calendar
 from bot.utils.personalization import get_time_greeting
 
 
@@ -33,10 +53,15 @@ def parse_date(date_str: str) -> Optional[datetime]:
 
 router = Router(name="astrology")
 
+MAX_SAVED_PARTNERS = 30
+# Рейтинг партнёров живёт, пока не изменится ни одна карта (ключ — отпечаток)
+RANK_CACHE_TTL = 7 * 86400
+
 
 class AstrologyStates(StatesGroup):
     waiting_birthplace = State()
     waiting_partner_data = State()
+    waiting_partner_name = State()
 
 
 # ═══════════════════════════════════════════════════════════
@@ -72,6 +97,10 @@ async def astrology_menu(callback: CallbackQuery, db_user: User) -> None:
     builder = InlineKeyboardBuilder()
     
     if has_chart:
+        builder.row(InlineKeyboardButton(
+            text="🔮 Гороскоп дня",
+            callback_data="astro:horoscope"
+        ))
         builder.row(InlineKeyboardButton(
             text="🌟 Моя натальная карта",
             callback_data="astro:natal"
@@ -80,6 +109,10 @@ async def astrology_menu(callback: CallbackQuery, db_user: User) -> None:
             text="📅 Транзиты на сегодня",
             callback_data="astro:transits"
         ))
+        builder.row(InlineKeyboardButton(
+            text="🗓 Мой месяц",
+            callback_data="astro:month"
+        ))
         builder.row(InlineKeyboardButton(
             text="💕 Совместимость",
             callback_data="astro:compatibility"
@@ -102,6 +135,52 @@ async def astrology_menu(callback: CallbackQuery, db_user: User) -> None:
     )
 
 
+# ═══════════════════════════════════════════════════════════
+# ГОРОСКОП ДНЯ
+# ═══════════════════════════════════════════════════════════
+
+@router.callback_query(F.data == "astro:horoscope")
+async def show_horoscope(callback: CallbackQuery, db_user: User) -> None:
+    """Гороскоп дня по знаку Солнца."""
+    await callback.answer()
+
+    profile = await _get_profile(db_user.id)
+    if not profile or not profile.birth_date:
+        await callback.message.edit_text(
+            "❌ Сначала заполни профиль с датой рождения",
+            reply_markup=back_to_menu_kb(),
+        )
+        return
+
+    chart = await get_or_calculate_chart(profile)
+    if not chart or not chart.sun:
+        await callback.message.edit_text(
+            "❌ Ошибка расчёта карты. Проверь данные в профиле.",
+            reply_markup=back_to_menu_kb(),
+        )
+        return
+
+    from aiogram.types import InlineKeyboardButton
+    from aiogram.utils.keyboard import InlineKeyboardBuilder
+
+    builder = InlineKeyboardBuilder()
+    builder.row(InlineKeyboardButton(
+        text="📅 Транзиты",
+        callback_data="astro:transits"
+    ))
+    builder.row(InlineKeyboardButton(
+        text="🔙 Назад",
+        callback_data="menu:astrology"
+    ))
+
+    # Гороскоп дня общий для всех со знаком — готовый HTML из кэша
+    await callback.message.edit_text(
+        await horoscopes.get_html(chart.sun.sign),
+        reply_markup=builder.as_markup(),
+        parse_mode="HTML",
+    )
+
+
 # ═══════════════════════════════════════════════════════════
 # НАТАЛЬНАЯ КАРТА
 # ═══════════════════════════════════════════════════════════
@@ -120,7 +199,7 @@ async def show_natal_chart(callback: CallbackQuery, db_user: User) -> None:
         return
     
     # Рассчитываем карту
-    chart = _calculate_chart(profile)
+    chart = await get_or_calculate_chart(profile)
     if not chart:
         await callback.message.edit_text(
             "❌ Ошибка расчёта карты. Проверь данные в профиле.",
@@ -143,6 +222,10 @@ async def show_natal_chart(callback: CallbackQuery, db_user: User) -> None:
         text="📅 Транзиты",
         callback_data="astro:transits"
     ))
+    builder.row(InlineKeyboardButton(
+        text="🗓 Мой месяц",
+        callback_data="astro:month"
+    ))
     builder.row(InlineKeyboardButton(
         text="💕 Совместимость",
         callback_data="astro:compatibility"
@@ -213,6 +296,16 @@ def _format_natal_chart(name: str, triad: dict, chart: NatalChart) -> str:
         f"",
     ])
     
+    # Аспектные фигуры
+    if triad.get("patterns"):
+        lines.append("🔺 <b>Аспектные фигуры:</b>")
+        for pattern in triad["patterns"]:
+            lines.extend([
+                f"<b>{pattern['title']}</b>",
+                f"<i>{pattern['text']}</i>",
+            ])
+        lines.append("")
+    
     # Дополнительные планеты (для Expert)
     if chart.mercury:
         lines.extend([
@@ -242,7 +335,7 @@ async def show_transits(callback: CallbackQuery, db_user: User) -> None:
         )
         return
     
-    chart = _calculate_chart(profile)
+    chart = await get_or_calculate_chart(profile)
     if not chart:
         await callback.message.edit_text(
             "❌ Ошибка расчёта",
@@ -250,15 +343,18 @@ async def show_transits(callback: CallbackQuery, db_user: User) -> None:
         )
         return
     
-    # Рассчитываем транзиты
-    transits = astrology.calculate_transits(chart)
+    # Рассчитываем транзиты по общему небу дня
+    positions = await sky.positions()
+    transits = astrology.calculate_transits(chart, positions=positions)
+    day_sky = await sky.get_day()
+    hour_sky = await sky.get_hour()
     
     hour = datetime.now().hour
     time_greeting = get_time_greeting(hour)
     
     name = profile.current_name or profile.birth_name or "Друг"
     
-    text = _format_transits(name, time_greeting, transits, chart)
+    text = _format_transits(name, time_greeting, transits, chart, day_sky, hour_sky)
     
     from aiogram.types import InlineKeyboardButton
     from aiogram.utils.keyboard import InlineKeyboardBuilder
@@ -280,7 +376,14 @@ async def show_transits(callback: CallbackQuery, db_user: User) -> None:
     )
 
 
-def _format_transits(name: str, time: str, transits: list, chart: NatalChart) -> str:
+def _format_transits(
+    name: str,
+    time: str,
+    transits: list,
+    chart: NatalChart,
+    day_sky: DaySky,
+    hour_sky: HourSky,
+) -> str:
     """Форматирует транзиты."""
     
     lines = [
@@ -288,7 +391,14 @@ def _format_transits(name: str, time: str, transits: list, chart: NatalChart) ->
         f"",
         f"<i>Как текущие положения планет влияют на твою натальную карту</i>",
         f"",
+        f"{hour_sky.phase} ({hour_sky.illumination:.0%} диска)",
     ]
+    for ingress in day_sky.ingresses:
+        lines.append(
+            f"➡️ {astrology.PLANETS.get(ingress['planet'], ingress['planet'])} "
+            f"переходит в {ingress['sign']} около {ingress['time']} UTC"
+        )
+    lines.append("")
     
     if not transits:
         lines.extend([
@@ -316,25 +426,98 @@ def _format_transits(name: str, time: str, transits: list, chart: NatalChart) ->
 
 
 def _get_daily_advice(chart: NatalChart, transits: list) -> str:
-    """Генерирует совет на день."""
-    sun_sign = chart.sun.sign
-    
-    advices = {
-        "Aries": "Сегодня твоя энергия высока — начни то, что откладывал",
-        "Taurus": "Потрать время на что-то приятное для тела — вкусная еда, массаж",
-        "Gemini": "Позвони старому другу или напиши — связи активируют удачу",
-        "Cancer": "Побудь дома, с семьёй. Эмоциональная перезагрузка важнее дел",
-        "Leo": "Покажи себя — даже если кажется, что никто не смотрит",
-        "Virgo": "Сделай маленькое дело идеально, а не многое наспех",
-        "Libra": "Примирение или компромисс сегодня принесёт больше, чем победа",
-        "Scorpio": "Не бойся заглянуть в тень — там твоя сила",
-        "Sagittarius": "Узнай что-то новое или спланируй поездку",
-        "Capricorn": "Шаг назад для обзора — не отступление, тактика",
-        "Aquarius": "Необычное решение сегодня — правильное",
-        "Pisces": "Доверься интуиции, даже если логика против",
-    }
-    
-    return advices.get(sun_sign, "Слушай себя — ты уже знаешь ответ")
+    """Совет на день по знаку Солнца."""
+    return SIGN_ADVICE.get(chart.sun.sign, "Слушай себя — ты уже знаешь ответ")
+
+
+# ═══════════════════════════════════════════════════════════
+# КАЛЕНДАРЬ МЕСЯЦА
+# ═══════════════════════════════════════════════════════════
+
+MONTHS_RU = (
+    "январь", "февраль", "март", "апрель", "май", "июнь",
+    "июль", "август", "сентябрь", "октябрь", "ноябрь", "декабрь",
+)
+# Сколько строк событий помещается в одно сообщение
+MONTH_MAX_LINES = 45
+
+
+@router.callback_query(F.data == "astro:month")
+async def show_month(callback: CallbackQuery, db_user: User) -> None:
+    """Календарь месяца: точные даты аспектов, смен знаков и фаз Луны."""
+    await callback.answer()
+
+    profile = await _get_profile(db_user.id)
+    if not profile or not profile.birth_date:
+        await callback.message.edit_text(
+            "❌ Сначала заполни профиль",
+            reply_markup=back_to_menu_kb(),
+        )
+        return
+
+    chart = await get_or_calculate_chart(profile)
+    if not chart:
+        await callback.message.edit_text(
+            "❌ Ошибка расчёта",
+            reply_markup=back_to_menu_kb(),
+        )
+        return
+
+    now = datetime.now(timezone.utc)
+    events = await transit_calendar.get(
+        db_user.id, birth_key(profile), chart.longitudes(), now.year, now.month,
+    )
+
+    # 0.0 — настоящая координата (экватор, Гринвич), а не её отсутствие
+    lat = DEFAULT_LAT if profile.birth_lat is None else profile.birth_lat
+    lon = DEFAULT_LON if profile.birth_lon is None else profile.birth_lon
+    zone = tz_resolver.zone_for(lat, lon)
+    text = _format_month(now, events, ZoneInfo(zone))
+
+    from aiogram.types import InlineKeyboardButton
+    from aiogram.utils.keyboard import InlineKeyboardBuilder
+
+    builder = InlineKeyboardBuilder()
+    builder.row(InlineKeyboardButton(
+        text="📅 Транзиты на сегодня",
+        callback_data="astro:transits"
+    ))
+    builder.row(InlineKeyboardButton(
+        text="🔙 Назад",
+        callback_data="menu:astrology"
+    ))
+
+    await callback.message.edit_text(
+        text,
+        reply_markup=builder.as_markup(),
+        parse_mode="HTML",
+    )
+
+
+def _format_month(now: datetime, events: list[dict], tz: ZoneInfo) -> str:
+    """События месяца по дням во времени места рождения."""
+    lines = [f"🗓 <b>Твой {MONTHS_RU[now.month - 1]} {now.year}</b>"]
+
+    shown = 0
+    current_day = None
+    for event in events:
+        moment = datetime.fromisoformat(event["time"]).replace(tzinfo=timezone.utc).astimezone(tz)
+        if shown >= MONTH_MAX_LINES:
+            lines.append("…")
+            break
+        if moment.date() != current_day:
+            current_day = moment.date()
+            lines.extend(["", f"<b>{moment:%d.%m}</b>"])
+        # Прошедшие события месяца приглушены
+        text = f"{moment:%H:%M} {event_text(event)}"
+        lines.append(f"<s>{text}</s>" if moment < now else text)
+        shown += 1
+
+    if not events:
+        lines.append("Спокойный месяц — точных транзитов нет")
+
+    lines.extend(["", f"<i>Время — {tz.key}</i>"])
+    return "\n".join(lines)
 
 
 # ═══════════════════════════════════════════════════════════
@@ -342,17 +525,43 @@ def _get_daily_advice(chart: NatalChart, transits: list) -> str:
 # ═══════════════════════════════════════════════════════════
 
 @router.callback_query(F.data == "astro:compatibility")
-async def compatibility_start(callback: CallbackQuery, state: FSMContext) -> None:
+async def compatibility_start(callback: CallbackQuery, state: FSMContext, db_user: User) -> None:
     """Начинает расчёт совместимости."""
     await callback.answer()
     
+    partners = await _get_partners(db_user.id)
+    
     await callback.message.edit_text(
-        COMPATIBILITY_ASK_PARTNER,
+        COMPATIBILITY_ASK_PARTNER + (COMPATIBILITY_SAVED_HINT if partners else ""),
+        reply_markup=_partners_kb(partners),
         parse_mode="HTML",
     )
     await state.set_state(AstrologyStates.waiting_partner_data)
 
 
+def _partners_kb(partners: list[SavedPartner]):
+    """Кнопки сохранённых партнёров и сравнения со всеми."""
+    from aiogram.types import InlineKeyboardButton
+    from aiogram.utils.keyboard import InlineKeyboardBuilder
+    
+    builder = InlineKeyboardBuilder()
+    if len(partners) > 1:
+        builder.row(InlineKeyboardButton(
+            text="📊 Сравнить со всеми",
+            callback_data="astro:partners_rank"
+        ))
+    for partner in partners:
+        builder.row(InlineKeyboardButton(
+            text=f"💕 {partner.name}",
+            callback_data=f"astro:partner:{partner.id}"
+        ))
+    builder.row(InlineKeyboardButton(
+        text="🔙 Назад",
+        callback_data="menu:astrology"
+    ))
+    return builder.as_markup()
+
+
 @router.message(AstrologyStates.waiting_partner_data)
 async def process_partner_data(message: Message, state: FSMContext, db_user: User) -> None:
     """Обрабатывает данные партнёра."""
@@ -372,7 +581,7 @@ async def process_partner_data(message: Message, state: FSMContext, db_user: Use
         return
     
     # Парсим дату
-    from bot.utils.helpers import parse_date
+    from bot.utils.helpers import parse_date, parse_time
     partner_date = parse_date(parts[0])
     
     if not partner_date:
@@ -388,9 +597,27 @@ async def process_partner_data(message: Message, state: FSMContext, db_user: Use
         await message.answer("❌ Сначала заполни свой профиль")
         return
     
-    my_chart = _calculate_chart(profile)
-    partner_chart = astrology.calculate_natal_chart(
-        partner_date, None, 55.75, 37.61  # Москва по умолчанию
+    # Необязательные время и место партнёра
+    partner_time = parse_time(parts[1]) if len(parts) > 1 else None
+    place_parts = parts[2:] if partner_time else parts[1:]
+    place = geocoder.lookup(" ".join(place_parts)) if place_parts else None
+    if place_parts and not place:
+        # Без места считать по Москве нельзя — синастрия выйдет для чужого города
+        await message.answer(
+            f"❌ Не нашёл город «{html.escape(' '.join(place_parts))}». "
+            f"Проверь написание и введи данные ещё раз.\n"
+            f"Пример: <code>15.03.1990 14:30 Москва</code>",
+            parse_mode="HTML",
+        )
+        await state.set_state(AstrologyStates.waiting_partner_data)
+        return
+    
+    my_chart = await get_or_calculate_chart(profile)
+    partner_chart = await astro_pool.natal_chart(
+        partner_date,
+        partner_time,
+        place.latitude if place else DEFAULT_LAT,
+        place.longitude if place else DEFAULT_LON,
     )
     
     if not my_chart or not partner_chart:
@@ -402,59 +629,226 @@ async def process_partner_data(message: Message, state: FSMContext, db_user: Use
     
     text = _format_compatibility(compatibility, my_chart, partner_chart)
     
+    # Данные партнёра ждут, не захочет ли пользователь его сохранить
+    await state.update_data(partner={
+        "birth_date": partner_date.strftime("%Y-%m-%d"),
+        "birth_time": partner_time,
+        "birth_place": place.display if place else None,
+        "birth_lat": place.latitude if place else None,
+        "birth_lon": place.longitude if place else None,
+        "longitudes": pack_longitudes(partner_chart),
+    })
+    
+    from aiogram.types import InlineKeyboardButton
+    from aiogram.utils.keyboard import InlineKeyboardBuilder
+    
+    builder = InlineKeyboardBuilder()
+    builder.row(InlineKeyboardButton(
+        text="💾 Сохранить партнёра",
+        callback_data="astro:partner_save"
+    ))
+    builder.row(InlineKeyboardButton(
+        text="🔙 Назад",
+        callback_data="astro:compatibility"
+    ))
+    
     await message.answer(
         text,
-        reply_markup=back_to_menu_kb(),
+        reply_markup=builder.as_markup(),
         parse_mode="HTML",
     )
 
 
-def _calculate_compatibility(chart1: NatalChart, chart2: NatalChart) -> dict:
-    """Рассчитывает совместимость двух карт."""
+@router.callback_query(F.data == "astro:partner_save")
+async def partner_save_start(callback: CallbackQuery, state: FSMContext, db_user: User) -> None:
+    """Спрашивает имя, под которым сохранить партнёра."""
+    await callback.answer()
     
-    # Элементы
-    elem1 = astrology.SIGN_ELEMENTS.get(chart1.sun.sign, "")
-    elem2 = astrology.SIGN_ELEMENTS.get(chart2.sun.sign, "")
+    data = await state.get_data()
+    if "partner" not in data:
+        await callback.message.answer("❌ Данные партнёра устарели — введи их ещё раз")
+        return
+    
+    if len(await _get_partners(db_user.id)) >= MAX_SAVED_PARTNERS:
+        await callback.message.answer(
+            f"❌ Можно сохранить не больше {MAX_SAVED_PARTNERS} человек. "
+            f"Удали кого-нибудь из списка."
+        )
+        return
+    
+    await callback.message.answer("✏️ Как подписать этого человека? Например: <i>Аня</i>", parse_mode="HTML")
+    await state.set_state(AstrologyStates.waiting_partner_name)
+
+
+@router.message(AstrologyStates.waiting_partner_name)
+async def partner_save_name(message: Message, state: FSMContext, db_user: User) -> None:
+    """Сохраняет партнёра вместе с рассчитанной картой."""
+    data = await state.get_data()
+    await state.clear()
+    
+    partner = data.get("partner")
+    name = (message.text or "").strip()[:64]
+    if not partner or not name:
+        await message.answer("❌ Не получилось сохранить — попробуй ещё раз", reply_markup=back_to_menu_kb())
+        return
+    
+    async with async_session() as session:
+        session.add(SavedPartner(
+            user_id=db_user.id,
+            name=name,
+            birth_date=datetime.strptime(partner["birth_date"], "%Y-%m-%d").date(),
+            birth_time=partner["birth_time"],
+            birth_place=partner["birth_place"],
+            birth_lat=partner["birth_lat"],
+            birth_lon=partner["birth_lon"],
+            longitudes=partner["longitudes"],
+        ))
+        await session.commit()
+    
+    partners = await _get_partners(db_user.id)
+    await message.answer(
+        f"💾 <b>{html.escape(name)}</b> сохранён(а). Теперь совместимость — в один клик.",
+        reply_markup=_partners_kb(partners),
+        parse_mode="HTML",
+    )
+
+
+@router.callback_query(F.data.startswith("astro:partner:"))
+async def show_saved_partner(callback: CallbackQuery, state: FSMContext, db_user: User) -> None:
+    """Совместимость с сохранённым партнёром — без пересчёта его карты."""
+    await callback.answer()
+    await state.clear()
+    
+    partner = await _get_partner(db_user.id, int(callback.data.split(":")[2]))
+    profile = await _get_profile(db_user.id)
+    if not partner or not profile:
+        await callback.message.edit_text("❌ Партнёр не найден", reply_markup=back_to_menu_kb())
+        return
+    
+    my_chart = await get_or_calculate_chart(profile)
+    if not my_chart:
+        await callback.message.edit_text("❌ Ошибка расчёта карты", reply_markup=back_to_menu_kb())
+        return
+    
+    partner_chart = NatalChart.from_longitudes(unpack_longitudes(partner.longitudes))
+    compatibility = _calculate_compatibility(my_chart, partner_chart)
+    text = f"👤 <b>{html.escape(partner.name)}</b>\n\n" + _format_compatibility(compatibility, my_chart, partner_chart)
+    
+    from aiogram.types import InlineKeyboardButton
+    from aiogram.utils.keyboard import InlineKeyboardBuilder
     
-    # Совместимость элементов
-    element_compatibility = {
-        ("Огонь", "Огонь"): 70,
-        ("Огонь", "Воздух"): 90,
-        ("Огонь", "Земля"): 40,
-        ("Огонь", "Вода"): 30,
-        ("Земля", "Земля"): 80,
-        ("Земля", "Вода"): 90,
-        ("Земля", "Огонь"): 40,
-        ("Земля", "Воздух"): 30,
-        ("Воздух", "Воздух"): 75,
-        ("Воздух", "Огонь"): 90,
-        ("Воздух", "Земля"): 30,
-        ("Воздух", "Вода"): 40,
-        ("Вода", "Вода"): 85,
-        ("Вода", "Земля"): 90,
-        ("Вода", "Огонь"): 30,
-        ("Вода", "Воздух"): 40,
-    }
-    
-    sun_score = element_compatibility.get((elem1, elem2), 50)
-    
-    # Луна — эмоциональная совместимость
-    moon_elem1 = astrology.SIGN_ELEMENTS.get(chart1.moon.sign, "")
-    moon_elem2 = astrology.SIGN_ELEMENTS.get(chart2.moon.sign, "")
-    moon_score = element_compatibility.get((moon_elem1, moon_elem2), 50)
-    
-    # Итоговый процент
-    total = int((sun_score * 0.6) + (moon_score * 0.4))
-    
-    return {
-        "total": total,
-        "sun_score": sun_score,
-        "moon_score": moon_score,
-        "element1": elem1,
-        "element2": elem2,
-        "strength": _get_compatibility_strength(total),
-        "challenge": _get_compatibility_challenge(chart1, chart2),
-    }
+    builder = InlineKeyboardBuilder()
+    builder.row(InlineKeyboardButton(
+        text="🗑 Удалить",
+        callback_data=f"astro:partner_del:{partner.id}"
+    ))
+    builder.row(InlineKeyboardButton(
+        text="🔙 Назад",
+        callback_data="astro:compatibility"
+    ))
+    
+    await callback.message.edit_text(text, reply_markup=builder.as_markup(), parse_mode="HTML")
+
+
+@router.callback_query(F.data.startswith("astro:partner_del:"))
+async def delete_saved_partner(callback: CallbackQuery, db_user: User) -> None:
+    """Удаляет сохранённого партнёра."""
+    partner_id = int(callback.data.split(":")[2])
+    async with async_session() as session:
+        await session.execute(
+            delete(SavedPartner).where(
+                SavedPartner.id == partner_id,
+                SavedPartner.user_id == db_user.id,
+            )
+        )
+        await session.commit()
+    
+    await callback.answer("🗑 Удалено")
+    partners = await _get_partners(db_user.id)
+    await callback.message.edit_text(
+        COMPATIBILITY_ASK_PARTNER + (COMPATIBILITY_SAVED_HINT if partners else ""),
+        reply_markup=_partners_kb(partners),
+        parse_mode="HTML",
+    )
+
+
+@router.callback_query(F.data == "astro:partners_rank")
+async def rank_saved_partners(callback: CallbackQuery, state: FSMContext, db_user: User, redis: object) -> None:
+    """Рейтинг совместимости со всеми сохранёнными — одним векторным расчётом."""
+    await callback.answer()
+    await state.clear()
+    
+    profile = await _get_profile(db_user.id)
+    partners = await _get_partners(db_user.id)
+    my_chart = await get_or_calculate_chart(profile) if profile else None
+    if not my_chart or not partners:
+        await callback.message.edit_text("❌ Нечего сравнивать", reply_markup=back_to_menu_kb())
+        return
+    
+    ranking = await _rank_partners(redis, db_user.id, my_chart, partners)
+    
+    lines = ["📊 <b>Совместимость со всеми</b>", ""]
+    for place_no, row in enumerate(ranking, 1):
+        filled = row["total"] // 10
+        lines.append(
+            f"{place_no}. <b>{html.escape(row['name'])}</b> — {row['total']}%\n"
+            f"<code>{'█' * filled}{'░' * (10 - filled)}</code> "
+            f"сильнее всего: {row['best']}"
+        )
+    lines.extend(["", "<i>Нажми на имя, чтобы увидеть подробности</i>"])
+    
+    await callback.message.edit_text(
+        "\n".join(lines),
+        reply_markup=_partners_kb(partners),
+        parse_mode="HTML",
+    )
+
+
+async def _rank_partners(redis, user_id: int, my_chart: NatalChart, partners: list[SavedPartner]) -> list[dict]:
+    """Сортирует партнёров по совместимости; результат кэшируется по отпечатку карт."""
+    my_lons = my_chart.longitudes()
+    partner_lons = np.array([unpack_longitudes(p.longitudes) for p in partners], dtype=float)
+    
+    # Отпечаток меняется при любом изменении любой из карт или состава списка
+    digest = hashlib.sha1(np.round(my_lons, 4).tobytes())
+    for partner, lons in zip(partners, partner_lons):
+        digest.update(f"{partner.id}:{partner.name}".encode())
+        digest.update(np.round(lons, 4).tobytes())
+    cache_key = f"synastry:rank:{user_id}:{digest.hexdigest()}"
+    
+    cached = await redis.get(cache_key)
+    if cached:
+        return json.loads(cached)
+    
+    scores = synastry.scores(my_lons[None, :], partner_lons)
+    sphere_keys = list(SPHERES)
+    sphere_scores = np.stack([scores[key] for key in sphere_keys], axis=1)
+    best = sphere_scores.argmax(axis=1)
+    
+    ranking = [
+        {
+            "id": partner.id,
+            "name": partner.name,
+            "total": int(scores["total"][i]),
+            "best": SPHERES[sphere_keys[best[i]]][0],
+        }
+        for i, partner in enumerate(partners)
+    ]
+    ranking.sort(key=lambda row: row["total"], reverse=True)
+    
+    await redis.setex(cache_key, RANK_CACHE_TTL, json.dumps(ranking, ensure_ascii=False))
+    return ranking
+
+
+def _calculate_compatibility(chart1: NatalChart, chart2: NatalChart) -> dict:
+    """Рассчитывает совместимость двух карт по полной синастрии."""
+    comp = synastry.compare(chart1.longitudes(), chart2.longitudes())
+    
+    comp["element1"] = astrology.SIGN_ELEMENTS.get(chart1.sun.sign, "")
+    comp["element2"] = astrology.SIGN_ELEMENTS.get(chart2.sun.sign, "")
+    comp["strength"] = _get_compatibility_strength(comp["total"])
+    comp["challenge"] = _get_compatibility_challenge(chart1, chart2, comp["aspects"])
+    return comp
 
 
 def _get_compatibility_strength(score: int) -> str:
@@ -469,9 +863,14 @@ def _get_compatibility_strength(score: int) -> str:
         return "Сложный союз — но именно в этом может быть рост"
 
 
-def _get_compatibility_challenge(chart1: NatalChart, chart2: NatalChart) -> str:
+def _get_compatibility_challenge(chart1: NatalChart, chart2: NatalChart, aspects: list) -> str:
     """Возвращает главную сложность в паре."""
     
+    # Самый сильный напряжённый аспект между картами
+    for aspect in aspects:
+        if not aspect["harmony"]:
+            return f"{aspect['text']} (орбис {aspect['orb']}°): здесь паре придётся договариваться"
+    
     # Разные стихии Солнца
     elem1 = astrology.SIGN_ELEMENTS.get(chart1.sun.sign, "")
     elem2 = astrology.SIGN_ELEMENTS.get(chart2.sun.sign, "")
@@ -495,6 +894,11 @@ def _format_compatibility(comp: dict, chart1: NatalChart, chart2: NatalChart) ->
     filled = comp["total"] // 10
     bar = "█" * filled + "░" * (10 - filled)
     
+    spheres = "\n".join(f"{title}: {score}%" for title, score in comp["spheres"].items())
+    aspects = "\n".join(
+        f"{'✨' if a['harmony'] else '⚡'} {a['text']}" for a in comp["aspects"]
+    ) or "Тесных аспектов нет"
+    
     return (
         f"💕 <b>Совместимость</b>\n\n"
         f"{chart1.sun.sign} + {chart2.sun.sign}\n"
@@ -503,6 +907,10 @@ def _format_compatibility(comp: dict, chart1: NatalChart, chart2: NatalChart) ->
         f"<code>{bar}</code>\n\n"
         f"☉ Солнце: {comp['sun_score']}% — совместимость личностей\n"
         f"☽ Луна: {comp['moon_score']}% — эмоциональная гармония\n\n"
+        f"<b>По сферам:</b>\n"
+        f"{spheres}\n\n"
+        f"<b>Ключевые аспекты:</b>\n"
+        f"{aspects}\n\n"
         f"💪 <b>Сила союза:</b>\n"
         f"<i>{comp['strength']}</i>\n\n"
         f"⚡ <b>Главный вызов:</b>\n"
@@ -525,22 +933,27 @@ async def _get_profile(user_id: int) -> Optional[Profile]:
         return result.scalar_one_or_none()
 
 
-def _calculate_chart(profile: Profile) -> Optional[NatalChart]:
-    """Рассчитывает натальную карту из профиля."""
-    if not profile.birth_date:
-        return None
-    
-    # Координаты по умолчанию (Москва)
-    lat, lon = 55.75, 37.61
-    
-    # TODO: геокодинг для определения координат по месту рождения
-    
-    return astrology.calculate_natal_chart(
-        profile.birth_date,
-        profile.birth_time,
-        lat,
-        lon,
-    )
+async def _get_partners(user_id: int) -> list[SavedPartner]:
+    """Сохранённые партнёры пользователя в порядке добавления."""
+    async with async_session() as session:
+        result = await session.execute(
+            select(SavedPartner)
+            .where(SavedPartner.user_id == user_id)
+            .order_by(SavedPartner.id)
+        )
+        return list(result.scalars().all())
+
+
+async def _get_partner(user_id: int, partner_id: int) -> Optional[SavedPartner]:
+    """Сохранённый партнёр, если он принадлежит пользователю."""
+    async with async_session() as session:
+        result = await session.execute(
+            select(SavedPartner).where(
+                SavedPartner.id == partner_id,
+                SavedPartner.user_id == user_id,
+            )
+        )
+        return result.scalar_one_or_none()
 
 
 # ═══════════════════════════════════════════════════════════
@@ -577,3 +990,7 @@ COMPATIBILITY_ASK_PARTNER = (
     "• <code>15.03.1990 14:30 Москва</code> — полные данные\n\n"
     "💡 <i>Чем точнее данные, тем точнее результат</i>"
 )
+
+COMPATIBILITY_SAVED_HINT = (
+    "\n\n👥 <b>Или выбери из сохранённых:</b>"
+)
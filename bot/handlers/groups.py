@@ -0,0 +1,177 @@
+"""Хендлер групповых чатов — матрица совместимости участников."""
+
+import asyncio
+import hashlib
+import html
+
+import numpy as np
+from aiogram import F, Router
+from aiogram.filters import Command
+from aiogram.types import Message
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from bot.database import GroupMember, Profile, User, async_session
+from bot.services.charts import cached_longitudes, get_or_calculate_chart
+from bot.services.synastry import synastry
+
+router = Router(name="groups")
+router.message.filter(F.chat.type.in_({"group", "supergroup"}))
+
+# До скольких участников матрица рисуется таблицей целиком
+TABLE_LIMIT = 10
+# До скольких участников показываем лучшую пару для каждого
+BEST_MATCH_LIMIT = 40
+TOP_PAIRS = 7
+MATRIX_TTL = 86400
+
+
+@router.message(Command("astro_join"))
+async def cmd_astro_join(message: Message, db_user: User) -> None:
+    """Участник соглашается попасть в матрицу совместимости чата."""
+    profile = await _get_profile(db_user.id)
+    if not profile or not profile.birth_date:
+        await message.reply(
+            "❌ Сначала заполни дату рождения в профиле — напиши мне в личку /start"
+        )
+        return
+
+    # Карта попадает в кэш — матрица потом не пересчитывает её
+    if not await get_or_calculate_chart(profile):
+        await message.reply("❌ Не получилось рассчитать карту, проверь данные профиля")
+        return
+
+    async with async_session() as session:
+        await session.execute(
+            insert(GroupMember)
+            .values(chat_id=message.chat.id, user_id=db_user.id)
+            .on_conflict_do_nothing(index_elements=["chat_id", "user_id"])
+        )
+        await session.commit()
+
+    await message.reply("✅ Ты в астрологической матрице чата. Посмотреть: /astro_matrix")
+
+
+@router.message(Command("astro_leave"))
+async def cmd_astro_leave(message: Message, db_user: User) -> None:
+    """Участник выходит из матрицы."""
+    async with async_session() as session:
+        await session.execute(
+            delete(GroupMember).where(
+                GroupMember.chat_id == message.chat.id,
+                GroupMember.user_id == db_user.id,
+            )
+        )
+        await session.commit()
+
+    await message.reply("👋 Ты больше не участвуешь в матрице этого чата")
+
+
+@router.message(Command("astro_matrix"))
+async def cmd_astro_matrix(message: Message, db_user: User, redis: object) -> None:
+    """Матрица совместимости всех участников, давших согласие."""
+    if db_user.subscription_type not in ("premium", "expert") and db_user.role not in ("admin", "superadmin"):
+        await message.reply("🔒 Матрицу может открыть участник с подпиской Premium или Expert")
+        return
+
+    members = await _get_members(message.chat.id)
+    charts = await cached_longitudes(user_id for user_id, _ in members)
+    members = [(user_id, name) for user_id, name in members if user_id in charts]
+
+    if len(members) < 2:
+        await message.reply(
+            "👥 Нужны хотя бы двое участников. Присоединиться: /astro_join"
+        )
+        return
+
+    # Отпечаток состава: участники, их имена и данные рождения
+    digest = hashlib.sha1()
+    for user_id, name in members:
+        digest.update(f"{user_id}|{name}|{charts[user_id][0]};".encode())
+    cache_key = f"group:matrix:{message.chat.id}:{digest.hexdigest()}"
+
+    text = await redis.get(cache_key)
+    if not text:
+        lons = np.stack([charts[user_id][1] for user_id, _ in members])
+        # Для больших групп расчёт занимает десятки миллисекунд — не держим event loop
+        matrix = await asyncio.get_running_loop().run_in_executor(None, synastry.matrix, lons)
+        text = _format_matrix([name for _, name in members], matrix)
+        await redis.setex(cache_key, MATRIX_TTL, text)
+
+    await message.reply(text, parse_mode="HTML")
+
+
+def _format_matrix(names: list[str], matrix: np.ndarray) -> str:
+    """Компактное представление матрицы для Telegram."""
+    n = len(names)
+    lines = [f"🔮 <b>Астрологическая матрица чата</b> ({n} участников)", ""]
+
+    if n <= TABLE_LIMIT:
+        # Таблица: строки — имена, столбцы — номера участников
+        width = max(len(name) for name in (_short(nm) for nm in names))
+        header = " " * (width + 3) + " ".join(f"{i + 1:>3}" for i in range(n))
+        rows = [header]
+        for i, name in enumerate(names):
+            cells = " ".join("  ·" if i == j else f"{matrix[i, j]:>3}" for j in range(n))
+            rows.append(f"{i + 1:>2} {html.escape(f'{_short(name):<{width}}')} {cells}")
+        lines.append("<pre>" + "\n".join(rows) + "</pre>")
+        lines.append("")
+
+    i, j = np.triu_indices(n, k=1)
+    scores = matrix[i, j]
+    order = np.argsort(-scores, kind="stable")
+    # В маленькой группе списки лучших и худших пар не должны пересекаться
+    count = max(1, min(TOP_PAIRS, len(order) // 2))
+
+    lines.append("💞 <b>Самые гармоничные пары:</b>")
+    for k in order[:count]:
+        lines.append(f"{html.escape(names[i[k]])} + {html.escape(names[j[k]])} — {scores[k]}%")
+
+    if len(order) > 1:
+        lines.extend(["", "⚡ <b>Пары с искрой (есть над чем работать):</b>"])
+        for k in order[::-1][:count]:
+            lines.append(f"{html.escape(names[i[k]])} + {html.escape(names[j[k]])} — {scores[k]}%")
+
+    if TABLE_LIMIT < n <= BEST_MATCH_LIMIT:
+        off_diagonal = np.where(np.eye(n, dtype=bool), -1, matrix)
+        best = off_diagonal.argmax(axis=1)
+        lines.extend(["", "🎯 <b>Лучшая пара для каждого:</b>"])
+        for a, b in enumerate(best):
+            lines.append(f"{html.escape(names[a])} → {html.escape(names[b])} ({matrix[a, b]}%)")
+
+    lines.extend(["", "<i>Присоединиться: /astro_join · выйти: /astro_leave</i>"])
+    return "\n".join(lines)
+
+
+def _short(name: str) -> str:
+    return name[:8]
+
+
+async def _get_profile(user_id: int) -> Profile | None:
+    async with async_session() as session:
+        result = await session.execute(
+            select(Profile).where(Profile.user_id == user_id)
+        )
+        return result.scalar_one_or_none()
+
+
+async def _get_members(chat_id: int) -> list[tuple[int, str]]:
+    """Участники матрицы чата: (user_id, имя для показа) по порядку вступления."""
+    async with async_session() as session:
+        result = await session.execute(
+            select(
+                GroupMember.user_id,
+                Profile.current_name,
+                Profile.birth_name,
+                User.first_name,
+                User.username,
+            )
+            .join(User, User.id == GroupMember.user_id)
+            .outerjoin(Profile, Profile.user_id == GroupMember.user_id)
+            .where(GroupMember.chat_id == chat_id)
+            .order_by(GroupMember.id)
+        )
+        return [
+            (user_id, current or birth or first or username or f"#{user_id}")
+            for user_id, current, birth, first, username in result.all()
+        ]
@@ -10,6 +10,7 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder
 from sqlalchemy import select
 
 from bot.database import Profile, User, async_session
+from bot.services.geocoder import geocoder
 
 router = Router(name="profile")
 
@@ -119,6 +120,11 @@ async def process_birth_place(message: Message, state: FSMContext, db_user: User
     if place == "-":
         place = None
     
+    # Координаты по встроенному справочнику городов
+    found = geocoder.lookup(place) if place else None
+    lat = found.latitude if found else None
+    lon = found.longitude if found else None
+    
     data = await state.get_data()
     
     # Создаём или обновляем профиль
@@ -132,12 +138,16 @@ async def process_birth_place(message: Message, state: FSMContext, db_user: User
             profile.birth_date = data["birth_date"]
             profile.birth_time = data.get("birth_time")
             profile.birth_place = place
+            profile.birth_lat = lat
+            profile.birth_lon = lon
         else:
             profile = Profile(
                 user_id=db_user.id,
                 birth_date=data["birth_date"],
                 birth_time=data.get("birth_time"),
                 birth_place=place,
+                birth_lat=lat,
+                birth_lon=lon,
             )
             session.add(profile)
         
@@ -148,8 +158,16 @@ async def process_birth_place(message: Message, state: FSMContext, db_user: User
     builder = InlineKeyboardBuilder()
     builder.button(text="🔙 В меню", callback_data="menu:back")
     
+    if found:
+        place_note = f"📍 {found.display} ({found.latitude:.2f}, {found.longitude:.2f})\n\n"
+    elif place:
+        place_note = "📍 Город не нашёлся в справочнике — для астрологии возьмём Москву\n\n"
+    else:
+        place_note = ""
+    
     await message.answer(
         "✅ <b>Профиль сохранён!</b>\n\n"
+        f"{place_note}"
         "Теперь можно использовать все функции бота.",
         reply_markup=builder.as_markup(),
     )
@@ -1,5 +1,9 @@
 """Обновлённый хендлер таро с повествовательными раскладами."""
 
+import html
+import random
+from datetime import datetime, timezone
+
 from aiogram import F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
@@ -7,16 +11,33 @@ from aiogram.types import CallbackQuery, Message
 from sqlalchemy import select
 
 from bot.database import Profile, TarotReading, User, async_session
-from bot.keyboards.inline import back_to_menu_kb, tarot_interpret_kb, tarot_menu_kb
+from bot.keyboards.inline import (
+    back_to_menu_kb,
+    tarot_history_kb,
+    tarot_interpret_kb,
+    tarot_menu_kb,
+    tarot_reading_kb,
+    tarot_search_kb,
+)
 from bot.middlewares.limits import RateLimitMiddleware
-from bot.services.ai import ai_interpreter
-from bot.services.tarot import SPREADS, tarot
+from bot.services.ai import AI_UNAVAILABLE, ai_interpreter
+from bot.services.card_counts import card_counts
+from bot.services.card_search import (
+    find_readings,
+    month_start,
+    parse_card_query,
+    reading_card_rows,
+    suit_stats,
+)
+from bot.services.daily_card import daily_cards, local_now, user_zone
+from bot.services.reading_history import decode_cursor, encode_cursor, history_page
+from bot.services.tarot import SPREADS, SUIT_EMOJI, SUIT_NAMES, tarot
+from bot.services.tarot_render import card_block
 from bot.utils.personalization import (
-    CARD_STORIES,
     TAROT_DAILY_TEMPLATE,
     TAROT_DECISION_TEMPLATE,
     TAROT_THREE_CARDS_TEMPLATE,
-    get_card_story,
+    get_repeat_card_message,
     get_time_greeting,
 )
 from bot.utils.texts_new import TAROT_ASK_QUESTION, TAROT_MENU
@@ -26,6 +47,7 @@ router = Router(name="tarot")
 
 class TarotStates(StatesGroup):
     waiting_question = State()
+    waiting_card = State()
 
 
 # ═══════════════════════════════════════════════════════════
@@ -71,21 +93,12 @@ async def tarot_start_spread(
         )
         return
 
-    # Проверяем лимит
-    rate_limiter = RateLimitMiddleware.__new__(RateLimitMiddleware)
-    rate_limiter.redis = redis
-    rate_limiter.limits = {"free": 1, "basic": 10, "premium": 50, "expert": 999}
-    allowed, remaining = await rate_limiter.check_limit(db_user, "tarot")
-    if not allowed:
-        from bot.utils.texts_new import LIMIT_REACHED
-        await callback.message.edit_text(
-            LIMIT_REACHED, reply_markup=back_to_menu_kb(), parse_mode="HTML"
-        )
+    # Карта дня — одна на день; уже выданная открывается без лимита
+    if spread_type == "daily":
+        await _daily_card(callback.message, db_user, redis)
         return
 
-    # Для карты дня — сразу делаем расклад
-    if spread_type == "daily":
-        await _do_spread(callback.message, db_user, spread_type, question=None, edit=True)
+    if not await _check_limit(callback.message, db_user, redis):
         return
 
     # Для остальных — спрашиваем вопрос
@@ -94,6 +107,19 @@ async def tarot_start_spread(
     await state.set_state(TarotStates.waiting_question)
 
 
+async def _check_limit(message: Message, db_user: User, redis: object) -> bool:
+    rate_limiter = RateLimitMiddleware.__new__(RateLimitMiddleware)
+    rate_limiter.redis = redis
+    rate_limiter.limits = {"free": 1, "basic": 10, "premium": 50, "expert": 999}
+    allowed, remaining = await rate_limiter.check_limit(db_user, "tarot")
+    if not allowed:
+        from bot.utils.texts_new import LIMIT_REACHED
+        await message.edit_text(
+            LIMIT_REACHED, reply_markup=back_to_menu_kb(), parse_mode="HTML"
+        )
+    return allowed
+
+
 @router.message(TarotStates.waiting_question)
 async def tarot_process_question(
     message: Message, state: FSMContext, db_user: User
@@ -130,32 +156,33 @@ async def _do_spread(
         name = profile.current_name if profile else ""
     
     # Формируем повествовательный текст
-    if spread_type == "daily":
-        text = _format_daily_spread(result, name, profile, db_user)
-    elif spread_type == "decision":
-        text = _format_decision_spread(result, name, question)
-    else:
-        text = _format_three_cards_spread(result, name, question)
-
-    # Сохраняем в БД
-    cards_data = [
-        {"position": item["position"], "card": item["card"].to_dict()}
-        for item in result["cards"]
-    ]
+    text = _format_spread(spread_type, result, name, question)
 
+    # Сохраняем в БД только зерно — расклад повторяется по нему из колоды;
+    # карты построчно — для поиска по ним
+    drawn = [item["card"] for item in result["cards"]]
     async with async_session() as session:
         reading = TarotReading(
             user_id=db_user.id,
             spread_type=spread_type,
-            cards_json=cards_data,
+            seed=result["seed"],
+            deck_version=result["deck_version"],
             question=question,
             is_premium=db_user.subscription_type in ("premium", "expert"),
         )
         session.add(reading)
+        await session.flush()
+        session.add_all(reading_card_rows(reading, drawn))
         await session.commit()
-        await session.refresh(reading)
         reading_id = reading.id
 
+    # «Эта карта снова» — счётчики приходят из того же обновления
+    counts = await card_counts.record(db_user.id, (card.id for card in drawn), reading_id)
+    repeated = max(drawn, key=lambda card: counts.get(card.id, 0))
+    repeat_message = get_repeat_card_message(repeated.name_ru, counts.get(repeated.id, 0))
+    if repeat_message:
+        text = f"{text}\n{repeat_message}"
+
     # Добавляем призыв к AI
     kb = tarot_interpret_kb(reading_id)
     
@@ -165,51 +192,109 @@ async def _do_spread(
         await message.answer(text, reply_markup=kb, parse_mode="HTML")
 
 
+async def _daily_card(message: Message, db_user: User, redis: object) -> None:
+    """Карта дня: по (пользователь, местная дата), повторно — из кэша."""
+    async with async_session() as session:
+        profile = (await session.execute(
+            select(Profile).where(Profile.user_id == db_user.id)
+        )).scalar_one_or_none()
+    name = profile.current_name if profile else ""
+    local = local_now(user_zone(profile))
+
+    daily = await daily_cards.cached(db_user.id, local)
+    if daily is None:
+        if not await _check_limit(message, db_user, redis):
+            return
+        daily = await daily_cards.create(
+            db_user.id, local, is_premium=db_user.subscription_type in ("premium", "expert"),
+        )
+
+    text = _format_spread("daily", daily.spread, name, None, profile, local)
+    if daily.created:
+        card = daily.spread["cards"][0]["card"]
+        counts = await card_counts.record(db_user.id, (card.id,), daily.reading_id)
+        repeat_message = get_repeat_card_message(card.name_ru, counts.get(card.id, 0))
+        if repeat_message:
+            text = f"{text}\n{repeat_message}"
+
+    await message.edit_text(text, reply_markup=tarot_interpret_kb(daily.reading_id), parse_mode="HTML")
+
+
+KEY_QUESTIONS = (
+    "Что ты откладывал(а) 'потом' — и готово ли это 'потом' наступить?",
+    "Какую правду ты избегаешь видеть?",
+    "Что изменится, если ты перестанешь сопротивляться?",
+    "Какой шаг ты боишься сделать — но знаешь, что нужно?",
+    "Что ты контролируешь слишком сильно?",
+)
+DAILY_ADVICES = (
+    "Не принимай сегодня поспешных решений до 15:00",
+    "Обрати внимание на знаки — повторяющиеся числа, песни, фразы",
+    "Скажи 'да' тому, что обычно отклоняешь",
+    "Сделай паузу перед ответом — даже если уверен(а)",
+    "Запиши сон сегодняшней ночи — даже если кажется бредом",
+)
+DAILY_REFLECTIONS = (
+    "Что я сопротивляюсь принять?",
+    "Какую маску я ношу слишком долго?",
+    "Что изменится, если я перестану бояться?",
+    "Кому я должен(на) прощение — включая себя?",
+    "Что я знаю, но делаю вид, что не знаю?",
+)
+YEAR_HINTS = {
+    1: "Год новых начинаний — карта поддерживает смелые шаги",
+    2: "Год партнёрств — обрати внимание на предложения помощи",
+    3: "Год творчества — экспериментируй, не жди идеальных условий",
+    4: "Год работы — карта говорит о важности фундамента",
+    5: "Год перемен — будь готов(а) к неожиданным поворотам",
+    6: "Год отношений — семья и близкие на первом месте",
+    7: "Год анализа — доверяй интуиции, она остра сейчас",
+    8: "Год результатов — время собирать урожай усилий",
+    9: "Год завершений — отпускай то, что отжило своё",
+}
+DECISION_RECOMMENDATIONS = (
+    "Оба пути ведут к росту — выбирай тот, который пугает сильнее",
+    "Суть ситуации важнее вариантов — разберись с ней первым делом",
+    "Ты уже знаешь ответ — карты просто отражают это",
+    "Подожди 3 дня — сейчас эмоции мешают видеть ясно",
+    "Выбери вариант А, если хочешь комфорта. Вариант Б — если роста",
+)
+
+
+def _format_spread(
+    spread_type: str,
+    result: dict,
+    name: str,
+    question: str | None,
+    profile: Profile | None = None,
+    local: datetime | None = None,
+) -> str:
+    """Текст расклада любого типа из SPREADS."""
+    if spread_type == "daily":
+        return _format_daily_spread(result, name, profile, local or datetime.now(timezone.utc))
+    if spread_type == "decision":
+        return _format_decision_spread(result, name, question)
+    return _format_three_cards_spread(result, name, question)
+
+
 def _format_three_cards_spread(result: dict, name: str, question: str | None) -> str:
-    """Форматирует расклад '3 карты' как историю."""
-    cards = result["cards"]
-    
-    past_card = cards[0]["card"]
-    present_card = cards[1]["card"]
-    future_card = cards[2]["card"]
-    
-    past_reversed = " (перевёрнутая)" if past_card.reversed else ""
-    present_reversed = " (перевёрнутая)" if present_card.reversed else ""
-    future_reversed = " (перевёрнутая)" if future_card.reversed else ""
-    
-    # Генерируем историю
-    past_story = get_card_story(past_card.name_ru, past_card.reversed)
-    present_story = get_card_story(present_card.name_ru, present_card.reversed)
-    future_story = get_card_story(future_card.name_ru, future_card.reversed)
-    
-    # Формируем ключевой вопрос
-    key_questions = [
-        "Что ты откладывал(а) 'потом' — и готово ли это 'потом' наступить?",
-        "Какую правду ты избегаешь видеть?",
-        "Что изменится, если ты перестанешь сопротивляться?",
-        "Какой шаг ты боишься сделать — но знаешь, что нужно?",
-        "Что ты контролируешь слишком сильно?",
-    ]
-    import random
-    key_question = random.choice(key_questions)
-    
+    """Форматирует расклад '3 карты' как историю.
+
+    У Кельтского креста историю составляют первые три карты.
+    """
+    past, present, future = (item["card"] for item in result["cards"][:3])
+
     text = TAROT_THREE_CARDS_TEMPLATE.format(
         name=name or "Друг",
-        past_card=past_card.name_ru,
-        past_reversed=past_reversed,
-        past_story=past_story,
-        present_card=present_card.name_ru,
-        present_reversed=present_reversed,
-        present_story=present_story,
-        future_card=future_card.name_ru,
-        future_reversed=future_reversed,
-        future_story=future_story,
-        key_question=key_question,
+        past=card_block(past, "past"),
+        present=card_block(present, "present"),
+        future=card_block(future, "future"),
+        key_question=random.choice(KEY_QUESTIONS),
     )
-    
+
     if question:
         text = f"❓ <b>Вопрос:</b> {question}\n\n{text}"
-    
+
     return text
 
 
@@ -217,117 +302,48 @@ def _format_daily_spread(
     result: dict, 
     name: str, 
     profile: Profile | None,
-    db_user: User,
+    local: datetime,
 ) -> str:
-    """Форматирует 'Карту дня' с персонализацией."""
-    from datetime import datetime
-    
+    """Форматирует 'Карту дня' с персонализацией.
+
+    Совет и вопрос выбираются по зерну расклада — при повторном открытии
+    текст тот же.
+    """
     card = result["cards"][0]["card"]
-    reversed_mark = " (перевёрнутая)" if card.reversed else ""
-    
-    # Определяем время суток
-    hour = datetime.now().hour
-    time_of_day = get_time_greeting(hour)
-    
-    # Получаем историю карты
-    card_story = get_card_story(card.name_ru, card.reversed)
-    
-    # Генерируем совет
-    advices = [
-        "Не принимай сегодня поспешных решений до 15:00",
-        "Обрати внимание на знаки — повторяющиеся числа, песни, фразы",
-        "Скажи 'да' тому, что обычно отклоняешь",
-        "Сделай паузу перед ответом — даже если уверен(а)",
-        "Запиши сон сегодняшней ночи — даже если кажется бредом",
-    ]
-    import random
-    advice = random.choice(advices)
-    
-    # Вопрос для размышления
-    reflections = [
-        "Что я сопротивляюсь принять?",
-        "Какую маску я ношу слишком долго?",
-        "Что изменится, если я перестану бояться?",
-        "Кому я должен(на) прощение — включая себя?",
-        "Что я знаю, но делаю вид, что не знаю?",
-    ]
-    reflection = random.choice(reflections)
-    
+    rng = random.Random(result["seed"])
+
     # Персональный год
+    personal_year = "—"
     year_hint = ""
     if profile and profile.birth_date:
         from bot.services.numerology import numerology
         personal_year = numerology.calculate_personal_year(profile.birth_date)
-        year_hints = {
-            1: "Год новых начинаний — карта поддерживает смелые шаги",
-            2: "Год партнёрств — обрати внимание на предложения помощи",
-            3: "Год творчества — экспериментируй, не жди идеальных условий",
-            4: "Год работы — карта говорит о важности фундамента",
-            5: "Год перемен — будь готов(а) к неожиданным поворотам",
-            6: "Год отношений — семья и близкие на первом месте",
-            7: "Год анализа — доверяй интуиции, она остра сейчас",
-            8: "Год результатов — время собирать урожай усилий",
-            9: "Год завершений — отпускай то, что отжило своё",
-        }
-        year_hint = year_hints.get(personal_year, "")
-    
+        year_hint = YEAR_HINTS.get(personal_year, "")
+
     return TAROT_DAILY_TEMPLATE.format(
-        time_of_day=time_of_day,
+        time_of_day=get_time_greeting(local.hour),
         name=name or "Друг",
-        card_name=card.name_ru,
-        reversed=reversed_mark,
-        card_story=card_story,
-        advice=advice,
-        reflection_question=reflection,
-        personal_year=personal_year if profile else "—",
+        card=card_block(card, "daily"),
+        advice=rng.choice(DAILY_ADVICES),
+        reflection_question=rng.choice(DAILY_REFLECTIONS),
+        personal_year=personal_year,
         year_hint=year_hint,
     )
 
 
 def _format_decision_spread(result: dict, name: str, question: str | None) -> str:
     """Форматирует расклад 'Решение' с историей выбора."""
-    cards = result["cards"]
-    
-    left_card = cards[0]["card"]   # Вариант А
-    right_card = cards[1]["card"]  # Вариант Б
-    center_card = cards[2]["card"]  # Суть
-    
-    left_reversed = " (перевёрнутая)" if left_card.reversed else ""
-    right_reversed = " (перевёрнутая)" if right_card.reversed else ""
-    center_reversed = " (перевёрнутая)" if center_card.reversed else ""
-    
-    # Истории для вариантов
-    left_story = get_card_story(left_card.name_ru, left_card.reversed)
-    right_story = get_card_story(right_card.name_ru, right_card.reversed)
-    center_story = get_card_story(center_card.name_ru, center_card.reversed)
-    
-    # Рекомендация
-    recommendations = [
-        "Оба пути ведут к росту — выбирай тот, который пугает сильнее",
-        "Суть ситуации важнее вариантов — разберись с ней первым делом",
-        "Ты уже знаешь ответ — карты просто отражают это",
-        "Подожди 3 дня — сейчас эмоции мешают видеть ясно",
-        "Выбери вариант А, если хочешь комфорта. Вариант Б — если роста",
-    ]
-    import random
-    recommendation = random.choice(recommendations)
-    
-    text = TAROT_DECISION_TEMPLATE.format(
+    # Вариант А, Вариант Б, суть
+    left, right, center = (item["card"] for item in result["cards"])
+
+    return TAROT_DECISION_TEMPLATE.format(
         name=name or "Друг",
         question=question or "Выбор",
-        left_card=left_card.name_ru,
-        left_reversed=left_reversed,
-        left_story=left_story,
-        right_card=right_card.name_ru,
-        right_reversed=right_reversed,
-        right_story=right_story,
-        center_card=center_card.name_ru,
-        center_reversed=center_reversed,
-        center_story=center_story,
-        recommendation=recommendation,
+        left=card_block(left, "option_a"),
+        right=card_block(right, "option_b"),
+        center=card_block(center, "core"),
+        recommendation=random.choice(DECISION_RECOMMENDATIONS),
     )
-    
-    return text
 
 
 # ═══════════════════════════════════════════════════════════
@@ -354,10 +370,13 @@ async def tarot_interpret(callback: CallbackQuery, db_user: User) -> None:
         )
         return
 
-    # Получаем расклад
+    # Получаем расклад — только свой: номер приходит из callback_data
     async with async_session() as session:
         result = await session.execute(
-            select(TarotReading).where(TarotReading.id == reading_id)
+            select(TarotReading).where(
+                TarotReading.id == reading_id,
+                TarotReading.user_id == db_user.id,
+            )
         )
         reading = result.scalar_one_or_none()
 
@@ -367,6 +386,22 @@ async def tarot_interpret(callback: CallbackQuery, db_user: User) -> None:
         )
         return
 
+    # Трактовка уже есть (карта дня открыта повторно) — без нового запроса к AI
+    interpretation = reading.ai_interpretation or await _new_interpretation(reading, db_user)
+
+    text = (
+        f"🤖 <b>AI-трактовка</b>\n\n"
+        f"{interpretation}\n\n"
+        f"<i>Это не истина — это точка обзора. "
+        f"Увидел(а) что-то ценное? Запиши. Нет? Отпусти.</i>"
+    )
+    await callback.message.edit_text(
+        text, reply_markup=back_to_menu_kb(), parse_mode="HTML"
+    )
+
+
+async def _new_interpretation(reading: TarotReading, db_user: User) -> str:
+    """AI-трактовка расклада; сохраняется в саму запись."""
     # Получаем контекст пользователя
     async with async_session() as session:
         result = await session.execute(
@@ -386,27 +421,159 @@ async def tarot_interpret(callback: CallbackQuery, db_user: User) -> None:
 
     # AI-трактовка
     interpretation = await ai_interpreter.interpret_tarot(
-        cards=reading.cards_json,
+        cards=[
+            {"position": item["position"], "card": item["card"].to_dict()}
+            for item in tarot.reading_cards(reading)
+        ],
         question=reading.question,
         user_context=user_context,
     )
 
-    # Сохраняем
+    # Сохраняем — кроме заглушки недоступного AI, её не переиспользуем
+    if interpretation == AI_UNAVAILABLE:
+        return interpretation
     async with async_session() as session:
         result = await session.execute(
-            select(TarotReading).where(TarotReading.id == reading_id)
+            select(TarotReading).where(TarotReading.id == reading.id)
         )
-        reading = result.scalar_one_or_none()
-        if reading:
-            reading.ai_interpretation = interpretation
+        saved = result.scalar_one_or_none()
+        if saved:
+            saved.ai_interpretation = interpretation
             await session.commit()
+    return interpretation
 
-    text = (
-        f"🤖 <b>AI-трактовка</b>\n\n"
-        f"{interpretation}\n\n"
-        f"<i>Это не истина — это точка обзора. "
-        f"Увидел(а) что-то ценное? Запиши. Нет? Отпусти.</i>"
+
+# ═══════════════════════════════════════════════════════════
+# ИСТОРИЯ РАСКЛАДОВ
+# ═══════════════════════════════════════════════════════════
+
+@router.callback_query(F.data.startswith("tarot_history"))
+async def tarot_history(callback: CallbackQuery, db_user: User) -> None:
+    await callback.answer()
+    _, _, raw_cursor = callback.data.partition(":")
+    cursor = decode_cursor(raw_cursor) if raw_cursor else None
+
+    async with async_session() as session:
+        items, next_cursor = await history_page(session, db_user.id, cursor)
+
+    if not items and cursor is None:
+        await callback.message.edit_text(
+            "📜 <b>История раскладов</b>\n\nЗдесь пока пусто — сделай первый расклад.",
+            reply_markup=tarot_menu_kb(),
+            parse_mode="HTML",
+        )
+        return
+
+    lines = ["📜 <b>История раскладов</b>\n"]
+    for item in items:
+        lines.append(f"<b>{item.created_at:%d.%m.%Y} · {item.title}</b>")
+        lines.append(f"<i>{', '.join(item.card_names())}</i>")
+    await callback.message.edit_text(
+        "\n".join(lines),
+        reply_markup=tarot_history_kb(
+            items,
+            encode_cursor(next_cursor) if next_cursor else None,
+            first_page=cursor is None,
+        ),
+        parse_mode="HTML",
     )
+
+
+@router.callback_query(F.data.startswith("tarot_reading:"))
+async def tarot_show_reading(callback: CallbackQuery, db_user: User) -> None:
+    await callback.answer()
+    reading_id = int(callback.data.split(":")[1])
+
+    async with async_session() as session:
+        result = await session.execute(
+            select(TarotReading).where(
+                TarotReading.id == reading_id,
+                TarotReading.user_id == db_user.id,
+            )
+        )
+        reading = result.scalar_one_or_none()
+
+    if not reading or reading.spread_type not in SPREADS:
+        await callback.message.edit_text(
+            "Расклад не найден.", reply_markup=back_to_menu_kb()
+        )
+        return
+
+    text = tarot.format_spread_text({
+        "spread": SPREADS[reading.spread_type],
+        "cards": tarot.reading_cards(reading),
+    })
+    header = f"📅 {reading.created_at:%d.%m.%Y %H:%M}\n"
+    if reading.question:
+        header += f"❓ <b>Вопрос:</b> {html.escape(reading.question)}\n"
+    text = f"{header}\n{text}"
+    if reading.ai_interpretation:
+        interpretation = f"\n🤖 <b>AI-трактовка</b>\n\n{reading.ai_interpretation}"
+        # Лимит Telegram — 4096 символов; резать HTML посередине нельзя
+        if len(text) + len(interpretation) <= 4096:
+            text += interpretation
+
     await callback.message.edit_text(
-        text, reply_markup=back_to_menu_kb(), parse_mode="HTML"
+        text,
+        reply_markup=tarot_reading_kb(reading.id, bool(reading.ai_interpretation)),
+        parse_mode="HTML",
     )
+
+
+# ═══════════════════════════════════════════════════════════
+# ПОИСК ПО КАРТАМ
+# ═══════════════════════════════════════════════════════════
+
+TAROT_SEARCH_PROMPT = (
+    "🔎 <b>Поиск по картам</b>\n\n"
+    "Напиши карту — например, «Башня перевёрнутая» или «Туз Кубков», "
+    "и я найду расклады, где она выпадала."
+)
+
+
+def _format_suit_stats(stats: dict) -> str:
+    lines = ["📊 <b>Масти в этом месяце</b>"]
+    for suit, values in stats.items():
+        if values["cards"]:
+            lines.append(
+                f"{SUIT_EMOJI[suit]} {SUIT_NAMES[suit]}: карт — {values['cards']}, "
+                f"вела в раскладах — {values['dominant']}"
+            )
+    return "\n".join(lines) if len(lines) > 1 else ""
+
+
+@router.callback_query(F.data == "tarot_search")
+async def tarot_search(callback: CallbackQuery, state: FSMContext, db_user: User) -> None:
+    await callback.answer()
+    async with async_session() as session:
+        stats = await suit_stats(session, db_user.id, month_start())
+
+    text = TAROT_SEARCH_PROMPT
+    summary = _format_suit_stats(stats)
+    if summary:
+        text = f"{text}\n\n{summary}"
+    await callback.message.edit_text(text, reply_markup=tarot_search_kb([]), parse_mode="HTML")
+    await state.set_state(TarotStates.waiting_card)
+
+
+@router.message(TarotStates.waiting_card)
+async def tarot_search_card(message: Message, state: FSMContext, db_user: User) -> None:
+    parsed = parse_card_query(message.text or "")
+    if parsed is None:
+        await message.answer(
+            "Не узнал карту 🤔 Попробуй полное название: «Королева Мечей», «Луна».",
+            reply_markup=tarot_search_kb([]),
+        )
+        return
+
+    await state.clear()
+    card, reversed_ = parsed
+    async with async_session() as session:
+        total, hits = await find_readings(session, db_user.id, card.id, reversed_)
+
+    label = card.name_ru + {True: " (перевёрнутая)", False: " (прямая)", None: ""}[reversed_]
+    if not total:
+        text = f"🔎 <b>{label}</b> тебе пока не выпадала."
+    else:
+        text = f"🔎 <b>{label}</b> — выпадала {total} раз(а). Последние расклады:"
+    await message.answer(text, reply_markup=tarot_search_kb(hits), parse_mode="HTML")
@@ -39,6 +39,10 @@ def tarot_menu_kb():
     builder.row(InlineKeyboardButton(text="🌅 Карта дня", callback_data="tarot:daily"))
     builder.row(InlineKeyboardButton(text="🎴 Три карты", callback_data="tarot:three_cards"))
     builder.row(InlineKeyboardButton(text="⚖️ Расклад на решение", callback_data="tarot:decision"))
+    builder.row(
+        InlineKeyboardButton(text="📜 История", callback_data="tarot_history"),
+        InlineKeyboardButton(text="🔎 Поиск по картам", callback_data="tarot_search"),
+    )
     builder.row(InlineKeyboardButton(text="🔙 Назад", callback_data="menu:back"))
     return builder.as_markup()
 
@@ -52,6 +56,46 @@ def tarot_interpret_kb(reading_id: int):
     return builder.as_markup()
 
 
+def tarot_history_kb(items, next_cursor: str | None, first_page: bool):
+    """Страница истории: расклады кнопками, дальше — по курсору."""
+    builder = InlineKeyboardBuilder()
+    for item in items:
+        builder.row(InlineKeyboardButton(
+            text=f"{item.created_at:%d.%m.%Y} · {item.title}",
+            callback_data=f"tarot_reading:{item.id}",
+        ))
+    nav = []
+    if not first_page:
+        nav.append(InlineKeyboardButton(text="⏮ К новым", callback_data="tarot_history"))
+    if next_cursor:
+        nav.append(InlineKeyboardButton(text="Ранее ▶", callback_data=f"tarot_history:{next_cursor}"))
+    if nav:
+        builder.row(*nav)
+    builder.row(InlineKeyboardButton(text="🔙 Назад", callback_data="menu:tarot"))
+    return builder.as_markup()
+
+
+def tarot_reading_kb(reading_id: int, has_interpretation: bool):
+    """Сохранённый расклад из истории."""
+    builder = InlineKeyboardBuilder()
+    if not has_interpretation:
+        builder.row(InlineKeyboardButton(text="🤖 AI-трактовка", callback_data=f"tarot:interpret:{reading_id}"))
+    builder.row(InlineKeyboardButton(text="📜 К истории", callback_data="tarot_history"))
+    return builder.as_markup()
+
+
+def tarot_search_kb(hits):
+    """Найденные расклады с картой — кнопками."""
+    builder = InlineKeyboardBuilder()
+    for hit in hits:
+        builder.row(InlineKeyboardButton(
+            text=f"{hit.created_at:%d.%m.%Y}{' · ↺' if hit.reversed else ''}",
+            callback_data=f"tarot_reading:{hit.reading_id}",
+        ))
+    builder.row(InlineKeyboardButton(text="🔙 Назад", callback_data="menu:tarot"))
+    return builder.as_markup()
+
+
 def numerology_menu_kb():
     """Меню нумерологии."""
     builder = InlineKeyboardBuilder()
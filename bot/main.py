@@ -3,6 +3,7 @@
 import asyncio
 import logging
 import sys
+from datetime import time
 
 import structlog
 from aiogram import Bot, Dispatcher
@@ -16,6 +17,7 @@ from bot.database import close_db, init_db
 from bot.handlers import (
     admin,
     astrology,
+    groups,
     journal,
     numerology,
     profile,
@@ -25,6 +27,16 @@ from bot.handlers import (
 )
 from bot.middlewares.auth import AuthMiddleware
 from bot.middlewares.limits import RateLimitMiddleware
+from bot.services.astro_pool import astro_pool
+from bot.services.card_counts import card_counts
+from bot.services.daily_card import daily_cards
+from bot.services.geocoder import geocoder
+from bot.services.horoscopes import horoscopes
+from bot.services.notifications import drain
+from bot.services.scheduler import scheduler
+from bot.services.sky import sky
+from bot.services.transit_alerts import run_transit_alerts
+from bot.services.transit_calendar import transit_calendar
 
 
 def setup_logging() -> None:
@@ -72,6 +84,7 @@ async def main() -> None:
     dp.include_routers(
         admin.router,
         start.router,
+        groups.router,
         profile.router,
         numerology.router,
         tarot.router,
@@ -84,6 +97,30 @@ async def main() -> None:
     await init_db()
     logger.info("Database initialized")
 
+    # Справочник городов — строим индекс заранее, вне event loop
+    await asyncio.get_running_loop().run_in_executor(None, geocoder.load)
+
+    # Тёплый пул процессов для расчёта карт
+    await astro_pool.start()
+
+    # Фоновые задачи
+    sky.setup(redis)
+    scheduler.add_daily("sky_day", sky.refresh, at=time(0, 0), run_on_start=True)
+    scheduler.add_interval("sky_hour", sky.refresh_hour, seconds=3600)
+    horoscopes.setup(redis)
+    scheduler.add_daily("horoscopes", horoscopes.refresh, at=time(0, 5), run_on_start=True)
+    scheduler.add_daily("transit_alerts", lambda: run_transit_alerts(redis), at=time(3, 0))
+    # Счётчики карт таро: живые в Redis, свёртка в Postgres
+    card_counts.setup(redis)
+    scheduler.add_interval("tarot_card_counts", card_counts.rollup, seconds=600)
+    # Карта дня: номер расклада в Redis до местной полуночи
+    daily_cards.setup(redis)
+    # Считает календари один раз в начале месяца (дальше — отметка в Redis)
+    transit_calendar.setup(redis)
+    scheduler.add_daily("calendar_month", transit_calendar.precompute_month, at=time(1, 0), run_on_start=True)
+    scheduler.add_interval("notifications", lambda: drain(bot, redis), seconds=5)
+    scheduler.start()
+
     # Start polling
     try:
         logger.info("Bot is running (polling mode)")
@@ -91,6 +128,9 @@ async def main() -> None:
         await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
     finally:
         logger.info("Shutting down...")
+        await scheduler.stop()
+        await card_counts.rollup()
+        await astro_pool.stop()
         await redis.close()
         await close_db()
         await bot.session.close()
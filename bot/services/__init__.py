@@ -2,3 +2,5 @@
 from bot.services import ai
 from bot.services import ai_prompts
 from bot.services import astrology_engine
+from bot.services import transits
+from bot.services import synastry
@@ -11,10 +11,13 @@ from bot.services.ai_prompts import (
     TAROT_INTERPRET_PROMPT,
     NUMEROLOGY_INTERPRET_PROMPT,
     DAILY_CARD_PROMPT,
+    SIGN_HOROSCOPE_PROMPT,
 )
 
 logger = structlog.get_logger()
 
+AI_UNAVAILABLE = "AI-интерпретация временно недоступна. Попробуйте позже."
+
 
 class AIInterpreter:
     def __init__(self) -> None:
@@ -65,6 +68,11 @@ class AIInterpreter:
 
         return await self._request(prompt)
 
+    async def generate_sign_horoscope(self, sign: str, day: str, sky: str) -> str:
+        prompt = SIGN_HOROSCOPE_PROMPT.format(sign=sign, day=day, sky=sky)
+
+        return await self._request(prompt)
+
     async def _request(self, prompt: str) -> str:
         # Пробуем YandexGPT
         if self.yandex_api_key and self.yandex_folder_id:
@@ -80,7 +88,7 @@ class AIInterpreter:
             except Exception as e:
                 logger.error("Anthropic error", error=str(e))
 
-        return "AI-интерпретация временно недоступна. Попробуйте позже."
+        return AI_UNAVAILABLE
 
     async def _request_yandex(self, prompt: str) -> str:
         import asyncio
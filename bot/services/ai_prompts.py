@@ -89,3 +89,18 @@ DAILY_CARD_PROMPT = """Интерпретируй карту дня.
 4. Совет дня — в 1 предложении
 
 ТОН: коротко, по делу, без воды"""
+
+# Промпт для дневного гороскопа знака
+SIGN_HOROSCOPE_PROMPT = """Напиши гороскоп на день для знака.
+
+ЗНАК: {sign}
+ДАТА: {day}
+НЕБО ДНЯ:
+{sky}
+
+ЗАДАЧА:
+1. Как небо дня отзывается именно в этом знаке — 2-3 предложения
+2. На что обратить внимание (конкретно)
+3. Совет дня — в 1 предложении
+
+ТОН: коротко, по делу, без воды. 60-100 слов, без заголовков и списков"""
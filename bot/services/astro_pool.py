@@ -0,0 +1,165 @@
+"""Пул процессов для расчёта натальных карт вне event loop.
+
+flatlib и Swiss Ephemeris считают карту синхронно и держат GIL, поэтому
+расчёт уходит в тёплые процессы: эфемериды, справочник городов и часовые
+пояса загружаются в воркер один раз при старте. Запросы, пришедшие почти
+одновременно, собираются в пачку и отправляются воркеру одним вызовом.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Optional
+
+import structlog
+
+from bot.config import settings
+from bot.services.astrology_engine import NatalChart, astrology
+
+logger = structlog.get_logger()
+
+# Сколько ждать попутчиков для пачки и насколько большой она может быть
+BATCH_WINDOW = 0.005
+MAX_BATCH = 32
+
+ChartArgs = tuple[date, Optional[str], float, float]
+
+
+def _init_worker() -> None:
+    """Прогрев воркера: эфемериды, справочник городов, первая карта."""
+    from bot.services.geocoder import geocoder
+    from bot.services.timezones import tz_resolver
+
+    ephe_path = os.environ.get("SE_EPHE_PATH")
+    if ephe_path and astrology.flatlib_available:
+        from flatlib.ephem import setPath
+        setPath(ephe_path)
+
+    geocoder.load()
+    tz_resolver.zone_for(55.75, 37.61)
+    astrology.calculate_natal_chart(date(2000, 1, 1), "12:00", 55.75, 37.61)
+
+
+def _compute_batch(batch: list[ChartArgs]) -> list[Optional[NatalChart]]:
+    """Считает пачку карт в воркере."""
+    return [astrology.calculate_natal_chart(*args) for args in batch]
+
+
+def _compute_one(args: ChartArgs) -> Optional[NatalChart]:
+    return astrology.calculate_natal_chart(*args)
+
+
+class AstroPool:
+    """Асинхронный фасад над ProcessPoolExecutor с пакетированием запросов."""
+
+    def __init__(self, workers: int = settings.astro_workers) -> None:
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        # Ссылки на задачи пачек: без них задачу может собрать сборщик мусора
+        self._batches: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        if self._executor is not None:
+            return
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._dispatcher = asyncio.create_task(self._dispatch(), name="astro_pool")
+
+        # Поднимаем все процессы сразу, чтобы первый пользователь не ждал прогрева
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(self._executor, _compute_batch, [])
+            for _ in range(self.workers)
+        ))
+        logger.info("Astro pool started", workers=self.workers)
+
+    async def stop(self) -> None:
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+        # Пачки при отмене сами завершают свои запросы ошибкой
+        for task in self._batches:
+            task.cancel()
+        await asyncio.gather(*self._batches, return_exceptions=True)
+        # Запросы, до которых очередь не дошла, тоже не должны ждать вечно
+        if self._queue is not None:
+            queued = []
+            while not self._queue.empty():
+                queued.append(self._queue.get_nowait())
+            _fail(queued, RuntimeError("Astro pool stopped"))
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self._dispatcher = None
+        self._queue = None
+
+    async def natal_chart(
+        self,
+        birth_date: date,
+        birth_time: Optional[str],
+        latitude: float,
+        longitude: float,
+    ) -> Optional[NatalChart]:
+        """Натальная карта без блокировки event loop."""
+        args = (birth_date, birth_time, latitude, longitude)
+        if self._executor is None:
+            # Пул не запущен (скрипты, отладка) — считаем в потоке
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, _compute_one, args)
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((args, future))
+        return await future
+
+    async def _dispatch(self) -> None:
+        """Собирает запросы в пачки, пока все воркеры заняты."""
+        while True:
+            await self._slots.acquire()
+            items = [await self._queue.get()]
+            try:
+                # Даём попутчикам немного времени, затем забираем всё, что успело прийти
+                await asyncio.sleep(BATCH_WINDOW)
+            except asyncio.CancelledError:
+                _fail(items, RuntimeError("Astro pool stopped"))
+                raise
+            while len(items) < MAX_BATCH and not self._queue.empty():
+                items.append(self._queue.get_nowait())
+            task = asyncio.create_task(self._run_batch(items))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, items: list) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            charts = await loop.run_in_executor(
+                self._executor, _compute_batch, [args for args, _ in items]
+            )
+        except asyncio.CancelledError:
+            _fail(items, RuntimeError("Astro pool stopped"))
+            raise
+        except Exception as e:
+            logger.error("Astro pool batch failed", size=len(items), error=str(e))
+            _fail(items, e)
+            return
+        finally:
+            self._slots.release()
+
+        for (_, future), chart in zip(items, charts):
+            if not future.done():
+                future.set_result(chart)
+
+
+def _fail(items: list, error: Exception) -> None:
+    """Завершает ещё ожидающие запросы пачки ошибкой."""
+    for _, future in items:
+        if not future.done():
+            future.set_exception(error)
+
+
+# Глобальный экземпляр
+astro_pool = AstroPool()
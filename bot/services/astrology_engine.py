@@ -1,20 +1,43 @@
 """Астрологический движок — расчёт натальных карт и транзитов."""
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional, Dict, List, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+import structlog
+
+from bot.config import settings
+from bot.services import houses
+
 # Пытаемся импортировать flatlib, если доступен
 try:
     from flatlib import const
     from flatlib.chart import Chart
     from flatlib.datetime import Datetime as FlatDateTime
+    from flatlib.ephem import swe as flat_swe
     from flatlib.geopos import GeoPos
-    from flatlib.aspect import Aspect
     FLATLIB_AVAILABLE = True
 except ImportError:
     FLATLIB_AVAILABLE = False
 
+logger = structlog.get_logger()
+
+
+SIGN_ORDER = (
+    "Aries", "Taurus", "Gemini", "Cancer",
+    "Leo", "Virgo", "Libra", "Scorpio",
+    "Sagittarius", "Capricorn", "Aquarius", "Pisces",
+)
+
+# Порядок точек карты во всех векторных расчётах: 10 планет + Асцендент
+PLANET_NAMES = (
+    "Sun", "Moon", "Mercury", "Venus", "Mars",
+    "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto",
+)
+CHART_POINTS = PLANET_NAMES + ("Ascendant",)
+
 
 @dataclass
 class PlanetPosition:
@@ -36,11 +59,20 @@ class PlanetPosition:
         }
         return SIGNS.get(self.sign, "")
     
+    @property
+    def longitude(self) -> float:
+        """Эклиптическая долгота 0–360°.
+
+        degree может быть и абсолютной долготой, и градусом внутри знака,
+        поэтому собираем долготу из знака и остатка.
+        """
+        return SIGN_ORDER.index(self.sign) * 30 + self.degree % 30
+    
     @property
     def display(self) -> str:
         """Форматированное отображение."""
         retro = " ℞" if self.retrograde else ""
-        return f"{self.sign_emoji} {self.sign} {self.degree:.1f}°{retro} (дом {self.house})"
+        return f"{self.sign_emoji} {self.sign} {self.degree % 30:.1f}°{retro} (дом {self.house})"
 
 
 @dataclass
@@ -65,17 +97,146 @@ class NatalChart:
             "moon": self.moon,
             "ascendant": self.ascendant,
         }
+    
+    def longitudes(self) -> np.ndarray:
+        """Долготы точек в порядке CHART_POINTS (NaN — точка не рассчитана)."""
+        lons = np.full(len(CHART_POINTS), np.nan)
+        for i, name in enumerate(CHART_POINTS):
+            pos = getattr(self, name.lower())
+            if pos is not None:
+                lons[i] = pos.longitude
+        return lons
+
+    def aspect_patterns(self) -> List[int]:
+        """Коды аспектных фигур (см. bot.services.patterns), не больше PATTERN_SLOTS.
+
+        Предел тот же, что в упакованной карте, — свежая и кэшированная
+        карта показывают одинаковые фигуры.
+        """
+        from bot.services.patterns import detect
+        return detect(self.longitudes())[:PATTERN_SLOTS]
+
+    @classmethod
+    def from_longitudes(cls, lons) -> "NatalChart":
+        """Карта из сохранённых долгот CHART_POINTS; дома — равные от Асцендента."""
+        asc = lons[-1]
+        points = {}
+        for name, lon in zip(CHART_POINTS, lons):
+            if lon is None or np.isnan(lon):
+                continue
+            house = 1 if asc is None or np.isnan(asc) else int(((lon - asc) % 360) // 30) + 1
+            points[name.lower()] = PlanetPosition(
+                name=name,
+                sign=SIGN_ORDER[int(lon // 30) % 12],
+                degree=float(lon),
+                house=house,
+            )
+        return cls(**points)
+
+
+# Упакованная карта: долготы в сотых долях градуса (0xFFFF — точки нет),
+# маска ретроградных планет, номера домов и коды аспектных фигур (0 — пусто)
+# — 43 байта на карту. Фигур хранится не больше PATTERN_SLOTS, самые важные:
+# detect отдаёт их по убыванию важности, больше четырёх — у ~4% карт
+PATTERN_SLOTS = 4
+PACKED_CHART = np.dtype([
+    ("lons", "<u2", (len(CHART_POINTS),)),
+    ("retro", "<u2"),
+    ("houses", "u1", (len(CHART_POINTS),)),
+    ("patterns", "<u2", (PATTERN_SLOTS,)),
+])
+PACKED_MISSING = 0xFFFF
+
+
+class PackedChart:
+    """Натальная карта в упакованном виде.
+
+    Повторяет интерфейс NatalChart для чтения, но PlanetPosition создаются
+    только при обращении к точке (при рендере экрана) и запоминаются.
+    Точность — 0.01°, для знаков, домов и аспектов с запасом. Аспектных
+    фигур — не больше PATTERN_SLOTS.
+    """
+
+    __slots__ = ("record", "_views")
+
+    def __init__(self, record: np.void) -> None:
+        self.record = record
+        self._views: Dict[int, Optional[PlanetPosition]] = {}
+
+    @classmethod
+    def from_chart(cls, chart: NatalChart) -> "PackedChart":
+        record = np.zeros((), dtype=PACKED_CHART)
+        retro = 0
+        for i, name in enumerate(CHART_POINTS):
+            pos = getattr(chart, name.lower())
+            if pos is None:
+                record["lons"][i] = PACKED_MISSING
+                continue
+            record["lons"][i] = int(round(pos.longitude * 100)) % 36000
+            record["houses"][i] = pos.house
+            retro |= int(pos.retrograde) << i
+        record["retro"] = retro
+        from bot.services.patterns import detect
+        codes = detect(chart.longitudes())
+        if len(codes) > PATTERN_SLOTS:
+            logger.info("Aspect patterns truncated", found=len(codes), kept=PATTERN_SLOTS)
+            codes = codes[:PATTERN_SLOTS]
+        record["patterns"][:len(codes)] = codes
+        return cls(record)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "PackedChart":
+        return cls(np.frombuffer(data, dtype=PACKED_CHART)[0])
+
+    def aspect_patterns(self) -> List[int]:
+        """Коды аспектных фигур, сохранённые при упаковке."""
+        return [int(code) for code in self.record["patterns"] if code]
+
+    def to_bytes(self) -> bytes:
+        return self.record.tobytes()
+
+    def longitudes(self) -> np.ndarray:
+        """Долготы точек в порядке CHART_POINTS (NaN — точка не рассчитана)."""
+        return unpack_longitudes_many([self.record.tobytes()])[0]
+
+    def position(self, index: int) -> Optional[PlanetPosition]:
+        if index not in self._views:
+            raw = int(self.record["lons"][index])
+            self._views[index] = None if raw == PACKED_MISSING else PlanetPosition(
+                name=CHART_POINTS[index],
+                sign=SIGN_ORDER[raw // 3000],
+                degree=raw / 100,
+                house=int(self.record["houses"][index]),
+                retrograde=bool(int(self.record["retro"]) >> index & 1),
+            )
+        return self._views[index]
+
+    def get_triad(self) -> Dict[str, PlanetPosition]:
+        """Возвращает триаду: Солнце, Луна, Асцендент."""
+        return {
+            "sun": self.sun,
+            "moon": self.moon,
+            "ascendant": self.ascendant,
+        }
+
+
+# Точки карты как ленивые атрибуты: chart.sun, chart.moon, …
+for _index, _name in enumerate(CHART_POINTS):
+    setattr(PackedChart, _name.lower(), property(lambda self, i=_index: self.position(i)))
+
+
+def unpack_longitudes_many(blobs) -> np.ndarray:
+    """Долготы (N, 11) из пачки упакованных карт одним разбором буфера."""
+    records = np.frombuffer(b"".join(blobs), dtype=PACKED_CHART)
+    raw = records["lons"]
+    return np.where(raw == PACKED_MISSING, np.nan, raw / 100.0)
 
 
 class AstrologyEngine:
     """Движок астрологических расчётов."""
     
     # Знаки зодиака
-    SIGNS = [
-        "Aries", "Taurus", "Gemini", "Cancer",
-        "Leo", "Virgo", "Libra", "Scorpio",
-        "Sagittarius", "Capricorn", "Aquarius", "Pisces"
-    ]
+    SIGNS = list(SIGN_ORDER)
     
     SIGN_EMOJIS = {
         "Aries": "♈", "Taurus": "♉", "Gemini": "♊",
@@ -116,8 +277,9 @@ class AstrologyEngine:
         "Sagittarius": "Мутабельный", "Pisces": "Мутабельный",
     }
     
-    def __init__(self):
+    def __init__(self, house_system: str = settings.house_system):
         self.flatlib_available = FLATLIB_AVAILABLE
+        self.house_system = house_system
     
     def calculate_natal_chart(
         self,
@@ -126,40 +288,39 @@ class AstrologyEngine:
         latitude: float,
         longitude: float,
     ) -> Optional[NatalChart]:
-        """Рассчитывает натальную карту."""
+        """Рассчитывает натальную карту.
+
+        birth_time — местное время в месте рождения; в UTC переводится с учётом
+        исторического часового пояса и летнего времени.
+        """
+        from bot.services.timezones import birth_moment_utc
+        
+        moment = birth_moment_utc(birth_date, birth_time, latitude, longitude)
         
         if not self.flatlib_available:
             # Fallback: примерный расчёт по дате
-            return self._approximate_chart(birth_date, latitude, longitude)
+            return self._approximate_chart(moment, latitude, longitude)
         
         try:
-            # Парсим время
-            if birth_time:
-                hour, minute = map(int, birth_time.split(":"))
-            else:
-                hour, minute = 12, 0  # Полдень по умолчанию
-            
-            # Создаём объект datetime для flatlib
+            # flatlib принимает момент в UTC
             dt = FlatDateTime(
-                birth_date.year,
-                birth_date.month,
-                birth_date.day,
-                hour,
-                minute,
+                moment.strftime("%Y/%m/%d"),
+                moment.strftime("%H:%M"),
+                "+00:00",
             )
             
             # Геопозиция
             pos = GeoPos(latitude, longitude)
             
-            # Строим карту
-            chart = Chart(dt, pos)
+            # Строим карту со всеми десятью планетами
+            chart = Chart(dt, pos, IDs=list(PLANET_NAMES))
             
             # Извлекаем планеты
             sun = self._get_planet_position(chart, const.SUN, "Sun")
             moon = self._get_planet_position(chart, const.MOON, "Moon")
             asc = self._get_ascendant(chart)
             
-            return NatalChart(
+            natal = NatalChart(
                 sun=sun,
                 moon=moon,
                 ascendant=asc,
@@ -172,10 +333,11 @@ class AstrologyEngine:
                 neptune=self._get_planet_position(chart, const.NEPTUNE, "Neptune"),
                 pluto=self._get_planet_position(chart, const.PLUTO, "Pluto"),
             )
+            return self._assign_houses(natal, moment, latitude, longitude)
             
         except Exception as e:
-            print(f"Error calculating chart: {e}")
-            return self._approximate_chart(birth_date, latitude, longitude)
+            logger.error("Chart calculation failed", error=str(e))
+            return self._approximate_chart(moment, latitude, longitude)
     
     def _get_planet_position(self, chart, planet_const, name: str) -> Optional[PlanetPosition]:
         """Извлекает позицию планеты из карты."""
@@ -185,8 +347,8 @@ class AstrologyEngine:
                 name=name,
                 sign=planet.sign,
                 degree=planet.lon,
-                house=self._get_house(planet.house),
-                retrograde=planet.retrograde,
+                house=0,
+                retrograde=planet.isRetrograde(),
             )
         except:
             return None
@@ -202,43 +364,47 @@ class AstrologyEngine:
             retrograde=False,
         )
     
-    def _get_house(self, house_obj) -> int:
-        """Получает номер дома."""
-        try:
-            return int(house_obj.id)
-        except:
-            return 1
+    def _assign_houses(
+        self,
+        chart: NatalChart,
+        moment: datetime,
+        latitude: float,
+        longitude: float,
+    ) -> NatalChart:
+        """Дома всех точек карты по куспидам выбранной системы."""
+        cusps = houses.cusps(moment, latitude, longitude, self.house_system)
+        numbers = houses.house_numbers(chart.longitudes(), cusps)
+        for name, number in zip(CHART_POINTS, numbers):
+            pos = getattr(chart, name.lower())
+            if pos is not None:
+                pos.house = int(number)
+        return chart
     
     def _approximate_chart(
         self,
-        birth_date: datetime,
+        moment: datetime,
         latitude: float,
         longitude: float,
     ) -> NatalChart:
-        """Приблизительный расчёт без flatlib (fallback)."""
-        # Упрощённый расчёт — для демо
-        day_of_year = birth_date.timetuple().tm_yday
-        
-        # Солнце: ~1 градус в день
-        sun_sign_idx = (day_of_year // 30) % 12
-        sun_degree = day_of_year % 30
+        """Расчёт по аналитическим эфемеридам, когда flatlib недоступен."""
+        from bot.services import ephemeris
         
-        # Луна: ~13 градусов в день
-        moon_offset = (day_of_year * 13) % 360
-        moon_sign_idx = int(moon_offset // 30)
-        moon_degree = moon_offset % 30
-        
-        # Асцендент: упрощённо по времени
-        hour = birth_date.hour if birth_date.hour else 12
-        asc_offset = (hour * 15 + longitude / 2) % 360
-        asc_sign_idx = int(asc_offset // 30)
-        asc_degree = asc_offset % 30
-        
-        return NatalChart(
-            sun=PlanetPosition("Sun", self.SIGNS[sun_sign_idx], sun_degree, 5),
-            moon=PlanetPosition("Moon", self.SIGNS[moon_sign_idx], moon_degree, 4),
-            ascendant=PlanetPosition("Ascendant", self.SIGNS[asc_sign_idx], asc_degree, 1),
+        lons, speeds = ephemeris.chart_longitudes(
+            ephemeris.julian_day(moment), latitude, longitude
         )
+        lons, speeds = lons[0], speeds[0]
+        
+        points = {}
+        for i, name in enumerate(CHART_POINTS):
+            lon = float(lons[i])
+            points[name.lower()] = PlanetPosition(
+                name=name,
+                sign=self.SIGNS[int(lon // 30)],
+                degree=lon,
+                house=0,
+                retrograde=bool(i < len(PLANET_NAMES) and speeds[i] < 0),
+            )
+        return self._assign_houses(NatalChart(**points), moment, latitude, longitude)
     
     def get_sign_meaning(self, planet: str, sign: str) -> str:
         """Возвращает значение планеты в знаке."""
@@ -316,6 +482,10 @@ class AstrologyEngine:
             sun.sign, moon.sign, asc.sign
         )
         
+        # Аспектные фигуры
+        from bot.services.patterns import describe
+        interpretations["patterns"] = describe(chart.aspect_patterns(), chart.longitudes())
+        
         return interpretations
     
     def _synthesize_triad(self, sun: str, moon: str, asc: str) -> str:
@@ -333,46 +503,99 @@ class AstrologyEngine:
         else:
             return f"Три элемента: разносторонняя личность, множество талантов"
     
+    def planet_positions(self, when: datetime) -> Tuple[np.ndarray, np.ndarray]:
+        """Долготы и суточные скорости планет (порядок PLANET_NAMES) на момент UTC."""
+        if when.tzinfo is not None:
+            when = when.astimezone(timezone.utc).replace(tzinfo=None)
+        # Транзиты достаточно считать с точностью до часа
+        return _planet_positions(when.year, when.month, when.day, when.hour, self.flatlib_available)
+    
+    def positions_series(self, jd: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Долготы и скорости планет (n, 10) для массива юлианских дней UT."""
+        jd = np.atleast_1d(np.asarray(jd, dtype=float))
+        if self.flatlib_available:
+            lons = np.empty((len(jd), len(PLANET_NAMES)))
+            speeds = np.empty_like(lons)
+            for i, day in enumerate(jd):
+                for j, name in enumerate(PLANET_NAMES):
+                    obj = flat_swe.sweObject(name, float(day))
+                    lons[i, j] = obj["lon"]
+                    speeds[i, j] = obj["lonspeed"]
+            return lons, speeds
+        
+        from bot.services import ephemeris
+        return ephemeris.positions(jd)
+    
     def calculate_transits(
         self,
         natal_chart: NatalChart,
         date: Optional[datetime] = None,
+        positions: Optional[Tuple[np.ndarray, np.ndarray]] = None,
     ) -> List[Dict]:
-        """Рассчитывает транзиты на дату."""
-        if date is None:
-            date = datetime.now()
+        """Рассчитывает транзиты на дату.
+
+        positions — готовые (долготы, скорости) из снимка неба дня;
+        без них положения считаются напрямую.
+        """
+        from bot.services.transits import transit_engine
         
-        # Упрощённый расчёт — для MVP
-        transits = []
+        if positions is None:
+            if date is None:
+                date = datetime.now(timezone.utc)
+            positions = self.planet_positions(date)
         
-        # Солнце: 1 градус в день
-        day_of_year = date.timetuple().tm_yday
-        sun_sign = self.SIGNS[(day_of_year // 30) % 12]
+        lons, speeds = positions
+        transits = transit_engine.find_aspects(natal_chart.longitudes(), lons, speeds)
         
-        # Проверяем конъюнкции с натальными планетами
-        natal_sun = natal_chart.sun.sign
-        if sun_sign == natal_sun:
+        # Луна в знаке — эмоциональный фон дня
+        moon_lon = lons[PLANET_NAMES.index("Moon")]
+        if not np.isnan(moon_lon):
+            moon_sign = self.SIGNS[int(moon_lon // 30)]
             transits.append({
-                "planet": "Sun",
-                "aspect": "conjunction",
-                "natal_planet": "Sun",
-                "meaning": "☉ Солнце возвращается — время нового цикла, пересмотра целей",
-                "intensity": "high",
+                "planet": "Moon",
+                "sign": moon_sign,
+                "meaning": f"☽ Луна в {moon_sign}: эмоциональный фон дня",
+                "intensity": "daily",
             })
         
-        # Луна: меняется каждые 2-3 дня
-        moon_sign_idx = (day_of_year * 13 // 30) % 12
-        moon_sign = self.SIGNS[moon_sign_idx]
-        
-        transits.append({
-            "planet": "Moon",
-            "sign": moon_sign,
-            "meaning": f"☽ Луна в {moon_sign}: эмоциональный фон дня",
-            "intensity": "daily",
-        })
-        
         return transits
 
 
+@lru_cache(maxsize=48)
+def _planet_positions(
+    year: int, month: int, day: int, hour: int, use_flatlib: bool,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Положения планет на начало часа UTC (кэшируется — одинаково для всех).
+
+    Массивы общие для всех вызовов, поэтому возвращаются только для чтения.
+    """
+    lons = np.full(len(PLANET_NAMES), np.nan)
+    speeds = np.zeros(len(PLANET_NAMES))
+    
+    if use_flatlib:
+        try:
+            dt = FlatDateTime(f"{year}/{month:02d}/{day:02d}", f"{hour:02d}:00", "+00:00")
+            chart = Chart(dt, GeoPos(0, 0), IDs=list(PLANET_NAMES))
+            for i, name in enumerate(PLANET_NAMES):
+                obj = chart.get(name)
+                lons[i] = obj.lon
+                speeds[i] = obj.lonspeed
+            return _read_only(lons), _read_only(speeds)
+        except Exception as e:
+            logger.error("Transit positions calculation failed", error=str(e))
+    
+    # Без Swiss Ephemeris — аналитические эфемериды
+    from bot.services import ephemeris
+    
+    jd = ephemeris.julian_day(datetime(year, month, day, hour))
+    lons, speeds = ephemeris.positions(jd)
+    return _read_only(lons[0]), _read_only(speeds[0])
+
+
+def _read_only(arr: np.ndarray) -> np.ndarray:
+    arr.setflags(write=False)
+    return arr
+
+
 # Глобальный экземпляр
 astrology = AstrologyEngine()
@@ -0,0 +1,155 @@
+"""Счётчики выпавших карт по пользователям — для «эта карта снова».
+
+Живые счётчики лежат в Redis-хэше на пользователя (поле — номер карты),
+сохранение расклада увеличивает их одним пайплайном HINCRBY, который сразу
+возвращает новые значения. Пользователи с изменениями попадают в множество
+dirty, и фоновая задача переносит их хэши в tarot_card_counts целиком —
+повторный перенос ничего не портит. Перед переносом dirty переименовывается
+в processing, а пользователи удаляются оттуда только после коммита: упавший
+перенос продолжится со следующего запуска, новые изменения копятся в dirty.
+
+Если хэша в Redis нет (истёк или Redis очищен), он поднимается из Postgres;
+если и там пусто — один раз досчитывается по reading_cards.
+"""
+
+from typing import Dict, Iterable, Optional
+
+import structlog
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from bot.database import ReadingCard, TarotCardCount, async_session
+
+logger = structlog.get_logger()
+
+COUNTS_TTL = 30 * 86400
+DIRTY_KEY = "tarot:counts:dirty"
+PROCESSING_KEY = "tarot:counts:processing"
+ROLLUP_BATCH = 500
+UPSERT_ROWS = 5_000
+# Служебное поле: хэш поднят, даже если карт ещё нет
+_WARM_FIELD = "_"
+
+
+class CardCounts:
+    """Счётчики карт: Redis на каждый расклад, Postgres — периодически."""
+
+    def __init__(self) -> None:
+        self.redis: Optional[Redis] = None
+
+    def setup(self, redis: Redis) -> None:
+        self.redis = redis
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"tarot:counts:{user_id}"
+
+    async def record(self, user_id: int, card_ids: Iterable[int], reading_id: int) -> Dict[int, int]:
+        """Учитывает карты сохранённого расклада; возвращает их новые счётчики."""
+        if not self.redis:
+            return {}
+        card_ids = list(card_ids)
+        key = self._key(user_id)
+        try:
+            if not await self.redis.exists(key):
+                await self._warm(user_id, reading_id)
+
+            pipe = self.redis.pipeline(transaction=False)
+            for card_id in card_ids:
+                pipe.hincrby(key, card_id, 1)
+            pipe.expire(key, COUNTS_TTL)
+            pipe.sadd(DIRTY_KEY, user_id)
+            counts = await pipe.execute()
+        except Exception as e:
+            # Расклад уже сохранён — без счётчиков он просто выйдет без «снова»
+            logger.error("Card counts update failed", user_id=user_id, error=str(e))
+            return {}
+        return dict(zip(card_ids, counts))
+
+    async def _warm(self, user_id: int, before_reading: int) -> None:
+        """Поднимает хэш из Postgres, а без свёртки — из истории раскладов до before_reading."""
+        async with async_session() as session:
+            result = await session.execute(
+                select(TarotCardCount.card_id, TarotCardCount.count)
+                .where(TarotCardCount.user_id == user_id)
+            )
+            counts = dict(result.all())
+            if not counts:
+                result = await session.execute(
+                    select(ReadingCard.card_id, func.count())
+                    .where(
+                        ReadingCard.user_id == user_id,
+                        ReadingCard.reading_id < before_reading,
+                    )
+                    .group_by(ReadingCard.card_id)
+                )
+                counts = dict(result.all())
+
+        # HSETNX: параллельный расклад мог уже поднять хэш и увеличить счётчики
+        key = self._key(user_id)
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hsetnx(key, _WARM_FIELD, 0)
+        for card_id, count in counts.items():
+            pipe.hsetnx(key, card_id, count)
+        await pipe.execute()
+
+    async def rollup(self) -> int:
+        """Фоновая задача: переносит изменённые хэши в tarot_card_counts."""
+        if not self.redis:
+            return 0
+        # Сначала остаток прошлого, упавшего переноса, затем текущий dirty
+        total = await self._drain()
+        if await self._claim():
+            total += await self._drain()
+
+        if total:
+            logger.info("Tarot card counts rolled up", users=total)
+        return total
+
+    async def _claim(self) -> bool:
+        """Забирает dirty в processing; новые изменения пойдут в свежий dirty."""
+        try:
+            return bool(await self.redis.renamenx(DIRTY_KEY, PROCESSING_KEY))
+        except ResponseError:
+            # dirty пуст — переносить нечего
+            return False
+
+    async def _drain(self) -> int:
+        """Переносит пользователей из processing, удаляя их только после коммита."""
+        total = 0
+        while True:
+            user_ids = await self.redis.srandmember(PROCESSING_KEY, ROLLUP_BATCH)
+            if not user_ids:
+                break
+
+            pipe = self.redis.pipeline(transaction=False)
+            for user_id in user_ids:
+                pipe.hgetall(self._key(int(user_id)))
+            hashes = await pipe.execute()
+
+            rows = [
+                {"user_id": int(user_id), "card_id": int(card_id), "count": int(count)}
+                for user_id, fields in zip(user_ids, hashes)
+                for card_id, count in fields.items()
+                if card_id != _WARM_FIELD
+            ]
+            async with async_session() as session:
+                # Лимит параметров asyncpg — 32767, по три на строку
+                for start in range(0, len(rows), UPSERT_ROWS):
+                    stmt = insert(TarotCardCount).values(rows[start:start + UPSERT_ROWS])
+                    await session.execute(
+                        stmt.on_conflict_do_update(
+                            index_elements=["user_id", "card_id"],
+                            set_={"count": stmt.excluded.count, "updated_at": func.now()},
+                        )
+                    )
+                await session.commit()
+            await self.redis.srem(PROCESSING_KEY, *user_ids)
+            total += len(user_ids)
+        return total
+
+
+# Глобальный экземпляр
+card_counts = CardCounts()
@@ -0,0 +1,140 @@
+"""Поиск раскладов по картам и статистика мастей.
+
+Карты каждого расклада при сохранении пишутся построчно в reading_cards
+(тот же коммит, что и сам расклад). Запросы «где выпала Башня
+перевёрнутой» и «какая масть вела в этом месяце» идут по индексам этой
+таблицы — без восстановления раскладов по зерну строка за строкой.
+"""
+
+import re
+from collections import Counter
+from functools import lru_cache
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.database import ReadingCard, TarotReading
+from bot.services.tarot import SUIT_NAMES, DrawnCard, Suit, TarotCard, decks
+
+SEARCH_LIMIT = 10
+_REVERSED_WORDS = ("перев", "reversed")
+_UPRIGHT_WORDS = ("прям", "upright")
+
+
+class CardHit(NamedTuple):
+    reading_id: int
+    created_at: datetime
+    reversed: bool
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text.lower().replace("ё", "е")).strip()
+
+
+@lru_cache(maxsize=1)
+def _card_names() -> list:
+    """Названия карт для разбора запроса — целыми словами («Маг» не найдётся в «Магии»)."""
+    return [
+        (re.compile(rf"(?<!\w){re.escape(name)}(?!\w)"), card)
+        for name, card in sorted(
+            ((_normalize(name), card) for card in decks.get() for name in (card.name_ru, card.name)),
+            key=lambda pair: -len(pair[0]),
+        )
+    ]
+
+
+def parse_card_query(text: str) -> Optional[Tuple[TarotCard, Optional[bool]]]:
+    """«Башня перевёрнутая» → (карта, True); без уточнения положение — None."""
+    query = _normalize(text)
+    card = next((card for pattern, card in _card_names() if pattern.search(query)), None)
+    if card is None:
+        return None
+    if any(word in query for word in _REVERSED_WORDS):
+        return card, True
+    if any(word in query for word in _UPRIGHT_WORDS):
+        return card, False
+    return card, None
+
+
+def reading_card_rows(reading: TarotReading, cards: List[DrawnCard]) -> List[ReadingCard]:
+    """Строки reading_cards для только что сохранённого расклада (нужен reading.id)."""
+    return [
+        ReadingCard(
+            reading_id=reading.id,
+            position=position,
+            user_id=reading.user_id,
+            card_id=card.id,
+            reversed=card.reversed,
+        )
+        for position, card in enumerate(cards)
+    ]
+
+
+async def find_readings(
+    session: AsyncSession,
+    user_id: int,
+    card_id: int,
+    reversed: Optional[bool] = None,
+    limit: int = SEARCH_LIMIT,
+) -> Tuple[int, List[CardHit]]:
+    """Сколько раз карта выпадала пользователю и последние расклады с ней."""
+    conditions = [ReadingCard.user_id == user_id, ReadingCard.card_id == card_id]
+    if reversed is not None:
+        conditions.append(ReadingCard.reversed == reversed)
+
+    total = (await session.execute(
+        select(func.count()).select_from(ReadingCard).where(*conditions)
+    )).scalar_one()
+    rows = (await session.execute(
+        select(ReadingCard.reading_id, ReadingCard.created_at, ReadingCard.reversed)
+        .where(*conditions)
+        .order_by(ReadingCard.created_at.desc())
+        .limit(limit)
+    )).all()
+    return total, [CardHit(*row) for row in rows]
+
+
+def month_start(now: Optional[datetime] = None) -> datetime:
+    now = now or datetime.now(timezone.utc)
+    return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+async def suit_stats(session: AsyncSession, user_id: int, since: datetime) -> Dict[Suit, Dict[str, int]]:
+    """Масти с начала периода: сколько карт и в скольких раскладах масть вела.
+
+    Масть ведёт в раскладе, если её карт больше, чем любой другой масти
+    (Старшие арканы не считаются), и их хотя бы две.
+    """
+    rows = (await session.execute(
+        select(ReadingCard.reading_id, ReadingCard.card_id)
+        .where(ReadingCard.user_id == user_id, ReadingCard.created_at >= since)
+    )).all()
+
+    stats = {suit: {"cards": 0, "dominant": 0} for suit in SUIT_NAMES}
+    per_reading: Dict[int, Counter] = {}
+    cards = decks.get()
+    for reading_id, card_id in rows:
+        suit = cards[card_id].suit
+        if suit is Suit.NONE:
+            continue
+        stats[suit]["cards"] += 1
+        per_reading.setdefault(reading_id, Counter())[suit] += 1
+
+    for counts in per_reading.values():
+        (top, top_count), *rest = counts.most_common(2) + [(None, 0)]
+        if top_count >= 2 and top_count > rest[0][1]:
+            stats[top]["dominant"] += 1
+    return stats
+
+
+async def card_frequency(session: AsyncSession, since: datetime) -> List[Tuple[int, bool, int]]:
+    """Все пользователи: (карта, перевёрнута, сколько раз) с начала периода, по убыванию."""
+    rows = (await session.execute(
+        select(ReadingCard.card_id, ReadingCard.reversed, func.count())
+        .where(ReadingCard.created_at >= since)
+        .group_by(ReadingCard.card_id, ReadingCard.reversed)
+        .order_by(func.count().desc())
+    )).all()
+    return [tuple(row) for row in rows]
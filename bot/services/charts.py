@@ -0,0 +1,107 @@
+"""Натальные карты пользователей и их кэш в БД.
+
+Карта считается в пуле процессов и сохраняется в chart_cache упакованной
+(PackedChart, 43 байта) вместе с отпечатком данных рождения. Экраны берут
+карту из кэша без пересчёта, а пакетные задачи (рассылки, групповые
+матрицы, календари) разбирают долготы тысяч карт одним буфером.
+"""
+
+import math
+from typing import Iterable, Optional
+
+import numpy as np
+from sqlalchemy import select
+
+from bot.database import ChartCache, Profile, async_session
+from bot.services.astro_pool import astro_pool
+from bot.services.astrology_engine import NatalChart, PackedChart, unpack_longitudes_many
+
+# Москва — если место рождения не указано или не найдено
+DEFAULT_LAT, DEFAULT_LON = 55.75, 37.61
+
+
+def pack_longitudes(chart: NatalChart) -> list:
+    """Долготы карты для JSON-колонки: NaN → None, 4 знака."""
+    return [
+        None if math.isnan(lon) else round(float(lon), 4)
+        for lon in chart.longitudes()
+    ]
+
+
+def unpack_longitudes(values: list) -> list:
+    """Долготы из JSON-колонки: None → NaN."""
+    return [math.nan if v is None else v for v in values]
+
+
+def birth_key(profile: Profile) -> str:
+    """Отпечаток данных рождения — по нему понимаем, что кэш карты устарел."""
+    return f"{profile.birth_date}|{profile.birth_time}|{profile.birth_lat}|{profile.birth_lon}"
+
+
+async def calculate_chart(profile: Profile) -> Optional[NatalChart]:
+    """Рассчитывает натальную карту из профиля."""
+    if not profile.birth_date:
+        return None
+    
+    # Координаты из профиля, по умолчанию — Москва
+    lat = profile.birth_lat if profile.birth_lat is not None else DEFAULT_LAT
+    lon = profile.birth_lon if profile.birth_lon is not None else DEFAULT_LON
+    
+    return await astro_pool.natal_chart(
+        profile.birth_date,
+        profile.birth_time,
+        lat,
+        lon,
+    )
+
+
+async def get_or_calculate_chart(profile: Profile) -> Optional[NatalChart | PackedChart]:
+    """Карта из кэша; если данные рождения изменились — расчёт и запись в кэш."""
+    if not profile.birth_date:
+        return None
+
+    key = birth_key(profile)
+    async with async_session() as session:
+        result = await session.execute(
+            select(ChartCache).where(ChartCache.user_id == profile.user_id)
+        )
+        cache = result.scalar_one_or_none()
+        if cache and cache.birth_key == key:
+            return PackedChart.from_bytes(cache.packed)
+
+    chart = await calculate_chart(profile)
+    if not chart:
+        return None
+
+    async with async_session() as session:
+        result = await session.execute(
+            select(ChartCache).where(ChartCache.user_id == profile.user_id)
+        )
+        cache = result.scalar_one_or_none()
+        if cache is None:
+            cache = ChartCache(user_id=profile.user_id)
+            session.add(cache)
+
+        cache.birth_key = key
+        cache.packed = PackedChart.from_chart(chart).to_bytes()
+        await session.commit()
+
+    return chart
+
+
+async def cached_longitudes(user_ids: Iterable[int]) -> dict[int, tuple[str, np.ndarray]]:
+    """Долготы из кэша для набора пользователей: user_id → (отпечаток, долготы)."""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return {}
+    async with async_session() as session:
+        result = await session.execute(
+            select(ChartCache.user_id, ChartCache.birth_key, ChartCache.packed)
+            .where(ChartCache.user_id.in_(user_ids))
+        )
+        rows = result.all()
+    lons = unpack_longitudes_many(row[2] for row in rows)
+    return {
+        user_id: (key, lons[i])
+        for i, (user_id, key, _) in enumerate(rows)
+    }
@@ -0,0 +1,150 @@
+"""Карта дня: одна на пользователя и местную дату.
+
+Зерно расклада выводится из (user_id, местная дата), поэтому карта дня
+одна и та же при любом числе открытий. Расклад сохраняется одной строкой
+tarot_readings на день (уникальный ключ user_id + daily_date), а номер
+этой строки запоминается в Redis до местной полуночи: повторное открытие —
+одно чтение из Redis, без записи в БД, списания лимита и нового
+обращения к AI (трактовка хранится в той же строке).
+"""
+
+import hashlib
+from datetime import date, datetime, time, timedelta, timezone
+from typing import NamedTuple, Optional
+from zoneinfo import ZoneInfo
+
+from redis.asyncio import Redis
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from bot.database import Profile, TarotReading, async_session
+from bot.services.card_search import reading_card_rows
+from bot.services.charts import DEFAULT_LAT, DEFAULT_LON
+from bot.services.tarot import tarot
+from bot.services.timezones import tz_resolver
+
+SPREAD_TYPE = "daily"
+_SEED_PERSON = b"tarot-daily"
+
+
+class DailyCard(NamedTuple):
+    reading_id: int
+    spread: dict
+    # Расклад записан этим вызовом (а не найден готовым)
+    created: bool
+
+
+def user_zone(profile: Optional[Profile]) -> str:
+    """Часовой пояс пользователя — по месту рождения, как в календаре транзитов."""
+    lat = profile.birth_lat if profile else None
+    lon = profile.birth_lon if profile else None
+    # 0.0 — настоящая координата (экватор, Гринвич), а не её отсутствие
+    return tz_resolver.zone_for(
+        DEFAULT_LAT if lat is None else lat,
+        DEFAULT_LON if lon is None else lon,
+    )
+
+
+def local_now(zone: str, now: Optional[datetime] = None) -> datetime:
+    return (now or datetime.now(timezone.utc)).astimezone(ZoneInfo(zone))
+
+
+def seconds_to_midnight(local: datetime) -> int:
+    """Сколько секунд до местной полуночи — по UTC, с учётом перевода часов."""
+    midnight = datetime.combine(local.date() + timedelta(days=1), time(), tzinfo=local.tzinfo)
+    return max(1, int(midnight.timestamp() - local.timestamp()))
+
+
+def daily_seed(user_id: int, day: date) -> int:
+    """Зерно карты дня: хеш (user_id, дата), помещается в знаковый BIGINT."""
+    digest = hashlib.blake2b(
+        f"{user_id}:{day.isoformat()}".encode(), digest_size=8, person=_SEED_PERSON,
+    ).digest()
+    return int.from_bytes(digest, "big") >> 1
+
+
+class DailyCards:
+    """Карта дня: Redis до местной полуночи, в Postgres — одна строка на день."""
+
+    def __init__(self) -> None:
+        self.redis: Optional[Redis] = None
+
+    def setup(self, redis: Redis) -> None:
+        self.redis = redis
+
+    @staticmethod
+    def _key(user_id: int, day: date) -> str:
+        return f"tarot:daily:{user_id}:{day.isoformat()}"
+
+    @staticmethod
+    def spread(user_id: int, day: date) -> dict:
+        """Расклад карты дня — без обращения к хранилищам."""
+        return tarot.do_spread(SPREAD_TYPE, seed=daily_seed(user_id, day))
+
+    async def cached(self, user_id: int, local: datetime) -> Optional[DailyCard]:
+        """Карта дня, если она уже выдана: из Redis, а без него — из Postgres."""
+        day = local.date()
+        key = self._key(user_id, day)
+        if self.redis:
+            reading_id = await self.redis.get(key)
+            if reading_id is not None:
+                return DailyCard(int(reading_id), self.spread(user_id, day), False)
+
+        async with async_session() as session:
+            reading_id = (await session.execute(
+                select(TarotReading.id).where(
+                    TarotReading.user_id == user_id,
+                    TarotReading.daily_date == day,
+                )
+            )).scalar_one_or_none()
+        if reading_id is None:
+            return None
+        await self._remember(key, reading_id, local)
+        return DailyCard(reading_id, self.spread(user_id, day), False)
+
+    async def create(self, user_id: int, local: datetime, is_premium: bool) -> DailyCard:
+        """Сохраняет карту дня; при гонке двух открытий строка остаётся одна."""
+        day = local.date()
+        result = self.spread(user_id, day)
+        drawn = [item["card"] for item in result["cards"]]
+        async with async_session() as session:
+            reading_id = (await session.execute(
+                insert(TarotReading)
+                .values(
+                    user_id=user_id,
+                    spread_type=SPREAD_TYPE,
+                    seed=result["seed"],
+                    deck_version=result["deck_version"],
+                    daily_date=day,
+                    is_premium=is_premium,
+                )
+                .on_conflict_do_nothing(
+                    index_elements=["user_id", "daily_date"],
+                    index_where=TarotReading.daily_date.isnot(None),
+                )
+                .returning(TarotReading.id)
+            )).scalar_one_or_none()
+            created = reading_id is not None
+            if created:
+                # Строка уже вставлена — объект нужен только для reading_card_rows
+                reading = TarotReading(id=reading_id, user_id=user_id)
+                session.add_all(reading_card_rows(reading, drawn))
+            else:
+                reading_id = (await session.execute(
+                    select(TarotReading.id).where(
+                        TarotReading.user_id == user_id,
+                        TarotReading.daily_date == day,
+                    )
+                )).scalar_one()
+            await session.commit()
+
+        await self._remember(self._key(user_id, day), reading_id, local)
+        return DailyCard(reading_id, result, created)
+
+    async def _remember(self, key: str, reading_id: int, local: datetime) -> None:
+        if self.redis:
+            await self.redis.set(key, reading_id, ex=seconds_to_midnight(local))
+
+
+# Глобальный экземпляр
+daily_cards = DailyCards()
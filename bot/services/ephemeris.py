@@ -0,0 +1,219 @@
+"""Аналитические эфемериды — запасной расчёт положений без Swiss Ephemeris.
+
+Все функции принимают массивы юлианских дней и считают сразу для всех дат:
+- Солнце — по Меусу (гл. 25), точность ~0.01°;
+- Луна — усечённый ряд ELP из Меуса (гл. 47), точность ~0.05°;
+- планеты — кеплеровы элементы JPL («Approximate Positions of the Planets»,
+  1800–2050), точность от сотых долей градуса до ~0.2° у Сатурна;
+- Асцендент и MC — через истинное звёздное время и наклон эклиптики.
+Долготы тропические, видимые (с нутацией) — как у flatlib.
+"""
+
+from datetime import datetime, timezone
+from typing import Iterable, Tuple
+
+import numpy as np
+
+J2000 = 2451545.0
+_J2000_MOMENT = np.datetime64("2000-01-01T12:00:00")
+
+# Общая прецессия по долготе, градусов в столетие
+PRECESSION = 1.396971
+
+# Кеплеровы элементы JPL на J2000 и их изменения за столетие:
+# a (а.е.), e, I, L, долгота перигелия, долгота узла (градусы)
+_ELEMENTS = {
+    "Mercury": ((0.38709927, 0.20563593, 7.00497902, 252.25032350, 77.45779628, 48.33076593),
+                (0.00000037, 0.00001906, -0.00594749, 149472.67411175, 0.16047689, -0.12534081)),
+    "Venus": ((0.72333566, 0.00677672, 3.39467605, 181.97909950, 131.60246718, 76.67984255),
+              (0.00000390, -0.00004107, -0.00078890, 58517.81538729, 0.00268329, -0.27769418)),
+    "Earth": ((1.00000261, 0.01671123, -0.00001531, 100.46457166, 102.93768193, 0.0),
+              (0.00000562, -0.00004392, -0.01294668, 35999.37244981, 0.32327364, 0.0)),
+    "Mars": ((1.52371034, 0.09339410, 1.84969142, -4.55343205, -23.94362959, 49.55953891),
+             (0.00001847, 0.00007882, -0.00813131, 19140.30268499, 0.44441088, -0.29257343)),
+    "Jupiter": ((5.20288700, 0.04838624, 1.30439695, 34.39644051, 14.72847983, 100.47390909),
+                (-0.00011607, -0.00013253, -0.00183714, 3034.74612775, 0.21252668, 0.20469106)),
+    "Saturn": ((9.53667594, 0.05386179, 2.48599187, 49.95424423, 92.59887831, 113.66242448),
+               (-0.00125060, -0.00050991, 0.00193609, 1222.49362201, -0.41897216, -0.28867794)),
+    "Uranus": ((19.18916464, 0.04725744, 0.77263783, 313.23810451, 170.95427630, 74.01692503),
+               (-0.00196176, -0.00004397, -0.00242939, 428.48202785, 0.40805281, 0.04240589)),
+    "Neptune": ((30.06992276, 0.00859048, 1.77004347, -55.12002969, 44.96476227, 131.78422574),
+                (0.00026291, 0.00005105, 0.00035372, 218.45945325, -0.32241464, -0.00508664)),
+    "Pluto": ((39.48211675, 0.24882730, 17.14001206, 238.92903833, 224.06891629, 110.30393684),
+              (-0.00031596, 0.00005170, 0.00004818, 145.20780515, -0.04062942, -0.01183482)),
+}
+
+# Главные члены ряда долготы Луны (Меус, табл. 47.A):
+# множители D, M, M', F и амплитуда в миллионных долях градуса
+_MOON_TERMS = np.array([
+    (0, 0, 1, 0, 6288774), (2, 0, -1, 0, 1274027), (2, 0, 0, 0, 658314),
+    (0, 0, 2, 0, 213618), (0, 1, 0, 0, -185116), (0, 0, 0, 2, -114332),
+    (2, 0, -2, 0, 58793), (2, -1, -1, 0, 57066), (2, 0, 1, 0, 53322),
+    (2, -1, 0, 0, 45758), (0, 1, -1, 0, -40923), (1, 0, 0, 0, -34720),
+    (0, 1, 1, 0, -30383), (2, 0, 0, -2, 15327), (0, 0, 1, 2, -12528),
+    (0, 0, 1, -2, 10980), (4, 0, -1, 0, 10675), (0, 0, 3, 0, 10034),
+    (4, 0, -2, 0, 8548), (2, 1, -1, 0, -7888), (2, 1, 0, 0, -6766),
+    (1, 0, -1, 0, -5163), (1, 1, 0, 0, 4987), (2, -1, 1, 0, 4036),
+    (2, 0, 2, 0, 3994), (4, 0, 0, 0, 3861), (2, 0, -3, 0, 3665),
+    (0, 1, -2, 0, -2689), (2, 0, -1, 2, -2602), (2, -1, -2, 0, 2390),
+    (1, 0, 1, 0, -2348), (2, -2, 0, 0, 2236), (0, 1, 2, 0, -2120),
+    (0, 2, 0, 0, -2069),
+], dtype=float)
+
+# Шаг численной производной для скоростей, сутки
+_SPEED_STEP = 0.5
+
+
+def julian_day(moment: datetime) -> float:
+    """Юлианский день для момента UTC (наивный datetime считается UTC)."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return J2000 + (moment - datetime(2000, 1, 1, 12)).total_seconds() / 86400
+
+
+def julian_days(moments: Iterable[datetime]) -> np.ndarray:
+    """Юлианские дни для набора моментов UTC."""
+    stamps = np.array(
+        [m.astimezone(timezone.utc).replace(tzinfo=None) if m.tzinfo else m for m in moments],
+        dtype="datetime64[s]",
+    )
+    return J2000 + (stamps - _J2000_MOMENT) / np.timedelta64(86400, "s")
+
+
+def _nutation_obliquity(t: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Нутация по долготе и истинный наклон эклиптики, градусы."""
+    omega = np.radians(125.04452 - 1934.136261 * t)
+    l_sun = np.radians(280.4665 + 36000.7698 * t)
+    l_moon = np.radians(218.3165 + 481267.8813 * t)
+    dpsi = (-17.20 * np.sin(omega) - 1.32 * np.sin(2 * l_sun)
+            - 0.23 * np.sin(2 * l_moon) + 0.21 * np.sin(2 * omega)) / 3600
+    deps = (9.20 * np.cos(omega) + 0.57 * np.cos(2 * l_sun)
+            + 0.10 * np.cos(2 * l_moon) - 0.09 * np.cos(2 * omega)) / 3600
+    eps0 = 23.439291111 - 0.0130041667 * t - 1.64e-7 * t * t + 5.04e-7 * t ** 3
+    return dpsi, eps0 + deps
+
+
+def _sun(t: np.ndarray) -> np.ndarray:
+    l0 = 280.46646 + 36000.76983 * t + 0.0003032 * t * t
+    m = np.radians(357.52911 + 35999.05029 * t - 0.0001537 * t * t)
+    c = ((1.914602 - 0.004817 * t - 0.000014 * t * t) * np.sin(m)
+         + (0.019993 - 0.000101 * t) * np.sin(2 * m)
+         + 0.000289 * np.sin(3 * m))
+    # Аберрация; нутация добавляется общей поправкой
+    return l0 + c - 0.00569
+
+
+def _moon(t: np.ndarray) -> np.ndarray:
+    lp = 218.3164477 + 481267.88123421 * t - 0.0015786 * t * t
+    d = 297.8501921 + 445267.1114034 * t - 0.0018819 * t * t
+    m = 357.5291092 + 35999.0502909 * t - 0.0001536 * t * t
+    mp = 134.9633964 + 477198.8675055 * t + 0.0087414 * t * t
+    f = 93.2720950 + 483202.0175233 * t - 0.0036539 * t * t
+    e = 1 - 0.002516 * t - 0.0000074 * t * t
+
+    args = np.radians(
+        np.outer(d, _MOON_TERMS[:, 0]) + np.outer(m, _MOON_TERMS[:, 1])
+        + np.outer(mp, _MOON_TERMS[:, 2]) + np.outer(f, _MOON_TERMS[:, 3])
+    )
+    # Члены с аномалией Солнца ослабевают вместе с эксцентриситетом орбиты Земли
+    ecc = e[:, None] ** np.abs(_MOON_TERMS[:, 1])
+    total = (ecc * _MOON_TERMS[:, 4] * np.sin(args)).sum(axis=1)
+
+    a1 = np.radians(119.75 + 131.849 * t)
+    a2 = np.radians(53.09 + 479264.290 * t)
+    total += 3958 * np.sin(a1) + 1962 * np.sin(np.radians(lp - f)) + 318 * np.sin(a2)
+    return lp + total / 1e6
+
+
+def _heliocentric(name: str, t: np.ndarray) -> np.ndarray:
+    """Гелиоцентрические координаты в эклиптике J2000, форма (3, n)."""
+    base, rate = _ELEMENTS[name]
+    a, e, inc, mean_lon, peri, node = (b + r * t for b, r in zip(base, rate))
+    inc, node = np.radians(inc), np.radians(node)
+    arg_peri = np.radians(peri) - node
+    mean_anomaly = np.radians((mean_lon - peri + 180) % 360 - 180)
+
+    # Уравнение Кеплера — Ньютоном; e ≤ 0.25, хватает пяти итераций
+    ecc_anomaly = mean_anomaly + e * np.sin(mean_anomaly)
+    for _ in range(5):
+        ecc_anomaly -= ((ecc_anomaly - e * np.sin(ecc_anomaly) - mean_anomaly)
+                        / (1 - e * np.cos(ecc_anomaly)))
+
+    xp = a * (np.cos(ecc_anomaly) - e)
+    yp = a * np.sqrt(1 - e * e) * np.sin(ecc_anomaly)
+
+    cw, sw = np.cos(arg_peri), np.sin(arg_peri)
+    cn, sn = np.cos(node), np.sin(node)
+    ci, si = np.cos(inc), np.sin(inc)
+    return np.stack([
+        (cw * cn - sw * sn * ci) * xp + (-sw * cn - cw * sn * ci) * yp,
+        (cw * sn + sw * cn * ci) * xp + (-sw * sn + cw * cn * ci) * yp,
+        sw * si * xp + cw * si * yp,
+    ])
+
+
+def _planets(t: np.ndarray) -> np.ndarray:
+    """Геоцентрические долготы Меркурия–Плутона (J2000 + прецессия), форма (n, 8)."""
+    earth = _heliocentric("Earth", t)
+    lons = []
+    for name in ("Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto"):
+        x, y, _ = _heliocentric(name, t) - earth
+        lons.append(np.degrees(np.arctan2(y, x)))
+    return np.stack(lons, axis=1) + (PRECESSION * t)[:, None]
+
+
+def longitudes(jd) -> np.ndarray:
+    """Видимые долготы десяти планет (порядок PLANET_NAMES), форма (n, 10)."""
+    jd = np.atleast_1d(np.asarray(jd, dtype=float))
+    t = (jd - J2000) / 36525
+    dpsi, _ = _nutation_obliquity(t)
+    lons = np.column_stack([_sun(t), _moon(t), _planets(t)])
+    return (lons + dpsi[:, None]) % 360
+
+
+def positions(jd) -> Tuple[np.ndarray, np.ndarray]:
+    """Долготы и суточные скорости (центральная разность), формы (n, 10)."""
+    jd = np.atleast_1d(np.asarray(jd, dtype=float))
+    before = longitudes(jd - _SPEED_STEP)
+    after = longitudes(jd + _SPEED_STEP)
+    speeds = ((after - before + 180) % 360 - 180) / (2 * _SPEED_STEP)
+    return longitudes(jd), speeds
+
+
+def sidereal_time(jd) -> np.ndarray:
+    """Истинное звёздное время Гринвича, градусы."""
+    jd = np.asarray(jd, dtype=float)
+    t = (jd - J2000) / 36525
+    gmst = (280.46061837 + 360.98564736629 * (jd - J2000)
+            + 0.000387933 * t * t - t ** 3 / 38710000)
+    dpsi, eps = _nutation_obliquity(t)
+    return (gmst + dpsi * np.cos(np.radians(eps))) % 360
+
+
+def obliquity(jd) -> np.ndarray:
+    """Истинный наклон эклиптики, градусы."""
+    _, eps = _nutation_obliquity((np.asarray(jd, dtype=float) - J2000) / 36525)
+    return eps
+
+
+def angles(jd, latitude, longitude) -> Tuple[np.ndarray, np.ndarray]:
+    """Асцендент и MC для моментов и мест (массивы транслируются друг на друга)."""
+    jd = np.asarray(jd, dtype=float)
+    _, eps = _nutation_obliquity((jd - J2000) / 36525)
+    ramc = np.radians(sidereal_time(jd) + np.asarray(longitude, dtype=float))
+    eps = np.radians(eps)
+    phi = np.radians(np.asarray(latitude, dtype=float))
+
+    asc = np.degrees(np.arctan2(
+        np.cos(ramc),
+        -(np.sin(ramc) * np.cos(eps) + np.tan(phi) * np.sin(eps)),
+    ))
+    mc = np.degrees(np.arctan2(np.sin(ramc), np.cos(ramc) * np.cos(eps)))
+    return asc % 360, mc % 360
+
+
+def chart_longitudes(jd, latitude, longitude) -> Tuple[np.ndarray, np.ndarray]:
+    """Пачка карт: долготы точек CHART_POINTS (n, 11) и скорости планет (n, 10)."""
+    lons, speeds = positions(jd)
+    asc, _ = angles(np.atleast_1d(jd), latitude, longitude)
+    return np.column_stack([lons, asc]), speeds
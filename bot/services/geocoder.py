@@ -0,0 +1,182 @@
+"""Офлайн-геокодер мест рождения по встроенной выгрузке GeoNames.
+
+Индекс строится один раз при первом обращении:
+- отсортированный список нормализованных названий (кириллица и латиница)
+  для точного и префиксного поиска через bisect
+  (кириллические названия дополнительно индексируются в транслите);
+- триграммный индекс (триграмма → массив номеров названий) для опечаток.
+При нескольких совпадениях побеждает город с большим населением.
+"""
+
+import gzip
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "cities.tsv.gz"
+
+# Минимальная доля общих триграмм для нечёткого совпадения
+FUZZY_THRESHOLD = 0.5
+
+_PREFIXES = re.compile(r"^(г|гор|город|пгт|пос|посёлок|поселок|с|село|city of)\.?\s+")
+_NON_WORD = re.compile(r"[^\w\s]+")
+_SPACES = re.compile(r"\s+")
+
+# Транслитерация, чтобы «Moskva» находила «Москву»
+_TRANSLIT = str.maketrans({
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ж": "zh",
+    "з": "z", "и": "i", "й": "y", "к": "k", "л": "l", "м": "m", "н": "n",
+    "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u", "ф": "f",
+    "х": "kh", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "shch", "ъ": "",
+    "ы": "y", "ь": "", "э": "e", "ю": "yu", "я": "ya",
+    "і": "i", "ї": "yi", "є": "ye", "ў": "u", "ґ": "g",
+})
+
+
+@dataclass
+class Place:
+    """Найденный населённый пункт."""
+    name: str
+    matched: str
+    country: str
+    latitude: float
+    longitude: float
+    population: int
+    timezone: str
+
+    @property
+    def display(self) -> str:
+        return f"{self.matched or self.name}, {self.country}"
+
+
+def normalize(text: str) -> str:
+    """Нижний регистр, ё→е, дефисы и знаки — в пробелы, без «г.» в начале."""
+    text = text.lower().replace("ё", "е").strip()
+    text = text.split(",")[0]
+    text = _PREFIXES.sub("", text)
+    text = _NON_WORD.sub(" ", text.replace("-", " "))
+    return _SPACES.sub(" ", text).strip()
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Geocoder:
+    """Поиск координат по названию города без внешних сервисов."""
+
+    def __init__(self, path: Path = DATA_PATH) -> None:
+        self.path = path
+        self._loaded = False
+
+    def load(self) -> None:
+        if self._loaded:
+            return
+
+        names, countries, timezones = [], [], []
+        lats, lons, populations = [], [], []
+        # нормализованное название → (лучший город, написание для показа)
+        keys: dict[str, tuple[int, str]] = {}
+
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("#"):
+                    continue
+                _, name, alternates, lat, lon, country, population, tz = line.rstrip("\n").split("\t")
+                idx = len(names)
+                alternates = alternates.split(",") if alternates else []
+                names.append(name)
+                countries.append(country)
+                timezones.append(tz)
+                lats.append(float(lat))
+                lons.append(float(lon))
+                populations.append(int(population))
+
+                # Файл отсортирован по населению — первый владелец ключа крупнее
+                for variant in [name, *alternates]:
+                    key = normalize(variant)
+                    for k in (key, key.translate(_TRANSLIT)):
+                        if k and k not in keys:
+                            keys[k] = (idx, variant)
+
+        self._names = names
+        self._countries = countries
+        self._timezones = timezones
+        self.latitudes = np.array(lats, dtype=np.float32)
+        self.longitudes = np.array(lons, dtype=np.float32)
+        self._populations = np.array(populations, dtype=np.int64)
+
+        self._keys = sorted(keys)
+        self._key_city = np.array([keys[k][0] for k in self._keys], dtype=np.int32)
+        self._key_labels = [keys[k][1] for k in self._keys]
+
+        postings: dict[str, list[int]] = {}
+        for key_idx, key in enumerate(self._keys):
+            for gram in _trigrams(key):
+                postings.setdefault(gram, []).append(key_idx)
+        self._trigram_index = {g: np.array(ids, dtype=np.int32) for g, ids in postings.items()}
+        self._key_grams = np.array([len(_trigrams(k)) for k in self._keys], dtype=np.int16)
+        self._loaded = True
+
+    def place(self, key_idx: int) -> Place:
+        idx = int(self._key_city[key_idx])
+        return Place(
+            name=self._names[idx],
+            matched=self._key_labels[key_idx],
+            country=self._countries[idx],
+            latitude=round(float(self.latitudes[idx]), 5),
+            longitude=round(float(self.longitudes[idx]), 5),
+            population=int(self._populations[idx]),
+            timezone=self._timezones[idx],
+        )
+
+    def timezone_of(self, idx: int) -> str:
+        """IANA-зона города по его номеру в справочнике."""
+        return self._timezones[idx]
+
+    def lookup(self, query: str) -> Optional[Place]:
+        """Находит самый вероятный город: точное → префикс → триграммы."""
+        self.load()
+        q = normalize(query)
+        if not q:
+            return None
+
+        # Точное совпадение
+        pos = bisect_left(self._keys, q)
+        if pos < len(self._keys) and self._keys[pos] == q:
+            return self.place(pos)
+
+        # Префикс: все ключи в диапазоне [q, q + '￿')
+        if len(q) >= 3:
+            end = bisect_left(self._keys, q + "￿", lo=pos)
+            if end > pos:
+                cities = self._key_city[pos:end]
+                return self.place(pos + int(self._populations[cities].argmax()))
+
+        return self._fuzzy(q)
+
+    def _fuzzy(self, q: str) -> Optional[Place]:
+        grams = _trigrams(q)
+        hits = [self._trigram_index[g] for g in grams if g in self._trigram_index]
+        if not hits:
+            return None
+
+        shared = np.bincount(np.concatenate(hits), minlength=len(self._keys))
+        # Коэффициент Дайса по множествам триграмм
+        score = 2 * shared / (self._key_grams + len(grams))
+        best = score.max()
+        if best < FUZZY_THRESHOLD:
+            return None
+
+        candidates = np.flatnonzero(score >= best - 1e-9)
+        populations = self._populations[self._key_city[candidates]]
+        return self.place(int(candidates[populations.argmax()]))
+
+
+# Глобальный экземпляр
+geocoder = Geocoder()
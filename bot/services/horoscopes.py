@@ -0,0 +1,202 @@
+"""Дневные гороскопы знаков — 12 текстов в сутки на всех пользователей.
+
+Гороскоп зависит только от знака Солнца и неба дня, поэтому каждое утро
+фоновая задача пишет 12 текстов (AI или шаблон), сразу рендерит HTML и
+кладёт его в Postgres и Redis. Экран астрологии берёт готовый HTML по
+ключу знака — без расчётов и без обращений к AI на каждого пользователя.
+"""
+
+import asyncio
+import html
+from datetime import date, datetime, timezone
+from typing import Optional
+
+import structlog
+from redis.asyncio import Redis
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from bot.config import settings
+from bot.database import DailyHoroscope, async_session
+from bot.services.ai import AI_UNAVAILABLE, ai_interpreter
+from bot.services.astrology_engine import PLANET_NAMES, SIGN_ORDER, astrology
+from bot.services.sky import sky
+
+logger = structlog.get_logger()
+
+MOON = PLANET_NAMES.index("Moon")
+SUN = PLANET_NAMES.index("Sun")
+HOROSCOPE_TTL = 2 * 86400
+
+# Совет дня по знаку Солнца
+SIGN_ADVICE = {
+    "Aries": "Сегодня твоя энергия высока — начни то, что откладывал",
+    "Taurus": "Потрать время на что-то приятное для тела — вкусная еда, массаж",
+    "Gemini": "Позвони старому другу или напиши — связи активируют удачу",
+    "Cancer": "Побудь дома, с семьёй. Эмоциональная перезагрузка важнее дел",
+    "Leo": "Покажи себя — даже если кажется, что никто не смотрит",
+    "Virgo": "Сделай маленькое дело идеально, а не многое наспех",
+    "Libra": "Примирение или компромисс сегодня принесёт больше, чем победа",
+    "Scorpio": "Не бойся заглянуть в тень — там твоя сила",
+    "Sagittarius": "Узнай что-то новое или спланируй поездку",
+    "Capricorn": "Шаг назад для обзора — не отступление, тактика",
+    "Aquarius": "Необычное решение сегодня — правильное",
+    "Pisces": "Доверься интуиции, даже если логика против",
+}
+
+# Луна относительно знака: расстояние в знаках 0…6
+LUNAR_MOOD = (
+    "Луна в твоём знаке — эмоции на поверхности, день про тебя самого",
+    "Луна рядом — фоновое беспокойство, лучше не торопиться",
+    "Луна в секстиле — легко договориться и попросить о помощи",
+    "Луна в квадрате — раздражение подскажет, что пора менять",
+    "Луна в трине — настроение ровное, дела идут сами",
+    "Луна в квинконсе — планы придётся подстраивать на ходу",
+    "Луна напротив — другие люди отражают то, что ты не замечаешь",
+)
+
+
+def _sign_distance(first: str, second: str) -> int:
+    d = abs(SIGN_ORDER.index(first) - SIGN_ORDER.index(second))
+    return min(d, 12 - d)
+
+
+def _sign_label(sign: str) -> str:
+    return f"{astrology.SIGN_EMOJIS.get(sign, '')} {sign}"
+
+
+async def _day_context(day: date) -> dict:
+    """Общее для всех знаков небо дня: Луна в полдень и смены знаков."""
+    noon = datetime(day.year, day.month, day.day, 12)
+    lons, _ = await sky.positions(noon)
+    hour_sky = await sky.get_hour(noon)
+    day_sky = await sky.get_day(day)
+    return {
+        "moon_sign": SIGN_ORDER[int(lons[MOON] // 30)],
+        "sun_sign": SIGN_ORDER[int(lons[SUN] // 30)],
+        "phase": hour_sky.phase,
+        "ingresses": day_sky.ingresses,
+    }
+
+
+def _sky_summary(context: dict) -> str:
+    """Небо дня строками — для промпта AI."""
+    lines = [
+        f"Солнце в {context['sun_sign']}",
+        f"Луна в {context['moon_sign']}, {context['phase']}",
+    ]
+    for ingress in context["ingresses"]:
+        planet = astrology.PLANETS.get(ingress["planet"], ingress["planet"])
+        lines.append(f"{planet} переходит в {ingress['sign']} около {ingress['time']} UTC")
+    return "\n".join(lines)
+
+
+def template_horoscope(sign: str, context: dict) -> str:
+    """Гороскоп без AI: Луна относительно знака, смены знаков, совет."""
+    lines = [
+        f"{context['phase']}, Луна в {_sign_label(context['moon_sign'])}.",
+        LUNAR_MOOD[_sign_distance(sign, context["moon_sign"])] + ".",
+    ]
+    for ingress in context["ingresses"]:
+        if ingress["sign"] == sign:
+            planet = astrology.PLANETS.get(ingress["planet"], ingress["planet"])
+            lines.append(f"{planet} сегодня входит в твой знак — его тема выходит на первый план.")
+    lines.append(f"Совет дня: {SIGN_ADVICE[sign]}.")
+    return "\n".join(lines)
+
+
+def render_html(sign: str, day: date, text: str) -> str:
+    """Готовый фрагмент экрана — один на всех пользователей знака."""
+    return (
+        f"🔮 <b>Гороскоп на {day:%d.%m} · {_sign_label(sign)}</b>\n"
+        f"<i>{html.escape(text.strip())}</i>"
+    )
+
+
+class HoroscopeService:
+    """Гороскопы дня: Redis → Postgres → расчёт под блокировкой."""
+
+    def __init__(self) -> None:
+        self.redis: Optional[Redis] = None
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def setup(self, redis: Redis) -> None:
+        self.redis = redis
+
+    @staticmethod
+    def _key(day: date, sign: str) -> str:
+        return f"horoscope:{day.isoformat()}:{sign}"
+
+    async def get_html(self, sign: str, day: Optional[date] = None) -> str:
+        """HTML гороскопа знака на день (по UTC, как небо дня)."""
+        day = day or datetime.now(timezone.utc).date()
+        key = self._key(day, sign)
+        if self.redis:
+            cached = await self.redis.get(key)
+            if cached:
+                return cached
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if self.redis:
+                cached = await self.redis.get(key)
+                if cached:
+                    return cached
+            row = await self._load(day, sign)
+            if row is None:
+                row = await self._build(day, sign, await _day_context(day))
+            if self.redis:
+                await self.redis.setex(key, HOROSCOPE_TTL, row)
+        self._locks.pop(key, None)
+        return row
+
+    async def refresh(self, day: Optional[date] = None) -> None:
+        """Фоновая задача: 12 гороскопов на день, если их ещё нет."""
+        day = day or datetime.now(timezone.utc).date()
+        context = None
+        built = 0
+        for sign in SIGN_ORDER:
+            text = await self._load(day, sign)
+            if text is None:
+                context = context or await _day_context(day)
+                text = await self._build(day, sign, context)
+                built += 1
+            if self.redis:
+                await self.redis.setex(self._key(day, sign), HOROSCOPE_TTL, text)
+        if built:
+            logger.info("Daily horoscopes built", day=day.isoformat(), signs=built)
+
+    async def _load(self, day: date, sign: str) -> Optional[str]:
+        async with async_session() as session:
+            result = await session.execute(
+                select(DailyHoroscope.html).where(
+                    DailyHoroscope.day == day,
+                    DailyHoroscope.sign == sign,
+                )
+            )
+            return result.scalar_one_or_none()
+
+    async def _build(self, day: date, sign: str, context: dict) -> str:
+        """Пишет гороскоп и сохраняет; при гонке побеждает первая запись."""
+        text, source = None, "template"
+        if settings.horoscope_ai:
+            answer = await ai_interpreter.generate_sign_horoscope(
+                sign, day.isoformat(), _sky_summary(context),
+            )
+            if answer and answer != AI_UNAVAILABLE:
+                text, source = answer, "ai"
+        if text is None:
+            text = template_horoscope(sign, context)
+
+        async with async_session() as session:
+            await session.execute(
+                insert(DailyHoroscope)
+                .values(day=day, sign=sign, text=text, html=render_html(sign, day, text), source=source)
+                .on_conflict_do_nothing(index_elements=["day", "sign"])
+            )
+            await session.commit()
+        return await self._load(day, sign)
+
+
+# Глобальный экземпляр
+horoscopes = HoroscopeService()
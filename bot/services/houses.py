@@ -0,0 +1,117 @@
+"""Системы домов — куспиды по звёздному времени и широте.
+
+Плацидус делит полудуги каждого градуса эклиптики (итерация по склонению
+куспида), Кох — полудугу MC места рождения (куспиды — асценденты для
+сдвинутого звёздного времени), целые знаки начинаются со знака
+Асцендента. За полярным кругом Плацидус и Кох не определены — там дома
+считаются целыми знаками.
+
+Куспиды запоминаются по моменту и месту рождения, а номера домов для всех
+точек карты находятся одним searchsorted по развёрнутым куспидам.
+"""
+
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+
+from bot.services import ephemeris
+
+PLACIDUS = "placidus"
+KOCH = "koch"
+WHOLE_SIGN = "whole_sign"
+HOUSE_SYSTEMS = (PLACIDUS, KOCH, WHOLE_SIGN)
+
+# Итерации Плацидуса — до сходимости; у полярного круга она медленная
+PLACIDUS_ITERATIONS = 50
+PLACIDUS_TOLERANCE = 1e-9
+# Доли полудуги для куспидов 11, 12, 2, 3
+_PLACIDUS_FRACTIONS = np.array([1 / 3, 2 / 3, 2 / 3, 1 / 3])
+_PLACIDUS_NOCTURNAL = np.array([False, False, True, True])
+# Сдвиги звёздного времени в третях полудуги MC для куспидов 11, 12, 2, 3
+_KOCH_STEPS = np.array([-2.0, -1.0, 1.0, 2.0])
+
+
+def _ecliptic_longitude(ra: np.ndarray, eps: float) -> np.ndarray:
+    """Долгота точки эклиптики по прямому восхождению."""
+    return np.arctan2(np.sin(ra), np.cos(ra) * np.cos(eps))
+
+
+def _ascendant(ramc: np.ndarray, eps: float, phi: float) -> np.ndarray:
+    return np.arctan2(np.cos(ramc), -(np.sin(ramc) * np.cos(eps) + np.tan(phi) * np.sin(eps)))
+
+
+def _placidus(ramc: float, eps: float, phi: float) -> np.ndarray:
+    """Куспиды 11, 12, 2, 3 по Плацидусу (радианы)."""
+    offsets = np.where(_PLACIDUS_NOCTURNAL, np.pi, 0.0)
+    ra = ramc + offsets + np.where(_PLACIDUS_NOCTURNAL, -1, 1) * _PLACIDUS_FRACTIONS * np.pi / 2
+    for _ in range(PLACIDUS_ITERATIONS):
+        lon = _ecliptic_longitude(ra, eps)
+        declination = np.arcsin(np.sin(eps) * np.sin(lon))
+        ad = np.arcsin(np.clip(np.tan(phi) * np.tan(declination), -1, 1))
+        diurnal = np.pi / 2 + ad
+        nocturnal = np.pi / 2 - ad
+        previous, ra = ra, np.where(
+            _PLACIDUS_NOCTURNAL,
+            ramc + np.pi - _PLACIDUS_FRACTIONS * nocturnal,
+            ramc + _PLACIDUS_FRACTIONS * diurnal,
+        )
+        if np.abs(ra - previous).max() < PLACIDUS_TOLERANCE:
+            break
+    return _ecliptic_longitude(ra, eps)
+
+
+def _koch(ramc: float, mc: float, eps: float, phi: float) -> np.ndarray:
+    """Куспиды 11, 12, 2, 3 по Коху (радианы)."""
+    declination = np.arcsin(np.sin(eps) * np.sin(mc))
+    ad = np.arcsin(np.clip(np.tan(phi) * np.tan(declination), -1, 1))
+    third = (np.pi / 2 + ad) / 3
+    return _ascendant(ramc + _KOCH_STEPS * third, eps, phi)
+
+
+def cusps_at(jd: float, latitude: float, longitude: float, system: str = PLACIDUS) -> np.ndarray:
+    """Долготы куспидов 1…12 в градусах."""
+    if system not in HOUSE_SYSTEMS:
+        raise ValueError(f"Unknown house system: {system}")
+
+    eps = np.radians(float(ephemeris.obliquity(jd)))
+    ramc = np.radians(float(ephemeris.sidereal_time(jd)) + longitude)
+    phi = np.radians(latitude)
+    asc = float(_ascendant(ramc, eps, phi))
+    mc = float(_ecliptic_longitude(ramc, eps))
+
+    # За полярным кругом часть эклиптики не восходит — полудуги не определены
+    if system == WHOLE_SIGN or abs(latitude) >= 90 - np.degrees(eps):
+        first = np.degrees(asc) % 360 // 30 * 30
+        return (first + 30.0 * np.arange(12)) % 360
+
+    if system == PLACIDUS:
+        c11, c12, c2, c3 = _placidus(ramc, eps, phi)
+    else:
+        c11, c12, c2, c3 = _koch(ramc, mc, eps, phi)
+
+    # Куспиды 4…9 — противоположные к 10…3
+    eastern = np.array([asc, c2, c3, mc + np.pi, c11 + np.pi, c12 + np.pi])
+    return np.degrees(np.concatenate([eastern, eastern + np.pi])) % 360
+
+
+@lru_cache(maxsize=4096)
+def _cached_cusps(moment: datetime, latitude: float, longitude: float, system: str) -> tuple:
+    return tuple(cusps_at(ephemeris.julian_day(moment), latitude, longitude, system))
+
+
+def cusps(moment: datetime, latitude: float, longitude: float, system: str = PLACIDUS) -> np.ndarray:
+    """Куспиды на момент рождения (UTC); запоминаются по моменту и месту."""
+    return np.array(_cached_cusps(moment, round(latitude, 4), round(longitude, 4), system))
+
+
+def house_numbers(lons, cusp_lons: np.ndarray) -> np.ndarray:
+    """Номера домов 1…12 для долгот (NaN → 0) одним searchsorted.
+
+    Куспиды разворачиваются от первого, чтобы шли по возрастанию в [0, 360).
+    """
+    lons = np.asarray(lons, dtype=float)
+    start = cusp_lons[0]
+    edges = (cusp_lons - start) % 360
+    houses = np.searchsorted(edges, (np.nan_to_num(lons) - start) % 360, side="right")
+    return np.where(np.isnan(lons), 0, houses)
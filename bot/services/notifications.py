@@ -0,0 +1,53 @@
+"""Очередь уведомлений в Redis и её отправка в Telegram."""
+
+import asyncio
+import json
+from typing import Iterable
+
+import structlog
+from aiogram import Bot
+from aiogram.exceptions import TelegramForbiddenError, TelegramRetryAfter
+from redis.asyncio import Redis
+
+logger = structlog.get_logger()
+
+QUEUE_KEY = "notify:queue"
+ENQUEUE_CHUNK = 1000
+# Telegram пропускает ~30 сообщений в секунду на бота
+SEND_RATE = 25
+
+
+async def enqueue_many(redis: Redis, items: Iterable[dict]) -> int:
+    """Кладёт уведомления {"chat_id", "text"} в очередь пачками."""
+    count = 0
+    batch: list[str] = []
+    for item in items:
+        batch.append(json.dumps(item, ensure_ascii=False))
+        if len(batch) >= ENQUEUE_CHUNK:
+            await redis.rpush(QUEUE_KEY, *batch)
+            count += len(batch)
+            batch.clear()
+    if batch:
+        await redis.rpush(QUEUE_KEY, *batch)
+        count += len(batch)
+    return count
+
+
+async def drain(bot: Bot, redis: Redis, limit: int = 1000) -> None:
+    """Отправляет до limit уведомлений из очереди с учётом лимитов Telegram."""
+    for _ in range(limit):
+        raw = await redis.lpop(QUEUE_KEY)
+        if raw is None:
+            return
+        item = json.loads(raw)
+        try:
+            await bot.send_message(item["chat_id"], item["text"], parse_mode="HTML")
+        except TelegramRetryAfter as e:
+            # Возвращаем в начало очереди и ждём, сколько просит Telegram
+            await redis.lpush(QUEUE_KEY, raw)
+            await asyncio.sleep(e.retry_after)
+        except TelegramForbiddenError:
+            pass  # Пользователь заблокировал бота
+        except Exception as e:
+            logger.error("Notification failed", chat_id=item["chat_id"], error=str(e))
+        await asyncio.sleep(1 / SEND_RATE)
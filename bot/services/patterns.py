@@ -0,0 +1,130 @@
+"""Аспектные конфигурации натальной карты — тау-квадрат, большой трин и др.
+
+Граф аспектов хранится битсетами: для каждого вида аспекта у каждой
+планеты есть маска из 10 бит — с кем она в этом аспекте. Поиск фигуры —
+это пересечение масок (например, вершина тау-квадрата — общий бит в масках
+квадратов двух концов оппозиции), а не перебор всех троек планет.
+
+Найденная фигура кодируется одним uint16: вид в старших битах, состав —
+маска планет в младших. В таком виде фигуры лежат в упакованной карте.
+"""
+
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+from bot.services.astrology_engine import PLANET_NAMES, SIGN_ORDER
+from bot.services.transits import PLANETS_RU
+
+# Натальные орбисы аспектов, из которых складываются фигуры
+PATTERN_ORBS = {
+    "sextile": (60.0, 5.0),
+    "square": (90.0, 7.0),
+    "trine": (120.0, 7.0),
+    "quincunx": (150.0, 3.0),
+    "opposition": (180.0, 8.0),
+}
+
+GRAND_CROSS, GRAND_TRINE, T_SQUARE, YOD, STELLIUM = 1, 2, 3, 4, 5
+# Вид фигуры: (ключ, название, смысл); порядок ключей — порядок важности
+PATTERNS = {
+    GRAND_CROSS: ("grand_cross", "✚ Большой крест",
+                  "Четыре силы тянут в разные стороны — огромная выносливость, если не распыляться"),
+    GRAND_TRINE: ("grand_trine", "△ Большой трин",
+                  "Замкнутый круг талантов — всё даётся легко, важно не застаиваться"),
+    T_SQUARE: ("t_square", "⊤ Тау-квадрат",
+               "Напряжение собирается в одной точке — это и есть главный двигатель"),
+    YOD: ("yod", "☝ Йод (перст судьбы)",
+          "Особая задача, к которой жизнь возвращает снова и снова"),
+    STELLIUM: ("stellium", "✦ Стеллиум",
+               "Много планет в одном знаке — его темы звучат в жизни особенно громко"),
+}
+
+KIND_SHIFT = 10
+MEMBERS_MASK = (1 << KIND_SHIFT) - 1
+STELLIUM_SIZE = 3
+
+_BITS = 1 << np.arange(len(PLANET_NAMES), dtype=np.int64)
+
+
+def aspect_masks(lons: np.ndarray) -> Dict[str, List[int]]:
+    """Битсеты графа аспектов: вид → маска партнёров для каждой планеты."""
+    lons = np.asarray(lons, dtype=float)[:len(PLANET_NAMES)]
+    sep = np.abs((lons[:, None] - lons[None, :] + 180) % 360 - 180)
+    # NaN даёт False в любом сравнении — такая планета не участвует
+    valid = ~np.eye(len(lons), dtype=bool)
+    return {
+        key: ((np.abs(sep - angle) <= orb) & valid).astype(np.int64) @ _BITS
+        for key, (angle, orb) in PATTERN_ORBS.items()
+    }
+
+
+def _bits(mask: int) -> Iterator[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _above(i: int) -> int:
+    """Маска планет с номером больше i — каждая фигура находится один раз."""
+    return ~((1 << (i + 1)) - 1)
+
+
+def detect(lons: np.ndarray) -> List[int]:
+    """Коды фигур карты в порядке важности."""
+    masks = {key: [int(m) for m in value] for key, value in aspect_masks(lons).items()}
+    sextile, square, trine = masks["sextile"], masks["square"], masks["trine"]
+    quincunx, opposition = masks["quincunx"], masks["opposition"]
+    found = {kind: set() for kind in PATTERNS}
+
+    for i in range(len(PLANET_NAMES)):
+        for j in _bits(trine[i] & _above(i)):
+            for k in _bits(trine[i] & trine[j] & _above(j)):
+                found[GRAND_TRINE].add(1 << i | 1 << j | 1 << k)
+
+        for j in _bits(opposition[i] & _above(i)):
+            for k in _bits(square[i] & square[j]):
+                # Четвёртая планета напротив вершины — фигура замыкается в крест
+                fourth = opposition[k] & square[i] & square[j]
+                if fourth:
+                    for m in _bits(fourth):
+                        found[GRAND_CROSS].add(1 << i | 1 << j | 1 << k | 1 << m)
+                else:
+                    found[T_SQUARE].add(1 << i | 1 << j | 1 << k)
+
+        for j in _bits(sextile[i] & _above(i)):
+            for k in _bits(quincunx[i] & quincunx[j]):
+                found[YOD].add(1 << i | 1 << j | 1 << k)
+
+    lons = np.asarray(lons, dtype=float)[:len(PLANET_NAMES)]
+    signs = np.where(np.isnan(lons), -1, np.nan_to_num(lons) // 30).astype(int)
+    for sign in range(len(SIGN_ORDER)):
+        members = int(_BITS[signs == sign].sum())
+        if bin(members).count("1") >= STELLIUM_SIZE:
+            found[STELLIUM].add(members)
+
+    return [
+        kind << KIND_SHIFT | members
+        for kind in PATTERNS
+        for members in sorted(found[kind])
+    ]
+
+
+def describe(codes: List[int], lons: np.ndarray) -> List[dict]:
+    """Фигуры для экрана: название, участники, смысл."""
+    result = []
+    for code in codes:
+        kind, members = code >> KIND_SHIFT, code & MEMBERS_MASK
+        key, title, meaning = PATTERNS[kind]
+        planets = [PLANET_NAMES[i] for i in _bits(members)]
+        if kind == STELLIUM:
+            sign = SIGN_ORDER[int(lons[PLANET_NAMES.index(planets[0])] // 30)]
+            title = f"{title} в {sign}"
+        result.append({
+            "key": key,
+            "title": title,
+            "planets": planets,
+            "text": f"{', '.join(PLANETS_RU[p] for p in planets)}. {meaning}",
+        })
+    return result
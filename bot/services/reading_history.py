@@ -0,0 +1,89 @@
+"""История раскладов — постраничный список без OFFSET.
+
+Страница берётся по ключу (created_at, id) последней показанной записи:
+`WHERE user_id = … AND (created_at, id) < курсор ORDER BY … DESC LIMIT n`.
+Индекс ix_tarot_readings_history покрывает и условие, и порядок, а в
+INCLUDE лежат колонки списка — страница читается только из индекса, без
+вопросов и AI-трактовок, на любой глубине истории одинаково быстро.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.database import TarotReading
+from bot.services.tarot import SPREADS, tarot
+
+PAGE_SIZE = 10
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Колонки списка — все есть в покрывающем индексе
+LIST_COLUMNS = (
+    TarotReading.id,
+    TarotReading.created_at,
+    TarotReading.spread_type,
+    TarotReading.seed,
+    TarotReading.deck_version,
+    TarotReading.cards,
+)
+
+Cursor = Tuple[datetime, int]
+
+
+class HistoryItem(NamedTuple):
+    id: int
+    created_at: datetime
+    spread_type: str
+    seed: Optional[int]
+    deck_version: Optional[int]
+    cards: Optional[bytes]
+
+    @property
+    def title(self) -> str:
+        return SPREADS.get(self.spread_type, {}).get("name", self.spread_type)
+
+    def card_names(self) -> List[str]:
+        """Карты расклада по зерну или упакованным номерам."""
+        return [
+            f"{item['card'].name_ru}{' ↺' if item['card'].reversed else ''}"
+            for item in tarot.reading_cards(self)
+        ]
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """Курсор для callback_data: микросекунды от эпохи и id."""
+    created_at, reading_id = cursor
+    return f"{(created_at - _EPOCH) // timedelta(microseconds=1)}:{reading_id}"
+
+
+def decode_cursor(raw: str) -> Optional[Cursor]:
+    try:
+        micros, reading_id = raw.split(":")
+        return _EPOCH + timedelta(microseconds=int(micros)), int(reading_id)
+    except ValueError:
+        return None
+
+
+def history_query(user_id: int, cursor: Optional[Cursor] = None, limit: int = PAGE_SIZE):
+    """Запрос страницы: на одну запись больше — чтобы знать, есть ли следующая."""
+    query = select(*LIST_COLUMNS).where(TarotReading.user_id == user_id)
+    if cursor is not None:
+        query = query.where(tuple_(TarotReading.created_at, TarotReading.id) < tuple_(*cursor))
+    return query.order_by(TarotReading.created_at.desc(), TarotReading.id.desc()).limit(limit + 1)
+
+
+async def history_page(
+    session: AsyncSession,
+    user_id: int,
+    cursor: Optional[Cursor] = None,
+    limit: int = PAGE_SIZE,
+) -> Tuple[List[HistoryItem], Optional[Cursor]]:
+    """Страница истории и курсор следующей (None — дальше пусто)."""
+    rows = (await session.execute(history_query(user_id, cursor, limit))).all()
+    items = [HistoryItem(*row) for row in rows[:limit]]
+    if len(rows) <= limit:
+        return items, None
+    last = items[-1]
+    return items, (last.created_at, last.id)
@@ -0,0 +1,109 @@
+"""Выборка без повторов из набора номеров — равномерная и по весам.
+
+Набор (например, номера карт подколоды) задаётся один раз; сэмплер держит
+его неизменным кортежем и не копирует при вытягивании:
+
+- равномерно — разреженная тасовка Фишера — Йетса: перестановки хранятся
+  в словаре, k карт из n — O(k) независимо от n;
+- по весам — алиас-таблица Воуза: одна карта за O(1), повторы и
+  исключённые отбрасываются. Если веса так перекошены, что отбрасывается
+  почти всё, выбор доводится точным проходом по оставшимся.
+
+Случайность — только вызовы rnd() (Random.random), поэтому при заданном
+зерне выборка воспроизводима. Номера выдаются по одному генератором: между
+ними вызывающий может брать свои rnd() (например, на переворот карты).
+"""
+
+from typing import Collection, Iterator, Optional, Sequence, Tuple
+
+# Сколько промахов подряд терпит выборка по алиас-таблице до точного прохода
+MAX_MISSES = 64
+
+
+def build_alias(weights: Sequence[float]) -> Tuple[Tuple[float, ...], Tuple[int, ...]]:
+    """Алиас-таблица Воуза: вероятность остаться в ячейке и номер замены."""
+    n = len(weights)
+    total = float(sum(weights))
+    if n == 0 or total <= 0:
+        raise ValueError("weights must contain a positive value")
+    scaled = [w * n / total for w in weights]
+    prob = [1.0] * n
+    alias = list(range(n))
+    small = [i for i, w in enumerate(scaled) if w < 1.0]
+    large = [i for i, w in enumerate(scaled) if w >= 1.0]
+    while small and large:
+        s, g = small.pop(), large.pop()
+        prob[s], alias[s] = scaled[s], g
+        scaled[g] -= 1.0 - scaled[s]
+        (small if scaled[g] < 1.0 else large).append(g)
+    # Остатки — 1.0 с точностью до округления
+    return tuple(prob), tuple(alias)
+
+
+class IndexSampler:
+    """Номера из фиксированного набора без повторов; веса — по желанию."""
+
+    __slots__ = ("indices", "weights", "_prob", "_alias")
+
+    def __init__(self, indices: Sequence[int], weights: Optional[Sequence[float]] = None) -> None:
+        self.indices = tuple(indices)
+        self.weights = tuple(weights) if weights is not None else None
+        if self.weights is not None:
+            if len(self.weights) != len(self.indices):
+                raise ValueError("weights and indices differ in length")
+            self._prob, self._alias = build_alias(self.weights)
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def iter_sample(self, rnd, exclude: Optional[Collection[int]] = None) -> Iterator[int]:
+        """Номера без повторов в случайном порядке, пока набор не кончится."""
+        if self.weights is None:
+            return self._uniform(rnd, exclude or ())
+        return self._weighted(rnd, exclude or ())
+
+    def _uniform(self, rnd, exclude: Collection[int]) -> Iterator[int]:
+        indices = self.indices
+        n = len(indices)
+        swaps: dict = {}
+        for i in range(n):
+            j = i + int(rnd() * (n - i))
+            pick = swaps.get(j, j)
+            swaps[j] = swaps.get(i, i)
+            idx = indices[pick]
+            if idx not in exclude:
+                yield idx
+
+    def _weighted(self, rnd, exclude: Collection[int]) -> Iterator[int]:
+        indices, prob, alias = self.indices, self._prob, self._alias
+        n = len(indices)
+        taken: set = set()
+        available = sum(1 for i, w in enumerate(self.weights) if w > 0 and indices[i] not in exclude)
+        misses = 0
+        while len(taken) < available:
+            if misses < MAX_MISSES:
+                u = rnd() * n
+                cell = int(u)
+                slot = cell if u - cell < prob[cell] else alias[cell]
+            else:
+                slot = self._exact(rnd, taken, exclude)
+            idx = indices[slot]
+            if slot in taken or idx in exclude:
+                misses += 1
+                continue
+            taken.add(slot)
+            misses = 0
+            yield idx
+
+    def _exact(self, rnd, taken: set, exclude: Collection[int]) -> int:
+        """Точный выбор по весам среди оставшихся — O(n), только после промахов."""
+        rest = [
+            (slot, w) for slot, w in enumerate(self.weights)
+            if w > 0 and slot not in taken and self.indices[slot] not in exclude
+        ]
+        u = rnd() * sum(w for _, w in rest)
+        for slot, w in rest:
+            u -= w
+            if u < 0:
+                return slot
+        return rest[-1][0]
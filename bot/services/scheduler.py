@@ -0,0 +1,72 @@
+"""Планировщик фоновых задач на asyncio."""
+
+import asyncio
+from datetime import datetime, time, timedelta, timezone
+from typing import Awaitable, Callable
+
+import structlog
+
+logger = structlog.get_logger()
+
+Job = Callable[[], Awaitable[None]]
+
+
+class Scheduler:
+    """Простые ежедневные и периодические задачи внутри процесса бота."""
+
+    def __init__(self) -> None:
+        self._jobs: list[tuple[str, Callable[[], Awaitable[None]]]] = []
+        self._tasks: list[asyncio.Task] = []
+
+    def add_daily(self, name: str, job: Job, at: time, run_on_start: bool = False) -> None:
+        """Запускает job каждый день в момент at (UTC)."""
+        self._jobs.append((name, lambda: self._daily_loop(name, job, at, run_on_start)))
+
+    def add_interval(self, name: str, job: Job, seconds: int, run_on_start: bool = False) -> None:
+        """Запускает job каждые seconds секунд."""
+        self._jobs.append((name, lambda: self._interval_loop(name, job, seconds, run_on_start)))
+
+    def start(self) -> None:
+        for name, loop in self._jobs:
+            self._tasks.append(asyncio.create_task(loop(), name=f"scheduler:{name}"))
+        logger.info("Scheduler started", jobs=[name for name, _ in self._jobs])
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _run(self, name: str, job: Job) -> None:
+        started = datetime.now(timezone.utc)
+        try:
+            await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Scheduled job failed", job=name, error=str(e))
+            return
+        elapsed = (datetime.now(timezone.utc) - started).total_seconds()
+        logger.info("Scheduled job done", job=name, seconds=round(elapsed, 2))
+
+    async def _daily_loop(self, name: str, job: Job, at: time, run_on_start: bool) -> None:
+        if run_on_start:
+            await self._run(name, job)
+        while True:
+            now = datetime.now(timezone.utc)
+            next_run = datetime.combine(now.date(), at, tzinfo=timezone.utc)
+            if next_run <= now:
+                next_run += timedelta(days=1)
+            await asyncio.sleep((next_run - now).total_seconds())
+            await self._run(name, job)
+
+    async def _interval_loop(self, name: str, job: Job, seconds: int, run_on_start: bool) -> None:
+        if not run_on_start:
+            await asyncio.sleep(seconds)
+        while True:
+            await self._run(name, job)
+            await asyncio.sleep(seconds)
+
+
+# Глобальный экземпляр
+scheduler = Scheduler()
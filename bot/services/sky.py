@@ -0,0 +1,246 @@
+"""Небо дня — общие для всех пользователей положения планет.
+
+Транзитные положения, фаза Луны и смены знаков считаются один раз в сутки,
+Луна и звёздное время (для всего, что зависит от Асцендента) — раз в час.
+Снимки лежат в памяти процесса и в Redis; при промахе расчёт идёт под
+блокировкой, чтобы параллельные запросы не считали одно и то же.
+"""
+
+import asyncio
+import json
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+import numpy as np
+import structlog
+from redis.asyncio import Redis
+from redis.exceptions import LockError, RedisError
+
+from bot.services import ephemeris
+from bot.services.astrology_engine import PLANET_NAMES, SIGN_ORDER, astrology
+
+logger = structlog.get_logger()
+
+MOON = PLANET_NAMES.index("Moon")
+SUN = PLANET_NAMES.index("Sun")
+
+# Фазы Луны по элонгации Луны от Солнца, шаг 45°
+MOON_PHASES = (
+    "🌑 Новолуние",
+    "🌒 Растущий серп",
+    "🌓 Первая четверть",
+    "🌔 Растущая Луна",
+    "🌕 Полнолуние",
+    "🌖 Убывающая Луна",
+    "🌗 Последняя четверть",
+    "🌘 Убывающий серп",
+)
+
+DAY_TTL = 2 * 86400
+HOUR_TTL = 3 * 3600
+
+
+@dataclass
+class DaySky:
+    """Снимок неба на сутки (положения на 00:00 UTC)."""
+    day: str
+    lons: list
+    speeds: list
+    ingresses: list = field(default_factory=list)
+
+
+@dataclass
+class HourSky:
+    """Часовой снимок: Луна, фаза и звёздное время Гринвича."""
+    hour: str
+    moon_lon: float
+    moon_speed: float
+    phase: str
+    illumination: float
+    gmst: float
+
+
+def _moon_phase(elongation: float) -> Tuple[str, float]:
+    idx = int(((elongation + 22.5) % 360) // 45)
+    illumination = (1 - np.cos(np.radians(elongation))) / 2
+    return MOON_PHASES[idx], round(float(illumination), 3)
+
+
+def compute_day(day: date) -> DaySky:
+    """Считает суточный снимок и смены знаков за сутки."""
+    start = datetime(day.year, day.month, day.day)
+    lons, speeds = astrology.planet_positions(start)
+    next_lons, _ = astrology.planet_positions(start + timedelta(days=1))
+
+    ingresses = []
+    for i, name in enumerate(PLANET_NAMES):
+        if np.isnan(lons[i]) or np.isnan(next_lons[i]):
+            continue
+        sign_from, sign_to = int(lons[i] // 30), int(next_lons[i] // 30)
+        if sign_from == sign_to:
+            continue
+        # Время пересечения границы знака — линейная интерполяция за сутки
+        delta = (next_lons[i] - lons[i] + 180) % 360 - 180
+        boundary = sign_to * 30 if delta > 0 else sign_from * 30
+        passed = (boundary - lons[i] + 180) % 360 - 180
+        hours = 24 * passed / delta if delta else 0
+        ingresses.append({
+            "planet": name,
+            "sign": SIGN_ORDER[sign_to],
+            "time": (start + timedelta(hours=float(hours))).strftime("%H:%M"),
+        })
+
+    return DaySky(
+        day=day.isoformat(),
+        lons=[float(x) for x in lons],
+        speeds=[float(x) for x in speeds],
+        ingresses=ingresses,
+    )
+
+
+def compute_hour(when: datetime) -> HourSky:
+    """Считает часовой снимок Луны."""
+    start = when.replace(minute=0, second=0, microsecond=0)
+    lons, speeds = astrology.planet_positions(start)
+    phase, illumination = _moon_phase((lons[MOON] - lons[SUN]) % 360)
+    return HourSky(
+        hour=start.strftime("%Y-%m-%dT%H"),
+        moon_lon=float(lons[MOON]),
+        moon_speed=float(speeds[MOON]),
+        phase=phase,
+        illumination=illumination,
+        gmst=float(ephemeris.sidereal_time(ephemeris.julian_day(start))),
+    )
+
+
+class SkyService:
+    """Кэш неба дня: память процесса → Redis → расчёт под блокировкой."""
+
+    def __init__(self) -> None:
+        self.redis: Optional[Redis] = None
+        self._memory: dict[str, object] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def setup(self, redis: Redis) -> None:
+        self.redis = redis
+
+    async def get_day(self, day: Optional[date] = None) -> DaySky:
+        day = day or datetime.now(timezone.utc).date()
+        return await self._get(f"sky:day:{day.isoformat()}", DaySky, DAY_TTL, compute_day, day)
+
+    async def get_hour(self, when: Optional[datetime] = None) -> HourSky:
+        when = _utc_naive(when)
+        key = f"sky:hour:{when.strftime('%Y-%m-%dT%H')}"
+        return await self._get(key, HourSky, HOUR_TTL, compute_hour, when)
+
+    async def positions(self, when: Optional[datetime] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Положения планет на момент: суточный снимок + часовая Луна."""
+        when = _utc_naive(when)
+        day_sky = await self.get_day(when.date())
+        hour_sky = await self.get_hour(when)
+
+        # Медленные планеты сдвигаем по суточной скорости, Луну берём из часа
+        hours = when.hour + when.minute / 60
+        speeds = np.array(day_sky.speeds)
+        lons = (np.array(day_sky.lons) + speeds * hours / 24) % 360
+        minutes = when.minute / 60
+        lons[MOON] = (hour_sky.moon_lon + hour_sky.moon_speed * minutes / 24) % 360
+        speeds[MOON] = hour_sky.moon_speed
+        return lons, speeds
+
+    async def refresh(self) -> None:
+        """Плановое обновление: сегодня, завтра и ближайшие часы."""
+        now = _utc_naive(None)
+        loop = asyncio.get_running_loop()
+        for day in (now.date(), now.date() + timedelta(days=1)):
+            day_sky = await loop.run_in_executor(None, compute_day, day)
+            await self._store(f"sky:day:{day.isoformat()}", day_sky, DAY_TTL)
+        await self.refresh_hour()
+        self._prune(now)
+
+    async def refresh_hour(self) -> None:
+        now = _utc_naive(None)
+        loop = asyncio.get_running_loop()
+        for when in (now, now + timedelta(hours=1)):
+            hour_sky = await loop.run_in_executor(None, compute_hour, when)
+            await self._store(f"sky:hour:{when.strftime('%Y-%m-%dT%H')}", hour_sky, HOUR_TTL)
+
+    async def _get(self, key: str, cls, ttl: int, compute, arg):
+        cached = self._memory.get(key)
+        if cached is not None:
+            return cached
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                return cached
+
+            cached = await self._load(key, cls)
+            if cached is None:
+                cached = await self._compute_locked(key, cls, compute, arg)
+                await self._store(key, cached, ttl)
+            self._memory[key] = cached
+
+        self._locks.pop(key, None)
+        return cached
+
+    async def _compute_locked(self, key: str, cls, compute, arg):
+        loop = asyncio.get_event_loop()
+        if self.redis is None:
+            return await loop.run_in_executor(None, compute, arg)
+
+        # Межпроцессная блокировка: считает один, остальные ждут и читают Redis.
+        # Кэш необязателен: без Redis или блокировки считаем сами
+        result = None
+        try:
+            async with self.redis.lock(f"{key}:lock", timeout=60, blocking_timeout=30):
+                result = await self._load(key, cls)
+                if result is None:
+                    result = await loop.run_in_executor(None, compute, arg)
+        except (LockError, RedisError) as e:
+            logger.warning("Sky lock unavailable, computing locally", key=key, error=str(e))
+        if result is None:
+            result = await loop.run_in_executor(None, compute, arg)
+        return result
+
+    async def _load(self, key: str, cls):
+        if self.redis is None:
+            return None
+        try:
+            raw = await self.redis.get(key)
+        except Exception as e:
+            logger.error("Sky cache read failed", key=key, error=str(e))
+            return None
+        return cls(**json.loads(raw)) if raw else None
+
+    async def _store(self, key: str, value, ttl: int) -> None:
+        self._memory[key] = value
+        if self.redis is None:
+            return
+        try:
+            await self.redis.setex(key, ttl, json.dumps(asdict(value)))
+        except Exception as e:
+            logger.error("Sky cache write failed", key=key, error=str(e))
+
+    def _prune(self, now: datetime) -> None:
+        """Выбрасывает из памяти снимки старше суток."""
+        oldest_day = (now.date() - timedelta(days=1)).isoformat()
+        oldest_hour = (now - timedelta(hours=2)).strftime("%Y-%m-%dT%H")
+        for key in list(self._memory):
+            kind, stamp = key.split(":")[1], key.split(":", 2)[2]
+            if (kind == "day" and stamp < oldest_day) or (kind == "hour" and stamp < oldest_hour):
+                del self._memory[key]
+
+
+def _utc_naive(when: Optional[datetime]) -> datetime:
+    if when is None:
+        when = datetime.now(timezone.utc)
+    if when.tzinfo is not None:
+        when = when.astimezone(timezone.utc).replace(tzinfo=None)
+    return when
+
+
+# Глобальный экземпляр
+sky = SkyService()
@@ -0,0 +1,217 @@
+"""Синастрия — совместимость двух натальных карт.
+
+Сетка аспектов 11×11 (10 планет + Асцендент одного партнёра против
+другого) считается одной векторной операцией; точки с NaN просто не дают
+аспектов. Орбис аспекта зависит от пары: у светил он шире, у высших планет
+уже, а вклад аспекта плавно спадает от точного угла к границе орбиса.
+Совместимость знаков — заранее посчитанная таблица 12×12, поэтому оценки
+по Солнцу и Луне — это обращение по индексу.
+
+Все функции транслируются по ведущим осям: (..., 11) против (..., 11),
+так что одна карта сравнивается сразу с пачкой карт.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+from bot.services.astrology_engine import CHART_POINTS, SIGN_ORDER
+from bot.services.transits import ASPECTS, PLANETS_RU
+
+# Орбисы синастрии шире транзитных: (соединение, секстиль, квадрат, трин, оппозиция)
+SYNASTRY_ORBS = np.array([8.0, 4.0, 6.0, 6.0, 7.0])
+SYNASTRY_ANGLES = np.array([a[1] for a in ASPECTS])
+# Ближайший аспект для каждого целого угла 0…180
+_NEAREST_ASPECT = np.abs(np.arange(181)[:, None] - SYNASTRY_ANGLES).argmin(axis=1).astype(np.int8)
+NO_ASPECT_ANGLE = 45.0
+
+# Вес точки в совместимости и множитель её орбиса (порядок CHART_POINTS)
+POINT_WEIGHTS = np.array([3.0, 3.0, 1.5, 2.5, 2.0, 1.2, 1.2, 0.5, 0.5, 0.5, 2.0])
+ORB_FACTORS = np.array([1.0, 1.0, 0.85, 0.85, 0.85, 0.7, 0.7, 0.5, 0.5, 0.5, 1.0])
+
+# Характер аспекта: мягкие помогают, напряжённые мешают.
+# Соединение зависит от участников — тон точки ниже.
+_NATURE_SIGN = {"fusion": 0.0, "soft": 1.0, "hard": -1.0}
+ASPECT_POLARITY = np.array([_NATURE_SIGN[a[4]] for a in ASPECTS])
+CONJUNCTION_TONE = np.array([0.8, 0.9, 0.5, 1.0, 0.3, 0.9, -0.6, -0.2, 0.1, -0.5, 0.7])
+
+PAIR_WEIGHTS = np.outer(POINT_WEIGHTS, POINT_WEIGHTS)
+PAIR_ORB_FACTORS = (ORB_FACTORS[:, None] + ORB_FACTORS[None, :]) / 2
+PAIR_CONJUNCTION = (CONJUNCTION_TONE[:, None] + CONJUNCTION_TONE[None, :]) / 2
+
+# Таблицы (аспект, пара точек) для сбора одним индексированием
+_PAIR_INDEX = np.arange(len(CHART_POINTS) ** 2).reshape(len(CHART_POINTS), -1)
+_ANGLES32 = SYNASTRY_ANGLES.astype(np.float32)
+_INV_TOLERANCE = (1 / (SYNASTRY_ORBS[:, None, None] * PAIR_ORB_FACTORS)).reshape(len(ASPECTS), -1).astype(np.float32)
+_PAIR_SCALE = (PAIR_WEIGHTS * np.where(
+    (np.arange(len(ASPECTS)) == 0)[:, None, None], PAIR_CONJUNCTION, ASPECT_POLARITY[:, None, None],
+)).reshape(len(ASPECTS), -1).astype(np.float32)
+
+# Чем больше сумма взвешенных вкладов, тем ближе оценка к 100
+SCORE_SCALE = 25.0
+
+
+def _points_mask(*names: str) -> np.ndarray:
+    """Пары 11×11, где хотя бы одна из точек — из списка."""
+    hit = np.isin(CHART_POINTS, names)
+    return hit[:, None] | hit[None, :]
+
+
+def _cross_mask(first: tuple, second: tuple) -> np.ndarray:
+    """Пары «точка из first у одного — точка из second у другого» и наоборот."""
+    a, b = np.isin(CHART_POINTS, first), np.isin(CHART_POINTS, second)
+    return (a[:, None] & b[None, :]) | (b[:, None] & a[None, :])
+
+
+# Сферы отношений — маски пар для разбивки оценки
+SPHERES = {
+    "personality": ("☉ Личности", _points_mask("Sun", "Ascendant")),
+    "emotions": ("☽ Эмоции", _points_mask("Moon")),
+    "attraction": ("♀♂ Притяжение", _cross_mask(("Venus", "Mars"), ("Venus", "Mars", "Sun", "Moon"))),
+    "communication": ("☿ Общение", _points_mask("Mercury")),
+    "stability": ("♄ Прочность", _points_mask("Jupiter", "Saturn")),
+}
+
+
+# Маски сфер, развёрнутые в (121, сферы) для матричного умножения
+SPHERE_MATRIX = np.stack([mask.ravel() for _, mask in SPHERES.values()], axis=1).astype(float)
+
+
+def _build_sign_table() -> np.ndarray:
+    """Таблица совместимости знаков 12×12 в процентах.
+
+    Половина — стихии (огонь с воздухом, земля с водой), половина —
+    угол между знаками: трин и секстиль гармоничны, квадрат и квинконс — нет.
+    """
+    element_scores = np.array([
+        # Огонь Земля Воздух Вода
+        [70, 40, 90, 30],
+        [40, 80, 30, 90],
+        [90, 30, 75, 40],
+        [30, 90, 40, 85],
+    ])
+    # По расстоянию между знаками 0…6
+    distance_scores = np.array([75, 45, 80, 40, 90, 35, 60])
+
+    signs = np.arange(len(SIGN_ORDER))
+    elements = signs % 4
+    distance = np.abs(signs[:, None] - signs[None, :])
+    distance = np.minimum(distance, 12 - distance)
+    table = 0.5 * element_scores[elements[:, None], elements[None, :]] + 0.5 * distance_scores[distance]
+    return table.round().astype(np.int16)
+
+
+SIGN_PAIR_SCORES = _build_sign_table()
+
+
+def sign_score(lon_a, lon_b) -> np.ndarray:
+    """Совместимость знаков по долготам — обращение к таблице 12×12."""
+    return SIGN_PAIR_SCORES[
+        (np.asarray(lon_a) // 30).astype(int) % 12,
+        (np.asarray(lon_b) // 30).astype(int) % 12,
+    ]
+
+
+class SynastryEngine:
+    """Векторный расчёт синастрии."""
+
+    def aspect_grid(self, lons_a: np.ndarray, lons_b: np.ndarray) -> Dict[str, np.ndarray]:
+        """Сетка аспектов (..., 11, 11): вид, отклонение, сила 0…1 и вклад."""
+        # float32 вдвое экономит память тензора и с запасом точен для орбисов
+        lons_a = np.asarray(lons_a, dtype=np.float32)
+        lons_b = np.asarray(lons_b, dtype=np.float32)
+        # Долготы в [0, 360), поэтому угол между точками считается без деления по модулю
+        sep = np.float32(180) - np.abs(np.float32(180) - np.abs(lons_a[..., :, None] - lons_b[..., None, :]))
+        # Точки нет — берём угол, далёкий от всех аспектов
+        sep[np.isnan(sep)] = NO_ASPECT_ANGLE
+
+        # Аспекты отстоят друг от друга на 30°+, а орбисы не больше 8°, поэтому
+        # в орбис может попасть только ближайший аспект — он берётся из таблицы
+        kind = _NEAREST_ASPECT[np.rint(sep).astype(np.intp)]
+        orb = np.abs(sep - _ANGLES32[kind])
+        strength = np.clip(1 - orb * _INV_TOLERANCE[kind, _PAIR_INDEX], 0, 1)
+        contribution = strength * _PAIR_SCALE[kind, _PAIR_INDEX]
+        return {"kind": kind, "orb": orb, "strength": strength, "contribution": contribution}
+
+    def scores(self, lons_a: np.ndarray, lons_b: np.ndarray) -> Dict[str, np.ndarray]:
+        """Оценки 0–100 по сферам и итог (формы — ведущие оси входа)."""
+        contribution = self.aspect_grid(lons_a, lons_b)["contribution"]
+        lons_a = np.asarray(lons_a, dtype=float)
+        lons_b = np.asarray(lons_b, dtype=float)
+
+        # Суммы по сферам — одно матричное умножение по 121 паре точек
+        flat = contribution.reshape(contribution.shape[:-2] + (-1,))
+        sphere_sums = flat @ SPHERE_MATRIX
+        result = {
+            key: _to_percent(sphere_sums[..., k], SCORE_SCALE / 3)
+            for k, key in enumerate(SPHERES)
+        }
+        aspects = _to_percent(flat.sum(axis=-1), SCORE_SCALE)
+
+        sun = CHART_POINTS.index("Sun")
+        moon = CHART_POINTS.index("Moon")
+        result["sun"] = sign_score(lons_a[..., sun], lons_b[..., sun])
+        result["moon"] = sign_score(lons_a[..., moon], lons_b[..., moon])
+        signs = 0.6 * result["sun"] + 0.4 * result["moon"]
+
+        result["aspects"] = aspects
+        result["total"] = np.rint(0.35 * signs + 0.65 * aspects).astype(int)
+        return result
+
+    def matrix(self, lons: np.ndarray) -> np.ndarray:
+        """Итоговая совместимость всех пар группы (N, N); диагональ — 100.
+
+        Считается только верхний треугольник — N·(N−1)/2 сеток 11×11 одним
+        тензором, затем отражается.
+        """
+        lons = np.asarray(lons, dtype=float)
+        n = len(lons)
+        i, j = np.triu_indices(n, k=1)
+        totals = self.scores(lons[i], lons[j])["total"]
+
+        out = np.full((n, n), 100, dtype=np.int16)
+        out[i, j] = totals
+        out[j, i] = totals
+        return out
+
+    def compare(self, lons_a: np.ndarray, lons_b: np.ndarray, top: int = 5) -> Dict:
+        """Совместимость пары: итог, разбивка по сферам и сильнейшие аспекты."""
+        grid = self.aspect_grid(lons_a, lons_b)
+        s = self.scores(lons_a, lons_b)
+
+        contribution = grid["contribution"]
+        order = np.argsort(-np.abs(contribution), axis=None)[:top]
+        aspects: List[Dict] = []
+        for flat in order:
+            i, j = np.unravel_index(flat, contribution.shape)
+            if grid["strength"][i, j] <= 0:
+                break
+            key, _, _, aspect_ru, nature = ASPECTS[grid["kind"][i, j]]
+            aspects.append({
+                "first": CHART_POINTS[i],
+                "second": CHART_POINTS[j],
+                "aspect": key,
+                "orb": round(float(grid["orb"][i, j]), 1),
+                "harmony": float(contribution[i, j]) >= 0,
+                "text": f"{PLANETS_RU[CHART_POINTS[i]]} — {aspect_ru} — {PLANETS_RU[CHART_POINTS[j]]}",
+            })
+
+        return {
+            "total": int(s["total"]),
+            "sun_score": int(s["sun"]),
+            "moon_score": int(s["moon"]),
+            "aspect_score": int(round(float(s["aspects"]))),
+            "spheres": {
+                title: int(round(float(s[key]))) for key, (title, _) in SPHERES.items()
+            },
+            "aspects": aspects,
+        }
+
+
+def _to_percent(value: np.ndarray, scale: float) -> np.ndarray:
+    """Сумма вкладов → 0–100, где 50 — нейтрально."""
+    return 50.0 + 50.0 * np.tanh(value / scale)
+
+
+# Глобальный экземпляр
+synastry = SynastryEngine()
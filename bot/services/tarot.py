@@ -1,14 +1,25 @@
-"""Таро-модуль: 78 карт с подробными описаниями, расклады."""
+"""Таро-модуль: колоды (RWS, Тот, Ленорман), расклады."""
 
 import random
-from dataclasses import dataclass, field
+import secrets
+import sqlite3
+import struct
+import threading
+from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from bot.data import build_decks
+from bot.services.sampling import IndexSampler
 
 
 class ArcanaType(str, Enum):
     MAJOR = "major"
     MINOR = "minor"
+    # Карты оракулов (Ленорман) — без арканов и мастей
+    ORACLE = "oracle"
 
 
 class Suit(str, Enum):
@@ -30,35 +41,71 @@ SUIT_EMOJI = {
 }
 
 
-@dataclass
+DEFAULT_DECK = "rws"
+
+
+@dataclass(frozen=True, slots=True)
 class TarotCard:
+    """Карта колоды — один неизменяемый экземпляр на всё приложение.
+
+    Значения карты (длинные тексты) в экземпляре не хранятся: их по
+    запросу подгружает реестр колод.
+    """
     id: int
     name: str
     name_ru: str
     arcana: ArcanaType
     suit: Suit
     number: int
-    keywords: list
+    keywords: tuple
     element: str
-    meaning_upright: str = ""
-    meaning_reversed: str = ""
+    deck: str = DEFAULT_DECK
+
+    @property
+    def display_name(self) -> str:
+        return f"{SUIT_EMOJI[self.suit]} {self.name_ru}"
+
+    @property
+    def meaning_upright(self) -> str:
+        return decks.meaning(self.deck, self.id)[0]
+
+    @property
+    def meaning_reversed(self) -> str:
+        return decks.meaning(self.deck, self.id)[1]
+
+    def get_meaning(self, reversed: bool = False) -> str:
+        upright, reversed_meaning = decks.meaning(self.deck, self.id)
+        if reversed and reversed_meaning:
+            return reversed_meaning
+        return upright
+
+
+class DrawnCard(NamedTuple):
+    """Вытянутая карта: ссылка на карту колоды и положение.
+
+    Поля карты (name_ru, keywords, …) читаются напрямую из колоды —
+    при раскладе ничего не копируется.
+    """
+    card: TarotCard
     reversed: bool = False
 
+    def __getattr__(self, name: str):
+        return getattr(self.card, name)
+
     @property
     def display_name(self) -> str:
         prefix = "🔄 " if self.reversed else ""
-        return f"{prefix}{SUIT_EMOJI[self.suit]} {self.name_ru}"
+        return f"{prefix}{self.card.display_name}"
 
     def get_meaning(self) -> str:
-        if self.reversed and self.meaning_reversed:
-            return self.meaning_reversed
-        return self.meaning_upright
+        return self.card.get_meaning(self.reversed)
 
     def to_dict(self) -> dict:
+        card = self.card
         return {
-            "id": self.id, "name": self.name, "name_ru": self.name_ru,
-            "suit": self.suit.value, "arcana": self.arcana.value,
-            "reversed": self.reversed, "keywords": self.keywords,
+            "id": card.id, "name": card.name, "name_ru": card.name_ru,
+            "suit": card.suit.value, "arcana": card.arcana.value,
+            "reversed": self.reversed, "keywords": list(card.keywords),
             "meaning": self.get_meaning(),
         }
 
@@ -96,261 +143,286 @@ SPREADS = {
 }
 
 
-def _build_deck() -> list[TarotCard]:
-    cards = []
-    cid = 0
-
-    major = [
-        ("The Fool", "Шут", "воздух", ["начало", "спонтанность", "вера"],
-         "Начало нового пути. Карта говорит о моменте, когда нужно довериться жизни и сделать шаг в неизвестность. Вселенная поддерживает вас, даже если вы не видите страховочной сетки. Время отбросить страхи и действовать с детской непосредственностью.",
-         "Безрассудство и импульсивность. Вы игнорируете очевидные риски или боитесь начать. Остановитесь и подумайте — отвага не означает отсутствие плана."),
-
-        ("The Magician", "Маг", "воздух", ["воля", "мастерство", "ресурсы"],
-         "У вас есть все необходимые ресурсы для успеха — знания, навыки, связи. Карта Мага говорит: действуйте осознанно, направляйте свою волю, и результат превзойдёт ожидания. Время проявить мастерство.",
-         "Манипуляции или нереализованный потенциал. Вы либо используете свои таланты нечестно, либо не используете их вовсе. Пересмотрите свои методы и намерения."),
-
-        ("The High Priestess", "Верховная Жрица", "вода", ["интуиция", "тайна", "подсознание"],
-         "Слушайте свою интуицию — она знает больше, чем разум. Карта указывает на скрытые знания, которые раскроются, если вы замедлитесь и прислушаетесь к внутреннему голосу. Не всё нужно объяснять логикой.",
-         "Вы игнорируете свою интуицию или утонули в иллюзиях. Внутренний голос заблокирован суетой и чужими мнениями. Найдите тишину — ответы придут."),
-
-        ("The Empress", "Императрица", "земля", ["изобилие", "творчество", "забота"],
-         "Время расцвета и плодородия. Всё, что вы создаёте сейчас, будет расти и приносить плоды. Позаботьтесь о теле, насладитесь красотой жизни, откройтесь потоку изобилия. Творчество и материнская энергия на подъёме.",
-         "Пренебрежение собой или творческий застой. Вы забыли о своих потребностях, ухаживая за другими, или потеряли связь с чувственной стороной жизни."),
-
-        ("The Emperor", "Император", "огонь", ["структура", "власть", "стабильность"],
-         "Время для порядка, структуры и чёткого руководства. Установите правила и границы. Карта говорит о необходимости дисциплины и стратегического мышления. Возьмите контроль — но через мудрость, а не силу.",
-         "Тирания, чрезмерный контроль или его полное отсутствие. Вы либо давите на окружающих, либо потеряли власть над ситуацией. Найдите баланс между контролем и гибкостью."),
-
-        ("The Hierophant", "Иерофант", "земля", ["традиция", "обучение", "мудрость"],
-         "Обратитесь к традициям, наставникам, проверенным методам. Это не время для экспериментов — опирайтесь на мудрость предков и учителей. Обучение, духовные практики, следование проверенному пути принесут результат.",
-         "Бунт против правил или слепое следование догмам. Задайтесь вопросом: вы нарушаете правила из мудрости или из упрямства?"),
-
-        ("The Lovers", "Влюблённые", "воздух", ["выбор", "гармония", "отношения"],
-         "Ключевой выбор, который определит ваш путь. Часто связан с отношениями, но может касаться любого важного решения. Выбирайте сердцем, но в согласии с разумом. Гармония противоположностей — ваш ключ.",
-         "Дисгармония в отношениях или внутренний конфликт. Вы разрываетесь между двумя путями. Избегание выбора — тоже выбор, причём худший."),
+DECKS_DB = build_decks.DB_PATH
+# Сколько карт держат значения в памяти (на все колоды вместе)
+MEANINGS_CACHE = 256
 
-        ("The Chariot", "Колесница", "вода", ["победа", "воля", "движение"],
-         "Победа через силу воли и целеустремлённость. Вы контролируете противоположные силы и движетесь вперёд. Не время сомневаться — действуйте решительно. Дорога открыта, но требует концентрации.",
-         "Потеря направления, агрессия или бездействие. Вы потеряли контроль над ситуацией или пытаетесь силой подавить то, что требует мудрости."),
 
-        ("Strength", "Сила", "огонь", ["мужество", "терпение", "внутренняя сила"],
-         "Ваша настоящая сила — не в мускулах, а в терпении и мягкости. Укротите внутреннего зверя через любовь, а не насилие. Мужество проявляется в спокойствии, а не в крике. Вы сильнее, чем думаете.",
-         "Сомнения в себе, слабость или грубая сила. Вы либо не верите в себя, либо пытаетесь решить проблему силой вместо мудрости."),
-
-        ("The Hermit", "Отшельник", "земля", ["самопознание", "одиночество", "мудрость"],
-         "Время уединиться и прислушаться к себе. Ответы не снаружи, а внутри вас. Карта приглашает к медитации, самоанализу, поиску собственного света. Иногда нужно отойти от мира, чтобы увидеть его яснее.",
-         "Избыточная изоляция или страх одиночества. Вы либо отгородились от мира стеной, либо не можете побыть с собой наедине. И то, и другое — проблема."),
-
-        ("Wheel of Fortune", "Колесо Фортуны", "огонь", ["судьба", "цикл", "перемены"],
-         "Жизнь циклична, и сейчас колесо поворачивается. Перемены неизбежны — примите их. Удача на вашей стороне, но помните: что поднялось — может опуститься. Используйте благоприятный момент мудро.",
-         "Сопротивление переменам или полоса неудач. Вы цепляетесь за прошлое, пока мир меняется. Примите новый поворот — он может оказаться к лучшему."),
-
-        ("Justice", "Справедливость", "воздух", ["баланс", "истина", "ответственность"],
-         "Время для честного взгляда на ситуацию. Каждое действие имеет последствия — сейчас они проявятся. Будьте справедливы к себе и другим. Правда выйдет на свет, и решения будут приняты.",
-         "Несправедливость или нежелание видеть правду. Вы обманываете себя или стали жертвой чужой нечестности. Восстановите баланс."),
-
-        ("The Hanged Man", "Повешенный", "вода", ["пауза", "жертва", "новый взгляд"],
-         "Посмотрите на ситуацию с другой стороны — буквально вверх ногами. Иногда нужно отпустить контроль и позволить жизни течь. Пауза — не потеря времени, а инвестиция в понимание. Жертва малого ради большого.",
-         "Бессмысленная жертва или застревание. Вы страдаете без причины или боитесь принять другую точку зрения. Хватит висеть — пора действовать."),
-
-        ("Death", "Смерть", "вода", ["трансформация", "конец", "обновление"],
-         "Конец одного этапа и начало другого. Это не про физическую смерть — это про глубокую трансформацию. Старое умирает, чтобы дать место новому. Отпустите то, что уже мертво — и вы родитесь заново.",
-         "Сопротивление неизбежным переменам. Вы цепляетесь за то, что давно пора отпустить. Страх перемен мешает вашему росту."),
-
-        ("Temperance", "Умеренность", "огонь", ["баланс", "терпение", "гармония"],
-         "Золотая середина — ваш путь сейчас. Не торопитесь, смешивайте, экспериментируйте, но с мерой. Терпение и умеренность принесут лучший результат, чем любая крайность. Гармония тела, ума и духа.",
-         "Дисбаланс и крайности. Вы перегнули палку в чём-то — работе, развлечениях, самокритике. Время вернуться к центру."),
-
-        ("The Devil", "Дьявол", "земля", ["зависимость", "тень", "материализм"],
-         "Посмотрите в лицо своим зависимостям и теневым сторонам. Что держит вас в цепях — привычки, страхи, токсичные отношения? Осознание — первый шаг к освобождению. Цепи слабее, чем кажутся.",
-         "Начало освобождения от зависимости или отрицание проблемы. Вы либо на пороге прорыва, либо отказываетесь видеть свои оковы."),
-
-        ("The Tower", "Башня", "огонь", ["крушение", "озарение", "освобождение"],
-         "Резкое разрушение привычного. Башня, построенная на ложном фундаменте, рушится. Это болезненно, но необходимо. На руинах старого вы построите настоящее. Молния озарения сжигает иллюзии.",
-         "Страх перед переменами удерживает вас в разрушающейся структуре. Чем дольше вы цепляетесь, тем болезненнее будет падение."),
-
-        ("The Star", "Звезда", "воздух", ["надежда", "вдохновение", "исцеление"],
-         "После бури приходит покой. Карта несёт исцеление, надежду и обновление. Звезда указывает путь — доверьтесь ей. Ваши раны заживают, вдохновение возвращается. Мечтайте смело — вселенная слышит.",
-         "Потеря надежды или разочарование. Вы перестали верить в лучшее. Но звезда всё ещё светит — просто поднимите глаза."),
-
-        ("The Moon", "Луна", "вода", ["иллюзия", "страхи", "подсознание"],
-         "Не всё то, чем кажется. Луна освещает лишь часть пути, создавая тени и иллюзии. Ваши страхи могут быть преувеличены. Доверяйте интуиции, но перепроверяйте факты. Время работать с подсознанием.",
-         "Рассеивание иллюзий или усиление тревоги. Правда начинает проступать, и она может быть неприятной. Но лучше горькая правда, чем сладкая ложь."),
-
-        ("The Sun", "Солнце", "огонь", ["радость", "успех", "ясность"],
-         "Самая позитивная карта в колоде! Всё освещено ярким светом — ясность, радость, успех и витальность. Наслаждайтесь моментом, делитесь радостью. Дети, творчество, оптимизм — всё расцветает.",
-         "Временное затмение радости. Свет никуда не делся — просто облака закрыли солнце. Это пройдёт. Ищите простые радости."),
-
-        ("Judgement", "Суд", "огонь", ["возрождение", "призвание", "оценка"],
-         "Момент истины и переоценки всей жизни. Карта зовёт вас к высшему призванию. Услышьте зов — он идёт изнутри. Время подвести итоги, простить себя и других, подняться на новый уровень.",
-         "Глухота к своему призванию или чрезмерная самокритика. Вы игнорируете внутренний зов или наказываете себя за прошлое. Простите — и двигайтесь дальше."),
-
-        ("The World", "Мир", "земля", ["завершение", "целостность", "достижение"],
-         "Цикл завершён. Вы достигли гармонии и целостности. Мир открыт перед вами, и вы заслужили этот момент. Отпразднуйте достижение, прежде чем начать новый цикл. Всё сложилось как нужно.",
-         "Незавершённость или страх завершения. Вы застряли на финишной прямой. Что мешает поставить точку? Завершите начатое — и откроется новый горизонт."),
+class DeckInfo(NamedTuple):
+    id: str
+    name: str
+    name_ru: str
+    reversed_rate: float
+    size: int
+
+
+class DeckRegistry:
+    """Колоды из decks.sqlite (собирается из bot/data/decks/*.json командой
+    python -m bot.data.build_decks; в образе — при сборке).
+
+    База открывается только для чтения и при первом обращении, не при импорте. Индекс карт колоды (имена,
+    масти, ключевые слова) читается при первом get() этой колоды, значения —
+    по одной карте при первом запросе и живут в общем LRU-кэше. Колоды,
+    к которым не обращались, не занимают памяти.
+    """
+
+    def __init__(self, path: Path = DECKS_DB, meanings_cache: int = MEANINGS_CACHE) -> None:
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._info: dict[str, DeckInfo] = {}
+        self._cards: dict[str, tuple[TarotCard, ...]] = {}
+        self.meaning = lru_cache(maxsize=meanings_cache)(self._load_meaning)
+
+    def _query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            if self._conn is None:
+                self._conn = self._connect()
+            return self._conn.execute(sql, params).fetchall()
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self.path.exists():
+            raise FileNotFoundError(f"{self.path} not found, run: python -m bot.data.build_decks")
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+        self._info = {
+            row[0]: DeckInfo(*row)
+            for row in conn.execute("SELECT id, name, name_ru, reversed_rate, size FROM decks ORDER BY position")
+        }
+        return conn
+
+    def available(self) -> list[DeckInfo]:
+        if self._conn is None:
+            self._query("SELECT 1")
+        return list(self._info.values())
+
+    def info(self, deck_id: str) -> DeckInfo:
+        if self._conn is None:
+            self._query("SELECT 1")
+        try:
+            return self._info[deck_id]
+        except KeyError:
+            raise ValueError(f"Unknown deck: {deck_id}") from None
+
+    def get(self, deck_id: str = DEFAULT_DECK) -> tuple[TarotCard, ...]:
+        """Карты колоды по порядку номеров — без значений."""
+        cards = self._cards.get(deck_id)
+        if cards is None:
+            self.info(deck_id)
+            rows = self._query(
+                "SELECT id, name, name_ru, arcana, suit, number, keywords, element"
+                " FROM cards WHERE deck = ? ORDER BY id",
+                (deck_id,),
+            )
+            cards = self._cards[deck_id] = tuple(
+                TarotCard(
+                    id=card_id, name=name, name_ru=name_ru,
+                    arcana=ArcanaType(arcana), suit=Suit(suit), number=number,
+                    keywords=tuple(keywords.split(build_decks.KEYWORD_SEPARATOR)) if keywords else (),
+                    element=element, deck=deck_id,
+                )
+                for card_id, name, name_ru, arcana, suit, number, keywords, element in rows
+            )
+        return cards
+
+    def card(self, card_id: int, deck_id: str = DEFAULT_DECK) -> Optional[TarotCard]:
+        cards = self.get(deck_id)
+        return cards[card_id] if 0 <= card_id < len(cards) else None
+
+    def _load_meaning(self, deck_id: str, card_id: int) -> tuple[str, str]:
+        """(прямое значение, перевёрнутое) одной карты."""
+        rows = self._query("SELECT upright, reversed FROM meanings WHERE deck = ? AND id = ?", (deck_id, card_id))
+        return rows[0] if rows else ("", "")
+
+
+# Глобальный экземпляр; колода раскладов бота и сохранённых раскладов — DEFAULT_DECK
+decks = DeckRegistry()
+
+
+@dataclass(frozen=True)
+class DeckConfig:
+    """Из чего и как тянутся карты: колода, подколода, веса, доля перевёрнутых.
+
+    Конфигурация неизменяема и хешируема — сэмплер для неё строится один
+    раз (sampler_for) и дальше только читается.
+    """
+    deck: str = DEFAULT_DECK
+    arcana: Optional[ArcanaType] = None
+    suits: tuple = ()
+    # Пары (номер карты, вес); у остальных карт подколоды вес 1
+    weights: tuple = ()
+    # None — доля перевёрнутых, заданная колодой
+    reversed_rate: Optional[float] = None
+
+    def cards(self) -> tuple[TarotCard, ...]:
+        return decks.get(self.deck)
+
+    def card_ids(self) -> tuple[int, ...]:
+        return tuple(
+            card.id for card in self.cards()
+            if (self.arcana is None or card.arcana is self.arcana)
+            and (not self.suits or card.suit in self.suits)
+        )
+
+    def reversal_rate(self) -> float:
+        if self.reversed_rate is not None:
+            return self.reversed_rate
+        return decks.info(self.deck).reversed_rate
+
+
+FULL_DECK = DeckConfig()
+MAJOR_ARCANA = DeckConfig(arcana=ArcanaType.MAJOR)
+MINOR_ARCANA = DeckConfig(arcana=ArcanaType.MINOR)
+
+
+def suit_deck(*suits: Suit, reversed_rate: Optional[float] = None, deck: str = DEFAULT_DECK) -> DeckConfig:
+    return DeckConfig(deck=deck, suits=tuple(suits), reversed_rate=reversed_rate)
+
+
+@lru_cache(maxsize=None)
+def sampler_for(config: DeckConfig) -> IndexSampler:
+    """Номера карт подколоды и алиас-таблица — один раз на конфигурацию."""
+    ids = config.card_ids()
+    if not ids:
+        raise ValueError(f"Empty deck: {config}")
+    if not config.weights:
+        return IndexSampler(ids)
+    weights = dict(config.weights)
+    return IndexSampler(ids, [weights.get(card_id, 1.0) for card_id in ids])
+
+
+def _draw(
+    config: DeckConfig,
+    count: int,
+    rnd,
+    allow_reversed: bool = True,
+    exclude=None,
+) -> list[DrawnCard]:
+    """Карты по конфигурации: номер карты, затем rnd() на переворот — по очереди."""
+    cards = config.cards()
+    rate = config.reversal_rate()
+    drawn = []
+    if count <= 0:
+        return drawn
+    for idx in sampler_for(config).iter_sample(rnd, exclude):
+        # Бросок на переворот делается всегда: allow_reversed не должен сдвигать
+        # поток rnd(), иначе карты по зерну разойдутся с replay_spread
+        reversed_ = rnd() < rate
+        drawn.append(DrawnCard(cards[idx], allow_reversed and reversed_))
+        if len(drawn) == count:
+            break
+    return drawn
+
+
+# Версия колоды и алгоритма вытягивания: по (seed, DECK_VERSION) расклад
+# повторяется точно. Изменение порядка карт или доли перевёрнутых в
+# decks/rws.json, порядка вызовов rnd() в _draw/IndexSampler требует новой версии,
+# иначе старые расклады «перетасуются».
+DECK_VERSION = 1
+
+
+def new_seed() -> int:
+    """Зерно расклада — помещается в знаковый BIGINT."""
+    return secrets.randbits(63)
+
+
+def _seeded_draw(
+    seed: int,
+    count: int,
+    allow_reversed: bool = True,
+    config: DeckConfig = FULL_DECK,
+) -> list[DrawnCard]:
+    """Расклад на random.Random(seed).
+
+    Берётся только Random.random(): его последовательность для заданного
+    зерна одинакова во всех версиях Python, в отличие от sample()/randrange().
+    """
+    return _draw(config, count, random.Random(seed).random, allow_reversed)
+
+
+# Карта расклада в БД — uint16: номер карты (7 бит), перевёрнута (1 бит),
+# номер позиции в раскладе (8 бит). Тексты берутся из колоды при чтении.
+_REVERSED_BIT = 0x80
+_CARD_MASK = 0x7F
+_POSITION_SHIFT = 8
+
+
+def pack_cards(cards: list[DrawnCard]) -> bytes:
+    """Расклад в байты: по два байта на карту, позиция — порядковый номер."""
+    return struct.pack(
+        f"<{len(cards)}H",
+        *(card.id | (_REVERSED_BIT if card.reversed else 0) | i << _POSITION_SHIFT
+          for i, card in enumerate(cards)),
+    )
+
+
+def unpack_cards(data: bytes) -> list[tuple[int, DrawnCard]]:
+    """Пары (номер позиции, карта) из сохранённого расклада."""
+    codes = struct.unpack(f"<{len(data) // 2}H", data)
+    cards = decks.get(DEFAULT_DECK)
+    return [
+        (code >> _POSITION_SHIFT, DrawnCard(cards[code & _CARD_MASK], bool(code & _REVERSED_BIT)))
+        for code in codes
     ]
 
-    for i, (n, nr, el, kw, mu, mr) in enumerate(major):
-        cards.append(TarotCard(
-            id=cid, name=n, name_ru=nr, arcana=ArcanaType.MAJOR,
-            suit=Suit.NONE, number=i, keywords=kw, element=el,
-            meaning_upright=mu, meaning_reversed=mr,
-        ))
-        cid += 1
-
-    # Младшие арканы
-    suit_el = {Suit.WANDS: "огонь", Suit.CUPS: "вода", Suit.SWORDS: "воздух", Suit.PENTACLES: "земля"}
-    num_names = {
-        1:("Ace","Туз"),2:("Two","Двойка"),3:("Three","Тройка"),
-        4:("Four","Четвёрка"),5:("Five","Пятёрка"),6:("Six","Шестёрка"),
-        7:("Seven","Семёрка"),8:("Eight","Восьмёрка"),9:("Nine","Девятка"),
-        10:("Ten","Десятка"),11:("Page","Паж"),12:("Knight","Рыцарь"),
-        13:("Queen","Королева"),14:("King","Король"),
-    }
-
-    minor_meanings = {
-        Suit.WANDS: {
-            1: ("Вспышка вдохновения! Новая идея, проект или страсть. Мощная творческая энергия требует немедленного действия.", "Задержка, ложный старт. Энергия есть, но направление неясно."),
-            2: ("Планирование и выбор направления. Мир в ваших руках — решите, куда направить энергию.", "Нерешительность и страх выбора. Не ждите идеального момента."),
-            3: ("Расширение горизонтов. Ваши усилия начинают приносить плоды, открываются новые возможности.", "Препятствия на пути роста. Пересмотрите стратегию."),
-            4: ("Праздник, стабильность, домашний уют. Фундамент создан — наслаждайтесь результатом.", "Незавершённость мешает отдыху. Доделайте дела."),
-            5: ("Конфликт и конкуренция. Борьба закаляет, но не теряйте из виду главную цель.", "Избегание конфликта или поиск компромисса."),
-            6: ("Победа и признание! Ваши усилия вознаграждены. Публичный успех.", "Задержка признания. Успех придёт, но позже."),
-            7: ("Защита позиций. Стойте на своём, несмотря на давление. У вас есть преимущество.", "Отступление или сдача позиций. Пересмотрите, за что стоит бороться."),
-            8: ("Стремительное движение вперёд. События ускоряются, новости приходят быстро.", "Задержки и торможение. Терпение — скоро всё сдвинется."),
-            9: ("Стойкость и выносливость. Последний рубеж перед победой — не сдавайтесь!", "Усталость и паранойя. Вы несёте слишком много — попросите помощи."),
-            10: ("Перегрузка ответственностью. Вы взвалили на себя слишком много — делегируйте.", "Сброс лишнего груза. Начинается облегчение."),
-            11: ("Энтузиаст с горящими глазами. Новая идея, творческий порыв. Действуйте!", "Незрелость, импульсивность. Подумайте прежде чем прыгать."),
-            12: ("Энергия, приключение, смелое движение. Будьте дерзки — фортуна любит смелых!", "Спешка без направления. Куда вы так торопитесь?"),
-            13: ("Тёплая, уверенная, творческая энергия. Лидерство через вдохновение.", "Ревность или подавление чужого творчества."),
-            14: ("Визионер и лидер. Стратегическое мышление, харизма, масштабные планы.", "Деспотизм или нереалистичные ожидания."),
-        },
-        Suit.CUPS: {
-            1: ("Новое чувство, эмоциональное начало. Любовь, дружба, творческое вдохновение из глубины души.", "Эмоциональная блокировка. Сердце закрыто — позвольте себе чувствовать."),
-            2: ("Взаимность и партнёрство. Глубокая связь между двумя людьми. Гармония в отношениях.", "Дисбаланс в отношениях. Один даёт больше, чем получает."),
-            3: ("Праздник, дружба, радость. Время отмечать с близкими. Творческое сотрудничество.", "Перебор с удовольствиями или поверхностные связи."),
-            4: ("Эмоциональный застой и скука. Вы не видите то хорошее, что уже есть. Откройте глаза.", "Пробуждение от апатии. Новая мотивация."),
-            5: ("Потеря и разочарование. Сосредоточьтесь на том, что осталось — не всё потеряно.", "Принятие потери и движение дальше. Исцеление."),
-            6: ("Ностальгия и детские воспоминания. Возвращение к истокам приносит утешение.", "Застревание в прошлом. Пора идти вперёд."),
-            7: ("Иллюзии и фантазии. Красивые мечты, но какие из них реальны? Выберите одну.", "Возвращение к реальности. Время действовать, а не мечтать."),
-            8: ("Уход от ситуации. Мужество оставить привычное ради неизвестного лучшего.", "Страх перемен удерживает вас на месте."),
-            9: ("Исполнение желаний! Эмоциональное удовлетворение и довольство жизнью.", "Неблагодарность или завышенные ожидания."),
-            10: ("Полная гармония в семье и отношениях. Счастье, любовь, эмоциональная полнота.", "Семейные конфликты или идеализация отношений."),
-            11: ("Нежное чувство, творческий порыв, романтическое послание.", "Эмоциональная незрелость или несбывшиеся мечты."),
-            12: ("Романтический рыцарь. Следуйте за сердцем, предложение или приглашение.", "Непостоянство чувств, капризность."),
-            13: ("Глубокая интуиция и эмоциональная мудрость. Доверьтесь своим чувствам.", "Эмоциональная манипуляция или зависимость."),
-            14: ("Эмоциональная зрелость и мудрость. Баланс между чувствами и разумом.", "Эмоциональная холодность или подавление чувств."),
-        },
-        Suit.SWORDS: {
-            1: ("Прорыв истины! Ясность ума, новая идея, интеллектуальная победа.", "Ложная идея или злоупотребление интеллектом."),
-            2: ("Тупик и необходимость выбора. Снимите повязку с глаз — информация есть.", "Перегрузка информацией. Упростите решение."),
-            3: ("Боль и разбитое сердце. Болезненная правда лучше сладкой лжи. Примите и исцеляйтесь.", "Начало исцеления. Острая боль уходит."),
-            4: ("Отдых и восстановление. Вашему уму нужна пауза. Медитируйте, спите, восстанавливайтесь.", "Беспокойство нарушает покой. Научитесь отключаться."),
-            5: ("Конфликт и поражение. Не все битвы стоит выигрывать. Какой ценой досталась победа?", "Конец конфликта, примирение. Время зализать раны."),
-            6: ("Переход к лучшему. Вы оставляете трудности позади. Дорога может быть непростой, но направление — верное.", "Застревание в трудной ситуации. Решитесь на перемены."),
-            7: ("Хитрость и стратегия. Действуйте умно, но честно. Не все методы оправданы.", "Обман раскрыт или угрызения совести."),
-            8: ("Ментальная ловушка. Вы сами создали свою тюрьму из мыслей. Выход есть — измените мышление.", "Освобождение от ограничивающих убеждений."),
-            9: ("Тревога и бессонница. Страхи кажутся огромными в темноте. Дождитесь рассвета — всё не так страшно.", "Страхи отступают. Свет в конце тоннеля."),
-            10: ("Дно. Хуже уже не будет — а значит, впереди только подъём. Конец страданий близок.", "Медленное восстановление. Самое тяжёлое позади."),
-            11: ("Любопытство и жажда правды. Расследуйте, изучайте, задавайте вопросы.", "Сплетни, шпионство, злые языки."),
-            12: ("Быстрые решения и действия. Режьте узлы — не время для раздумий.", "Поспешность и грубость. Притормозите."),
-            13: ("Острый ум и проницательность. Вы видите суть вещей насквозь.", "Холодность и жестокость слов. Слова ранят."),
-            14: ("Интеллектуальная власть и справедливость. Решения на основе логики и этики.", "Тирания разума. Не всё можно решить головой."),
-        },
-        Suit.PENTACLES: {
-            1: ("Новая финансовая возможность! Начало прибыльного дела. Посадите семя — оно вырастет.", "Упущенная возможность или плохие инвестиции."),
-            2: ("Баланс финансов, жонглирование ресурсами. Гибкость в управлении деньгами.", "Финансовый дисбаланс. Расставьте приоритеты."),
-            3: ("Мастерство и работа в команде. Ваши навыки признаны и востребованы.", "Посредственность или конфликты на работе."),
-            4: ("Финансовая стабильность и контроль. Но не путайте бережливость с жадностью.", "Скупость или расточительность. Найдите баланс."),
-            5: ("Финансовые трудности или ощущение потери. Помощь рядом — попросите.", "Выход из кризиса. Худшее позади."),
-            6: ("Щедрость и обмен ресурсами. Давайте и получайте с благодарностью.", "Долги или неравный обмен. Кто-то берёт больше."),
-            7: ("Терпение и долгосрочные инвестиции. Результат не сразу, но он будет.", "Нетерпение, желание быстрых денег."),
-            8: ("Мастерство и совершенствование. Оттачивайте навыки — они ваш главный капитал.", "Рутина и отсутствие роста. Учитесь новому."),
-            9: ("Материальное изобилие и наслаждение жизнью. Вы заслужили комфорт.", "Зависимость от материального или одиночество в роскоши."),
-            10: ("Финансовая безопасность, семейное благополучие. Наследие и стабильность.", "Семейные споры о деньгах или потеря наследства."),
-            11: ("Студент, ученик. Новые навыки, обучение, стажировка. Инвестируйте в знания.", "Лень в учёбе или нереалистичные планы."),
-            12: ("Надёжный исполнитель. Методичное движение к цели.", "Застой, скука, отсутствие прогресса."),
-            13: ("Практичная роскошь и комфорт. Умение создавать уют и благополучие.", "Зависимость от комфорта, лень."),
-            14: ("Финансовый мастер. Мудрое управление ресурсами, успех в бизнесе.", "Жадность или финансовые потери из-за самоуверенности."),
-        },
-    }
-
-    for suit in [Suit.WANDS, Suit.CUPS, Suit.SWORDS, Suit.PENTACLES]:
-        sn = SUIT_NAMES[suit]
-        for num in range(1, 15):
-            en, ru = num_names[num]
-            mu, mr = minor_meanings.get(suit, {}).get(num, ("", ""))
-            cards.append(TarotCard(
-                id=cid, name=f"{en} of {suit.value.title()}",
-                name_ru=f"{ru} {sn}",
-                arcana=ArcanaType.MINOR, suit=suit,
-                number=num, keywords=[], element=suit_el[suit],
-                meaning_upright=mu, meaning_reversed=mr,
-            ))
-            cid += 1
-    return cards
-
-
-DECK = _build_deck()
-CARD_BY_ID = {c.id: c for c in DECK}
-
 
 class TarotDeck:
     @staticmethod
-    def draw_cards(count: int, allow_reversed: bool = True, exclude=None) -> list[TarotCard]:
-        available = [c for c in DECK if (exclude is None or c.id not in exclude)]
-        chosen = random.sample(available, min(count, len(available)))
-        result = []
-        for card in chosen:
-            rev = allow_reversed and random.random() < 0.3
-            result.append(TarotCard(
-                id=card.id, name=card.name, name_ru=card.name_ru,
-                arcana=card.arcana, suit=card.suit, number=card.number,
-                keywords=card.keywords, element=card.element,
-                meaning_upright=card.meaning_upright,
-                meaning_reversed=card.meaning_reversed,
-                reversed=rev,
-            ))
-        return result
+    def draw_cards(
+        count: int,
+        allow_reversed: bool = True,
+        exclude=None,
+        config: DeckConfig = FULL_DECK,
+    ) -> list[DrawnCard]:
+        return _draw(config, count, random.random, allow_reversed, exclude)
 
     @staticmethod
     def get_card_by_id(card_id: int) -> Optional[TarotCard]:
-        return CARD_BY_ID.get(card_id)
+        return decks.card(card_id)
 
     @staticmethod
-    def do_spread(spread_type: str, allow_reversed: bool = True) -> dict:
+    def do_spread(spread_type: str, allow_reversed: bool = True, seed: Optional[int] = None) -> dict:
+        """Расклад по зерну; без зерна берётся новое. Зерно и версия колоды — в ответе."""
         spread = SPREADS.get(spread_type)
         if not spread:
             raise ValueError(f"Unknown spread: {spread_type}")
-        drawn = TarotDeck.draw_cards(spread["cards_count"], allow_reversed)
+        if seed is None:
+            seed = new_seed()
+        drawn = _seeded_draw(seed, spread["cards_count"], allow_reversed)
         return {
             "spread": spread,
             "cards": [{"position": spread["positions"][i], "card": card} for i, card in enumerate(drawn)],
+            "seed": seed,
+            "deck_version": DECK_VERSION,
         }
 
+    @staticmethod
+    def replay_spread(spread_type: str, seed: int, deck_version: int) -> dict:
+        """Тот же расклад, что был выдан по этому зерну."""
+        if deck_version != DECK_VERSION:
+            raise ValueError(f"Unknown deck version: {deck_version}")
+        return TarotDeck.do_spread(spread_type, seed=seed)
+
+    @staticmethod
+    def reading_cards(reading) -> list[dict]:
+        """Карты сохранённого TarotReading: по зерну, у старых записей — из cards."""
+        if reading.seed is not None:
+            return TarotDeck.replay_spread(reading.spread_type, reading.seed, reading.deck_version)["cards"]
+        return TarotDeck.restore_spread(reading.spread_type, reading.cards)
+
+    @staticmethod
+    def restore_spread(spread_type: str, data: bytes) -> list[dict]:
+        """Карты упакованного расклада в том же виде, что и do_spread()["cards"]."""
+        positions = SPREADS.get(spread_type, {}).get("positions", [])
+        return [
+            {"position": positions[idx] if idx < len(positions) else "", "card": card}
+            for idx, card in unpack_cards(data)
+        ]
+
     @staticmethod
     def format_spread_text(spread_result: dict) -> str:
-        spread = spread_result["spread"]
-        lines = [f"🃏 <b>{spread['name_ru']}</b>\n"]
-
-        for item in spread_result["cards"]:
-            card = item["card"]
-            position = item["position"]
-            rev_text = " (перевёрнутая)" if card.reversed else ""
-            kw = ", ".join(card.keywords) if card.keywords else ""
-
-            lines.append(f"━━━━━━━━━━━━━━━")
-            lines.append(f"<b>{position}:</b> {card.display_name}{rev_text}")
-            if kw:
-                lines.append(f"🔑 <i>{kw}</i>")
-            lines.append("")
-
-            meaning = card.get_meaning()
-            if meaning:
-                lines.append(f"💬 {meaning}")
-            lines.append("")
-
-        return "\n".join(lines)
+        # Фрагменты собираются из колоды этого модуля — импорт по месту
+        from bot.services.tarot_render import render_list
+        return render_list(spread_result)
 
 
 tarot = TarotDeck()
@@ -0,0 +1,72 @@
+"""Готовые HTML-фрагменты карт для текстов раскладов.
+
+Блок карты в раскладе зависит только от карты, её положения и стиля
+позиции («Прошлое — …», «Вариант А — …», строка списка с ключевыми
+словами и значением). Блоки карты собираются один раз, при первом её
+появлении в раскладе, — дальше рендер сводится к подстановке нескольких
+готовых строк в шаблон. Значения карт при импорте не читаются.
+"""
+
+from bot.services.tarot import SPREADS, DrawnCard, decks
+from bot.utils.personalization import TAROT_CARD_BLOCKS, get_card_story
+
+LIST = "list"
+REVERSED_MARK = " (перевёрнутая)"
+_SEPARATOR = "━━━━━━━━━━━━━━━"
+
+
+def _list_block(card: DrawnCard) -> str:
+    """Карта в списке format_spread_text — всё, что идёт после «<b>Позиция:</b> »."""
+    lines = [f"{card.display_name}{REVERSED_MARK if card.reversed else ''}"]
+    if card.keywords:
+        lines.append(f"🔑 <i>{', '.join(card.keywords)}</i>")
+    lines.append("")
+    meaning = card.get_meaning()
+    if meaning:
+        lines.append(f"💬 {meaning}")
+    lines.append("")
+    return "\n".join(lines)
+
+
+class _Fragments(dict):
+    """(колода, номер карты, перевёрнута, стиль) → блок; карта собирается при первом промахе."""
+
+    def __missing__(self, key: tuple[str, int, bool, str]) -> str:
+        deck_id, card_id, reversed_, style = key
+        if style != LIST and style not in TAROT_CARD_BLOCKS:
+            raise KeyError(key)
+        self._build(DrawnCard(decks.get(deck_id)[card_id], reversed_))
+        return self[key]
+
+    def _build(self, drawn: DrawnCard) -> None:
+        card, reversed_ = drawn.card, drawn.reversed
+        story = get_card_story(card.name_ru, reversed_)
+        mark = REVERSED_MARK if reversed_ else ""
+        for style, block in TAROT_CARD_BLOCKS.items():
+            self[card.deck, card.id, reversed_, style] = block.format(card=card.name_ru, reversed=mark, story=story)
+        self[card.deck, card.id, reversed_, LIST] = _list_block(drawn)
+
+
+FRAGMENTS = _Fragments()
+# Разделитель и заголовок позиции перед блоком карты в списке
+_LIST_HEADERS = {
+    position: f"{_SEPARATOR}\n<b>{position}:</b> "
+    for spread in SPREADS.values()
+    for position in spread["positions"]
+}
+
+
+def card_block(card: DrawnCard, style: str) -> str:
+    deck_card = card.card
+    return FRAGMENTS[deck_card.deck, deck_card.id, card.reversed, style]
+
+
+def render_list(spread_result: dict) -> str:
+    """Расклад списком: позиция, карта, ключевые слова, значение."""
+    parts = [f"🃏 <b>{spread_result['spread']['name_ru']}</b>\n"]
+    for item in spread_result["cards"]:
+        drawn, position = item["card"], item["position"]
+        card = drawn.card
+        header = _LIST_HEADERS.get(position) or f"{_SEPARATOR}\n<b>{position}:</b> "
+        parts.append(header + FRAGMENTS[card.deck, card.id, drawn.reversed, LIST])
+    return "\n".join(parts)
@@ -0,0 +1,118 @@
+"""Часовые пояса для момента рождения.
+
+Координаты → IANA-зона: ближайший город из встроенного справочника GeoNames
+(у каждой записи есть своя зона) через сеточный индекс 1°×1°. Смещение от UTC
+с историческими правилами и летним временем берётся из zoneinfo и
+запоминается по (зона, дата), так что повторные расчёты ничего не стоят.
+"""
+
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from bot.services.geocoder import geocoder
+
+# Сколько колец соседних клеток просматривать, прежде чем сдаться
+MAX_RING = 5
+
+
+class TimezoneResolver:
+    """Поиск IANA-зоны по координатам и расчёт исторических смещений."""
+
+    def __init__(self) -> None:
+        self._grid: Optional[dict[tuple[int, int], np.ndarray]] = None
+
+    def _build_grid(self) -> dict[tuple[int, int], np.ndarray]:
+        geocoder.load()
+        cells: dict[tuple[int, int], list[int]] = {}
+        lat_cells = np.floor(geocoder.latitudes).astype(int)
+        lon_cells = np.floor(geocoder.longitudes).astype(int)
+        for idx, cell in enumerate(zip(lat_cells.tolist(), lon_cells.tolist())):
+            cells.setdefault(cell, []).append(idx)
+        return {cell: np.array(ids, dtype=np.int32) for cell, ids in cells.items()}
+
+    def zone_for(self, lat: float, lon: float) -> str:
+        """IANA-зона для точки (с точностью ~1 км — координаты округляются)."""
+        return self._zone_for(round(lat, 2), round(lon, 2))
+
+    @lru_cache(maxsize=4096)
+    def _zone_for(self, lat: float, lon: float) -> str:
+        if self._grid is None:
+            self._grid = self._build_grid()
+
+        base_lat, base_lon = int(np.floor(lat)), int(np.floor(lon))
+        for ring in range(MAX_RING + 1):
+            ids = self._ring(base_lat, base_lon, ring)
+            if not ids:
+                continue
+            # Ближайший город может лежать в следующем кольце клеток,
+            # даже если в текущем кто-то нашёлся
+            ids.extend(self._ring(base_lat, base_lon, ring + 1))
+            candidates = np.concatenate(ids)
+            dlat = geocoder.latitudes[candidates] - lat
+            dlon = ((geocoder.longitudes[candidates] - lon + 180) % 360 - 180) * np.cos(np.radians(lat))
+            nearest = candidates[np.argmin(dlat * dlat + dlon * dlon)]
+            return geocoder.timezone_of(int(nearest))
+
+        # Открытое море — поясное время по долготе
+        hours = int(round(lon / 15))
+        return "Etc/GMT" + (f"{-hours:+d}" if hours else "")
+
+    def _ring(self, base_lat: int, base_lon: int, ring: int) -> list[np.ndarray]:
+        out = []
+        for dlat in range(-ring, ring + 1):
+            for dlon in range(-ring, ring + 1):
+                if max(abs(dlat), abs(dlon)) != ring:
+                    continue
+                cell = (base_lat + dlat, (base_lon + dlon + 180) % 360 - 180)
+                if cell in self._grid:
+                    out.append(self._grid[cell])
+        return out
+
+    def utc_offset(self, zone: str, day: date, hour: int = 12, minute: int = 0) -> timedelta:
+        """Смещение местного времени от UTC на дату и время."""
+        start, end = _day_offsets(zone, day)
+        if start == end:
+            return start
+        # День перехода на летнее/зимнее время — считаем точно
+        local = datetime(day.year, day.month, day.day, hour, minute, tzinfo=ZoneInfo(zone))
+        return local.utcoffset()
+
+    def to_utc(self, local: datetime, lat: float, lon: float) -> datetime:
+        """Местное время в точке → наивный datetime в UTC."""
+        zone = self.zone_for(lat, lon)
+        offset = self.utc_offset(zone, local.date(), local.hour, local.minute)
+        return local - offset
+
+
+@lru_cache(maxsize=16384)
+def _day_offsets(zone: str, day: date) -> tuple[timedelta, timedelta]:
+    """Смещения в начале и в конце суток — совпадают во все дни, кроме перевода часов."""
+    tz = ZoneInfo(zone)
+    start = datetime(day.year, day.month, day.day, tzinfo=tz)
+    end = datetime(day.year, day.month, day.day, 23, 59, tzinfo=tz)
+    return start.utcoffset(), end.utcoffset()
+
+
+def birth_moment_utc(
+    birth_date: date,
+    birth_time: Optional[str],
+    latitude: float,
+    longitude: float,
+) -> datetime:
+    """Момент рождения в UTC; без времени — местный полдень."""
+    hour, minute = 12, 0
+    if birth_time:
+        try:
+            hour, minute = map(int, birth_time.split(":"))
+        except ValueError:
+            pass
+    local = datetime(birth_date.year, birth_date.month, birth_date.day, hour, minute)
+    return tz_resolver.to_utc(local, latitude, longitude)
+
+
+# Глобальный экземпляр
+tz_resolver = TimezoneResolver()
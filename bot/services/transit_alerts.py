@@ -0,0 +1,152 @@
+"""Ночная рассылка точных транзитов по всей базе пользователей.
+
+Натальные долготы читаются страницами по ключу profiles.id (keyset, без
+OFFSET) и для каждой страницы аспекты ищутся сразу для всех пользователей
+массивом users × планеты × натальные точки. Окно — сутки от момента
+запуска, все попадания пользователя собираются в одно сообщение.
+"""
+
+import html
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, List, Tuple
+
+import numpy as np
+import structlog
+from redis.asyncio import Redis
+from sqlalchemy import select
+
+from bot.database import ChartCache, Profile, User, async_session
+from bot.services.astrology_engine import CHART_POINTS, PLANET_NAMES, unpack_longitudes_many
+from bot.services.notifications import enqueue_many
+from bot.services.sky import sky
+from bot.services.transits import ASPECTS, ASPECT_THEMES, NATAL_RU, PLANETS_RU
+
+logger = structlog.get_logger()
+
+PAGE_SIZE = 10_000
+# Луна проходит все аспекты за месяц — для рассылки слишком шумно
+ALERT_PLANETS = np.array([i for i, name in enumerate(PLANET_NAMES) if name != "Moon"])
+# Транзитов в одном сообщении, остальные — одной строкой «и ещё N»
+MAX_ALERT_LINES = 3
+ALERT_WINDOW = timedelta(hours=24)
+
+
+def find_exact_hits(
+    natal: np.ndarray,
+    lons_start: np.ndarray,
+    lons_end: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Аспекты, которые становятся точными между началом и концом окна.
+
+    natal — (users, 11), lons_* — (планеты,). Отклонение от угла аспекта
+    g = (транзит − натал − угол) меняет знак за окно, только если в начале
+    окна оно лежит в интервале [lo, lo + |Δ|], где Δ — ход планеты за окно.
+    Так каждый аспект сводится к двум сравнениям без деления по модулю.
+    Возвращает индексы (пользователь, планета, натальная точка, аспект).
+    """
+    delta = (lons_end - lons_start + 180.0) % 360.0 - 180.0
+    lo = np.minimum(0.0, -delta)
+    width = np.abs(delta).astype(np.float32)[None, :, None]
+
+    # Разница долгот в [0, 360) — считается один раз на страницу
+    d0 = ((lons_start[None, :, None] - natal[:, None, :]) % 360.0).astype(np.float32)
+
+    found = []
+    for k, (_, angle, _, _, _) in enumerate(ASPECTS):
+        # Соединение и оппозиция — одна точка круга, остальные — две (±угол)
+        for side in ((1.0,) if angle in (0.0, 180.0) else (1.0, -1.0)):
+            start = ((side * angle + lo) % 360.0).astype(np.float32)[None, :, None]
+            end = start + width
+            exact = (d0 >= start) & (d0 <= end)
+            exact |= d0 <= end - 360.0
+            u, p, n = np.nonzero(exact)
+            found.append((u, p, n, np.full(u.shape, k)))
+
+    return tuple(np.concatenate(parts) for parts in zip(*found))
+
+
+async def _iter_pages(page_size: int) -> AsyncIterator[list]:
+    """Страницы (profile_id, имя, telegram_id, долготы) по возрастанию profile_id."""
+    last_id = 0
+    while True:
+        async with async_session() as session:
+            result = await session.execute(
+                select(
+                    Profile.id,
+                    Profile.current_name,
+                    Profile.birth_name,
+                    User.telegram_id,
+                    ChartCache.packed,
+                )
+                .join(ChartCache, ChartCache.user_id == Profile.user_id)
+                .join(User, User.id == Profile.user_id)
+                .where(
+                    Profile.id > last_id,
+                    User.subscription_type.in_(("premium", "expert")),
+                )
+                .order_by(Profile.id)
+                .limit(page_size)
+            )
+            rows = result.all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def _alert_line(planet: int, natal: int, aspect: int) -> str:
+    _, _, _, aspect_ru, nature = ASPECTS[aspect]
+    return (
+        f"• {PLANETS_RU[PLANET_NAMES[planet]]} — {aspect_ru} "
+        f"к {NATAL_RU[CHART_POINTS[natal]]}: {ASPECT_THEMES[nature]}"
+    )
+
+
+def _alert_text(name: str, hits: List[Tuple[int, int, int]]) -> str:
+    """Одно сообщение на пользователя: сначала медленные планеты, не больше MAX_ALERT_LINES."""
+    # В PLANET_NAMES планеты идут от быстрых к медленным — медленные важнее
+    hits = sorted(hits, key=lambda hit: (-hit[0], hit[1], hit[2]))
+    lines = [_alert_line(*hit) for hit in hits[:MAX_ALERT_LINES]]
+    if len(hits) > MAX_ALERT_LINES:
+        lines.append(f"• и ещё {len(hits) - MAX_ALERT_LINES}")
+    title = "точный транзит" if len(hits) == 1 else "точные транзиты"
+    return (
+        f"🔭 <b>{html.escape(name)}, в ближайшие сутки {title}</b>\n\n"
+        + "\n".join(lines)
+        + "\n\nПодробнее — в разделе «Астрология» → «Транзиты на сегодня»."
+    )
+
+
+async def run_transit_alerts(redis: Redis, page_size: int = PAGE_SIZE) -> int:
+    """Находит транзиты, точные в ближайшие сутки, и ставит уведомления в очередь."""
+    now = datetime.now(timezone.utc)
+    lons_start, _ = await sky.positions(now)
+    lons_end, _ = await sky.positions(now + ALERT_WINDOW)
+    lons_start = lons_start[ALERT_PLANETS]
+    lons_end = lons_end[ALERT_PLANETS]
+
+    total_users = 0
+    total_alerts = 0
+    async for rows in _iter_pages(page_size):
+        natal = unpack_longitudes_many(row[4] for row in rows)
+        users, planets, points, aspects = find_exact_hits(natal, lons_start, lons_end)
+
+        # Попадания группируются по чату: одно сообщение на пользователя
+        hits = defaultdict(list)
+        for u, p, n, k in zip(users, planets, points, aspects):
+            hits[int(u)].append((int(ALERT_PLANETS[p]), int(n), int(k)))
+
+        notifications = []
+        for u, user_hits in hits.items():
+            _, current_name, birth_name, telegram_id, _ = rows[u]
+            notifications.append({
+                "chat_id": telegram_id,
+                "text": _alert_text(current_name or birth_name or "Друг", user_hits),
+            })
+
+        total_users += len(rows)
+        total_alerts += await enqueue_many(redis, notifications)
+
+    logger.info("Transit alerts queued", users=total_users, alerts=total_alerts)
+    return total_alerts
@@ -0,0 +1,350 @@
+"""Календарь месяца — точные даты транзитов, смен знаков и фаз Луны.
+
+Эфемериды месяца считаются один раз на всех: положения и скорости планет
+с шагом 6 часов. События ищутся векторно — цель (угол аспекта, граница
+знака, фаза) попадает между соседними отсчётами, — а точное время
+находится методом Ньютона на кубическом эрмитовом сплайне по положениям
+и скоростям на концах шага. Календарь пользователя хранится в Redis
+до конца месяца; в начале месяца фоновая задача заранее считает его для
+всех подписчиков.
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import List, Optional
+
+import numpy as np
+import structlog
+from redis.asyncio import Redis
+from sqlalchemy import select
+
+from bot.database import ChartCache, User, async_session
+from bot.services import ephemeris
+from bot.services.astrology_engine import (
+    CHART_POINTS,
+    PLANET_NAMES,
+    SIGN_ORDER,
+    astrology,
+    unpack_longitudes_many,
+)
+from bot.services.transits import ASPECTS, NATAL_RU, PLANETS_RU
+
+logger = structlog.get_logger()
+
+STEP_HOURS = 6
+CALENDAR_TTL = 40 * 86400
+PAGE_SIZE = 5_000
+# Сколько пользователей обрабатывать одним тензором
+USER_CHUNK = 64
+
+MOON = PLANET_NAMES.index("Moon")
+SUN = PLANET_NAMES.index("Sun")
+# Луна даёт аспекты каждые пару часов — в календарь идут остальные планеты
+EVENT_PLANETS = np.array([i for i in range(len(PLANET_NAMES)) if i != MOON])
+
+# Цели аспектов: смещение от натальной точки и номер аспекта в ASPECTS
+_TARGETS = [(0.0, 0)]
+for _k, (_, _angle, _, _, _) in enumerate(ASPECTS[1:-1], start=1):
+    _TARGETS += [(_angle, _k), (-_angle, _k)]
+_TARGETS.append((180.0, len(ASPECTS) - 1))
+TARGET_OFFSETS = np.array([t[0] for t in _TARGETS])
+TARGET_ASPECTS = np.array([t[1] for t in _TARGETS])
+
+PHASES = (
+    (0.0, "🌑 Новолуние"),
+    (90.0, "🌓 Первая четверть"),
+    (180.0, "🌕 Полнолуние"),
+    (270.0, "🌗 Последняя четверть"),
+)
+# Новолуние или полнолуние ближе этого к натальной точке — личное событие
+PHASE_ORB = 5.0
+
+
+@dataclass
+class MonthSky:
+    """Эфемериды месяца с запасом в один шаг по краям."""
+    start: datetime
+    end: datetime
+    jd: np.ndarray
+    lons: np.ndarray
+    speeds: np.ndarray
+
+
+def _wrap(x: np.ndarray) -> np.ndarray:
+    return (x + 180.0) % 360.0 - 180.0
+
+
+@lru_cache(maxsize=3)
+def month_sky(year: int, month: int) -> MonthSky:
+    """Положения планет на месяц с шагом STEP_HOURS (общие для всех)."""
+    start = datetime(year, month, 1)
+    end = datetime(year + month // 12, month % 12 + 1, 1)
+    step = STEP_HOURS / 24
+    jd = np.arange(
+        ephemeris.julian_day(start) - step,
+        ephemeris.julian_day(end) + step + 1e-9,
+        step,
+    )
+    lons, speeds = astrology.positions_series(jd)
+    return MonthSky(start=start, end=end, jd=jd, lons=lons, speeds=speeds)
+
+
+def _crossings(g: np.ndarray) -> tuple:
+    """Индексы отсчётов, между которыми g проходит через ноль (без скачков ±180)."""
+    g0, g1 = g[:-1], g[1:]
+    hit = (np.sign(g0) != np.sign(g1)) & (np.abs(g1 - g0) < 90.0) & (g1 != 0)
+    return np.nonzero(hit)
+
+
+def _root(g0: np.ndarray, dg: np.ndarray, m0: np.ndarray, m1: np.ndarray) -> np.ndarray:
+    """Доля шага, где кубический эрмитов сплайн отклонения проходит через ноль.
+
+    g0 — отклонение в начале шага, dg — его изменение за шаг, m0/m1 — скорости
+    на концах (в градусах за шаг). Старт — линейная интерполяция, затем
+    несколько шагов Ньютона по сплайну; новых вызовов эфемерид не нужно.
+    """
+    t = np.clip(g0 / np.where(dg == 0, 1, -dg), 0.0, 1.0)
+    for _ in range(3):
+        t2, t3 = t * t, t * t * t
+        value = (g0 + (3 * t2 - 2 * t3) * dg
+                 + (t3 - 2 * t2 + t) * m0 + (t3 - t2) * m1)
+        slope = (6 * t - 6 * t2) * dg + (3 * t2 - 4 * t + 1) * m0 + (3 * t2 - 2 * t) * m1
+        # У стоячих планет скорость около нуля — остаёмся с интерполяцией
+        t = np.where(np.abs(slope) > 1e-6, t - value / np.where(slope == 0, 1, slope), t)
+        t = np.clip(t, 0.0, 1.0)
+    return t
+
+
+def _step_root(sky: MonthSky, s: np.ndarray, p, target) -> np.ndarray:
+    """Момент, когда планета p проходит долготу target внутри шага s."""
+    step = sky.jd[1] - sky.jd[0]
+    g0 = _wrap(sky.lons[s, p] - target)
+    dg = _wrap(sky.lons[s + 1, p] - sky.lons[s, p])
+    t = _root(g0, dg, sky.speeds[s, p] * step, sky.speeds[s + 1, p] * step)
+    return sky.jd[s] + t * step
+
+
+def _in_month(sky: MonthSky, jd: np.ndarray) -> np.ndarray:
+    step = sky.jd[1] - sky.jd[0]
+    return (jd >= sky.jd[0] + step) & (jd < sky.jd[-1] - step)
+
+
+def sky_events(sky: MonthSky) -> List[dict]:
+    """Общие события месяца: смены знаков, развороты планет, фазы Луны."""
+    events = []
+
+    # Смены знаков — граница, которую планета пересекла между отсчётами
+    for p in EVENT_PLANETS:
+        signs = (sky.lons[:, p] // 30).astype(int)
+        for s in np.nonzero(signs[:-1] != signs[1:])[0]:
+            forward = _wrap(sky.lons[s + 1, p] - sky.lons[s, p]) > 0
+            boundary = (signs[s + 1] if forward else signs[s]) * 30.0
+            jd = float(_step_root(sky, np.array([s]), p, boundary)[0])
+            events.append({"jd": jd, "type": "ingress", "planet": PLANET_NAMES[p],
+                           "sign": SIGN_ORDER[int(signs[s + 1])], "lon": boundary})
+
+    # Развороты — смена знака скорости, время по интерполяции
+    for p in EVENT_PLANETS:
+        v = sky.speeds[:, p]
+        for s in np.nonzero(np.sign(v[:-1]) != np.sign(v[1:]))[0]:
+            jd = sky.jd[s] + (sky.jd[s + 1] - sky.jd[s]) * v[s] / (v[s] - v[s + 1])
+            events.append({"jd": jd, "type": "station", "planet": PLANET_NAMES[p],
+                           "retrograde": bool(v[s + 1] < 0), "lon": float(sky.lons[s, p])})
+
+    # Фазы Луны — элонгация Луны от Солнца проходит 0/90/180/270
+    step = sky.jd[1] - sky.jd[0]
+    elongation = sky.lons[:, MOON] - sky.lons[:, SUN]
+    rate = (sky.speeds[:, MOON] - sky.speeds[:, SUN]) * step
+    for target, title in PHASES:
+        g = _wrap(elongation - target)
+        (s,) = _crossings(g)
+        t = _root(g[s], _wrap(g[s + 1] - g[s]), rate[s], rate[s + 1])
+        jd = sky.jd[s] + t * step
+        for k, day in enumerate(jd):
+            events.append({"jd": float(day), "type": "phase", "title": title,
+                           "lon": float(sky.lons[s[k], MOON])})
+
+    return [e for e in events if _in_month(sky, np.array([e["jd"]]))[0]]
+
+
+def aspect_events(natal: np.ndarray, sky: MonthSky) -> List[List[dict]]:
+    """Точные транзитные аспекты к натальным точкам для пачки карт (U, 11).
+
+    Как и в ночной рассылке, попадание цели в шаг проверяется интервалом:
+    разница долгот в начале шага d0 ∈ [0, 360) должна лежать в
+    [цель + min(0, −Δ), цель + max(0, −Δ)], где Δ — ход планеты за шаг.
+    Деление по модулю нужно один раз на отсчёт, а не на каждую цель.
+    """
+    natal = np.atleast_2d(natal)
+    results: List[List[dict]] = [[] for _ in range(len(natal))]
+    lons = sky.lons[:, EVENT_PLANETS]
+
+    delta = _wrap(lons[1:] - lons[:-1])
+    lo = np.minimum(0.0, -delta)
+    width = np.abs(delta).astype(np.float32)
+    starts = [((offset + lo) % 360.0).astype(np.float32) for offset in TARGET_OFFSETS]
+
+    for first in range(0, len(natal), USER_CHUNK):
+        chunk = natal[first:first + USER_CHUNK]
+        # (U, шаги, планеты, натальные точки); NaN не проходит ни одно сравнение
+        d0 = ((lons[None, :-1, :, None] - chunk[:, None, None, :]) % 360.0).astype(np.float32)
+
+        for k, start in enumerate(starts):
+            start4 = start[None, :, :, None]
+            end4 = start4 + width[None, :, :, None]
+            exact = (d0 >= start4) & (d0 <= end4)
+            exact |= d0 <= end4 - 360.0
+            u, s, p, n = np.nonzero(exact)
+            if len(u) == 0:
+                continue
+
+            planets = EVENT_PLANETS[p]
+            jd = _step_root(sky, s, planets, chunk[u, n] + TARGET_OFFSETS[k])
+            keep = np.nonzero(_in_month(sky, jd))[0]
+            for idx in keep:
+                results[first + u[idx]].append({
+                    "jd": float(jd[idx]),
+                    "type": "aspect",
+                    "planet": PLANET_NAMES[planets[idx]],
+                    "natal": CHART_POINTS[n[idx]],
+                    "aspect": int(TARGET_ASPECTS[k]),
+                })
+    return results
+
+
+def personalize(natal: np.ndarray, shared: List[dict], aspects: List[dict]) -> List[dict]:
+    """Общие события с привязкой к карте + личные аспекты, по времени."""
+    asc = natal[-1]
+    events = []
+    for event in shared:
+        event = dict(event)
+        if event["type"] == "ingress" and not np.isnan(asc):
+            # Номер равного дома от Асцендента, куда входит планета
+            event["house"] = int(((event["lon"] - asc) % 360) // 30) + 1
+        if event["type"] == "phase" and event["title"] in (PHASES[0][1], PHASES[2][1]):
+            dist = np.abs(_wrap(event["lon"] - natal))
+            dist = np.where(np.isnan(dist), np.inf, dist)
+            if dist.min() <= PHASE_ORB:
+                event["natal"] = CHART_POINTS[int(dist.argmin())]
+        events.append(event)
+    events.extend(aspects)
+    events.sort(key=lambda e: e["jd"])
+    for event in events:
+        event["time"] = _jd_to_iso(event.pop("jd"))
+        event.pop("lon", None)
+    return events
+
+
+def _jd_to_iso(jd: float) -> str:
+    moment = datetime(2000, 1, 1, 12) + timedelta(days=float(jd) - ephemeris.J2000)
+    return moment.replace(second=0, microsecond=0).isoformat()
+
+
+def build_calendars(natal: np.ndarray, year: int, month: int) -> List[List[dict]]:
+    """Календари месяца для пачки натальных карт (U, 11)."""
+    sky = month_sky(year, month)
+    shared = sky_events(sky)
+    return [
+        personalize(chart, shared, aspects)
+        for chart, aspects in zip(np.atleast_2d(natal), aspect_events(natal, sky))
+    ]
+
+
+def event_text(event: dict) -> str:
+    """Строка события для экрана."""
+    if event["type"] == "aspect":
+        _, _, _, aspect_ru, _ = ASPECTS[event["aspect"]]
+        return f"{PLANETS_RU[event['planet']]} — {aspect_ru} к {NATAL_RU[event['natal']]}"
+    if event["type"] == "ingress":
+        house = f", ваш {event['house']} дом" if "house" in event else ""
+        sign = f"{astrology.SIGN_EMOJIS.get(event['sign'], '')} {event['sign']}"
+        return f"{PLANETS_RU[event['planet']]} входит в {sign}{house}"
+    if event["type"] == "station":
+        motion = "разворачивается назад ℞" if event["retrograde"] else "снова идёт прямо"
+        return f"{PLANETS_RU[event['planet']]} {motion}"
+    near = f" — рядом с {NATAL_RU[event['natal']]}" if "natal" in event else ""
+    return f"{event['title']}{near}"
+
+
+class TransitCalendar:
+    """Календари пользователей в Redis и их фоновый пересчёт."""
+
+    def __init__(self) -> None:
+        self.redis: Optional[Redis] = None
+
+    def setup(self, redis: Redis) -> None:
+        self.redis = redis
+
+    @staticmethod
+    def _key(user_id: int, year: int, month: int) -> str:
+        return f"calendar:{user_id}:{year:04d}-{month:02d}"
+
+    async def get(self, user_id: int, birth_key: str, natal: np.ndarray, year: int, month: int) -> List[dict]:
+        """Календарь из кэша; при промахе или смене данных рождения — расчёт."""
+        key = self._key(user_id, year, month)
+        raw = await self.redis.get(key) if self.redis else None
+        if raw:
+            cached = json.loads(raw)
+            if cached["birth_key"] == birth_key:
+                return cached["events"]
+
+        loop = asyncio.get_running_loop()
+        calendars = await loop.run_in_executor(None, build_calendars, natal, year, month)
+        if self.redis:
+            await self.redis.setex(
+                key, CALENDAR_TTL,
+                json.dumps({"birth_key": birth_key, "events": calendars[0]}, ensure_ascii=False),
+            )
+        return calendars[0]
+
+    async def precompute_month(self, page_size: int = PAGE_SIZE) -> int:
+        """Считает календари текущего месяца для всех подписчиков (один раз за месяц)."""
+        today = datetime.now(timezone.utc).date()
+        done_key = f"calendar:done:{today:%Y-%m}"
+        if await self.redis.get(done_key):
+            return 0
+
+        loop = asyncio.get_running_loop()
+        total = 0
+        last_id = 0
+        while True:
+            async with async_session() as session:
+                result = await session.execute(
+                    select(ChartCache.user_id, ChartCache.birth_key, ChartCache.packed)
+                    .join(User, User.id == ChartCache.user_id)
+                    .where(
+                        ChartCache.user_id > last_id,
+                        User.subscription_type.in_(("premium", "expert")),
+                    )
+                    .order_by(ChartCache.user_id)
+                    .limit(page_size)
+                )
+                rows = result.all()
+            if not rows:
+                break
+
+            natal = unpack_longitudes_many(row[2] for row in rows)
+            calendars = await loop.run_in_executor(
+                None, build_calendars, natal, today.year, today.month
+            )
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for (user_id, birth_key, _), events in zip(rows, calendars):
+                    pipe.setex(
+                        self._key(user_id, today.year, today.month), CALENDAR_TTL,
+                        json.dumps({"birth_key": birth_key, "events": events}, ensure_ascii=False),
+                    )
+                await pipe.execute()
+
+            total += len(rows)
+            last_id = rows[-1][0]
+
+        await self.redis.setex(done_key, CALENDAR_TTL, 1)
+        logger.info("Month calendars precomputed", month=f"{today:%Y-%m}", users=total)
+        return total
+
+
+# Глобальный экземпляр
+transit_calendar = TransitCalendar()
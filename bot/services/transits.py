@@ -0,0 +1,120 @@
+"""Транзитный движок — аспекты транзитных планет к натальной карте.
+
+Весь поиск аспектов — одна векторная операция над матрицей углов
+10 транзитных планет × 11 натальных точек (10 планет + Асцендент).
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+from bot.services.astrology_engine import CHART_POINTS, PLANET_NAMES
+
+# Мажорные аспекты: (ключ, угол, орбис, название, характер)
+ASPECTS = (
+    ("conjunction", 0.0, 3.0, "соединение", "fusion"),
+    ("sextile", 60.0, 2.0, "секстиль", "soft"),
+    ("square", 90.0, 3.0, "квадрат", "hard"),
+    ("trine", 120.0, 2.5, "трин", "soft"),
+    ("opposition", 180.0, 3.0, "оппозиция", "hard"),
+)
+
+ASPECT_KEYS = tuple(a[0] for a in ASPECTS)
+ASPECT_ANGLES = np.array([a[1] for a in ASPECTS])
+ASPECT_ORBS = np.array([a[2] for a in ASPECTS])
+
+PLANETS_RU = {
+    "Sun": "☉ Солнце", "Moon": "☽ Луна", "Mercury": "☿ Меркурий",
+    "Venus": "♀ Венера", "Mars": "♂ Марс", "Jupiter": "♃ Юпитер",
+    "Saturn": "♄ Сатурн", "Uranus": "♅ Уран", "Neptune": "♆ Нептун",
+    "Pluto": "♇ Плутон", "Ascendant": "↑ Асцендент",
+}
+
+# Натальные точки в родительном/дательном смысле для текста
+NATAL_RU = {
+    "Sun": "натальному Солнцу", "Moon": "натальной Луне",
+    "Mercury": "натальному Меркурию", "Venus": "натальной Венере",
+    "Mars": "натальному Марсу", "Jupiter": "натальному Юпитеру",
+    "Saturn": "натальному Сатурну", "Uranus": "натальному Урану",
+    "Neptune": "натальному Нептуну", "Pluto": "натальному Плутону",
+    "Ascendant": "Асценденту",
+}
+
+ASPECT_THEMES = {
+    "fusion": "энергии сливаются — тема звучит громко",
+    "soft": "поддержка и лёгкость, хорошо использовать момент",
+    "hard": "напряжение, которое подталкивает к действию",
+}
+
+# Медленные планеты дают долгие и ощутимые транзиты
+SLOW_PLANETS = {"Jupiter", "Saturn", "Uranus", "Neptune", "Pluto"}
+
+
+class TransitEngine:
+    """Векторный поиск аспектов транзит → натал."""
+
+    def aspect_matrix(
+        self,
+        natal_lons: np.ndarray,
+        transit_lons: np.ndarray,
+        transit_speeds: np.ndarray,
+    ) -> Dict[str, np.ndarray]:
+        """Считает матрицы аспектов 10×11 за один проход.
+
+        Возвращает индексы аспекта, отклонение от точного угла, маску
+        попадания в орбис и признак сходящегося (applying) аспекта.
+        """
+        # Знаковая разница долгот в диапазоне [-180, 180)
+        diff = (transit_lons[:, None] - natal_lons[None, :] + 180.0) % 360.0 - 180.0
+        sep = np.abs(diff)
+
+        # Отклонение от каждого из аспектов: 10×11×5
+        dev = np.abs(sep[..., None] - ASPECT_ANGLES)
+        kind = dev.argmin(axis=-1)
+        orb = np.take_along_axis(dev, kind[..., None], axis=-1)[..., 0]
+        hit = orb <= ASPECT_ORBS[kind]
+
+        # Аспект сходится, если отклонение от точного угла уменьшается:
+        # d|sep - angle|/dt = sign(sep - angle) · sign(diff) · speed
+        angle = ASPECT_ANGLES[kind]
+        applying = np.sign(sep - angle) * np.sign(diff) * transit_speeds[:, None] < 0
+
+        return {"kind": kind, "orb": orb, "hit": hit, "applying": applying}
+
+    def find_aspects(
+        self,
+        natal_lons: np.ndarray,
+        transit_lons: np.ndarray,
+        transit_speeds: np.ndarray,
+    ) -> List[Dict]:
+        """Возвращает транзитные аспекты, отсортированные по точности."""
+        m = self.aspect_matrix(natal_lons, transit_lons, transit_speeds)
+
+        ti, ni = np.nonzero(m["hit"])
+        order = np.argsort(m["orb"][ti, ni], kind="stable")
+
+        transits = []
+        for t, n in zip(ti[order], ni[order]):
+            key, _, _, aspect_ru, nature = ASPECTS[m["kind"][t, n]]
+            planet = PLANET_NAMES[t]
+            natal = CHART_POINTS[n]
+            orb = float(m["orb"][t, n])
+            applying = bool(m["applying"][t, n])
+            state = "сходящийся" if applying else "расходящийся"
+            transits.append({
+                "planet": planet,
+                "aspect": key,
+                "natal_planet": natal,
+                "orb": round(orb, 2),
+                "applying": applying,
+                "meaning": (
+                    f"{PLANETS_RU[planet]} — {aspect_ru} к {NATAL_RU[natal]} "
+                    f"(орбис {orb:.1f}°, {state}): {ASPECT_THEMES[nature]}"
+                ),
+                "intensity": "high" if orb < 1.0 or planet in SLOW_PLANETS else "medium",
+            })
+        return transits
+
+
+# Глобальный экземпляр
+transit_engine = TransitEngine()
@@ -134,14 +134,11 @@ NUMEROLOGY_FULL_REPORT_TEMPLATE = """🔮 {name}, твой нумерологи
 
 TAROT_THREE_CARDS_TEMPLATE = """🃏 {name}, твой расклад говорит о переломе
 
-<b>Прошлое — {past_card}{past_reversed}:</b>
-{past_story}
+{past}
 
-<b>Настоящее — {present_card}{present_reversed}:</b>
-{present_story}
+{present}
 
-<b>Будущее — {future_card}{future_reversed}:</b>
-{future_story}
+{future}
 
 ⚡ Ключевой вопрос:
 {key_question}
@@ -151,9 +148,7 @@ TAROT_THREE_CARDS_TEMPLATE = """🃏 {name}, твой расклад говор
 
 TAROT_DAILY_TEMPLATE = """🌅 Доброе {time_of_day}, {name}!
 
-<b>Твоя карта дня — {card_name}{reversed}:</b>
-
-{card_story}
+{card}
 
 💡 Совет дня:
 {advice}
@@ -169,19 +164,28 @@ TAROT_DECISION_TEMPLATE = """⚡ {name}, расклад для твоего во
 
 <b>Вопрос:</b> {question}
 
-<b>Вариант А — {left_card}{left_reversed}:</b>
-{left_story}
+{left}
 
-<b>Вариант Б — {right_card}{right_reversed}:</b>
-{right_story}
+{right}
 
-<b>Суть ситуации — {center_card}{center_reversed}:</b>
-{center_story}
+{center}
 
 🎯 Рекомендация:
 {recommendation}
 """
 
+# Блок карты в повествовательном раскладе по стилю позиции.
+# Собираются заранее для каждой карты (bot.services.tarot_render).
+TAROT_CARD_BLOCKS = {
+    "past": "<b>Прошлое — {card}{reversed}:</b>\n{story}",
+    "present": "<b>Настоящее — {card}{reversed}:</b>\n{story}",
+    "future": "<b>Будущее — {card}{reversed}:</b>\n{story}",
+    "option_a": "<b>Вариант А — {card}{reversed}:</b>\n{story}",
+    "option_b": "<b>Вариант Б — {card}{reversed}:</b>\n{story}",
+    "core": "<b>Суть ситуации — {card}{reversed}:</b>\n{story}",
+    "daily": "<b>Твоя карта дня — {card}{reversed}:</b>\n\n{story}",
+}
+
 # ═══════════════════════════════════════════════════════════
 # ПРИВЕТСТВИЯ ПО ВРЕМЕНИ СУТОК
 # ═══════════════════════════════════════════════════════════
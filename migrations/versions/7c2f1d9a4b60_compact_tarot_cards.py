@@ -0,0 +1,168 @@
+"""Compact tarot_readings.cards_json into packed card ids
+
+Каждая карта расклада хранилась в JSON целиком — с названиями, ключевыми
+словами и абзацем значения. Теперь в колонке cards по два байта на карту
+(номер карты, перевёрнута, номер позиции), тексты берутся из колоды.
+
+Размер таблицы до и после пишется в лог. Место, занятое старыми версиями
+строк и TOAST, освобождается только после `VACUUM FULL tarot_readings`
+(вне транзакции, таблица на это время блокируется).
+
+Revision ID: 7c2f1d9a4b60
+Revises:
+Create Date: 2026-10-19 12:00:00
+
+"""
+import json
+import logging
+import struct
+from pathlib import Path
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c2f1d9a4b60"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+BATCH = 5_000
+
+# Позиции раскладов на момент ревизии — код бота сюда не импортируется
+POSITIONS = {
+    "three_cards": ["Ситуация", "Действие", "Результат"],
+    "decision": ["Вариант А", "Вариант Б", "Совет"],
+    "daily": ["Энергия дня"],
+    "celtic_cross": [
+        "Суть ситуации", "Препятствие", "Сознательное",
+        "Подсознательное", "Прошлое", "Будущее",
+        "Ваша позиция", "Окружение", "Надежды/Страхи", "Итог",
+    ],
+}
+REVERSED_BIT = 0x80
+CARD_MASK = 0x7F
+POSITION_SHIFT = 8
+# Тексты карт для отката — из данных колоды RWS (номера карт в ней те же)
+DECK_SOURCE = Path(__file__).resolve().parents[2] / "bot" / "data" / "decks" / "rws.json"
+
+readings = sa.table(
+    "tarot_readings",
+    sa.column("id", sa.Integer),
+    sa.column("spread_type", sa.String),
+    sa.column("cards_json", sa.JSON),
+    sa.column("cards", sa.LargeBinary),
+)
+
+
+def _table_size(bind) -> str:
+    return bind.execute(sa.text("SELECT pg_size_pretty(pg_total_relation_size('tarot_readings'))")).scalar()
+
+
+def _has_column(bind, column: str) -> bool:
+    inspector = sa.inspect(bind)
+    if "tarot_readings" not in inspector.get_table_names():
+        return False
+    return column in {c["name"] for c in inspector.get_columns("tarot_readings")}
+
+
+def _pack_json(spread_type: str, items: list) -> bytes:
+    """Старый JSON расклада → раскладка pack_cards; позиция — по названию в раскладе."""
+    positions = POSITIONS.get(spread_type, [])
+    codes = []
+    for i, item in enumerate(items or []):
+        card = item.get("card", item)
+        position = item.get("position")
+        index = positions.index(position) if position in positions else i
+        codes.append(int(card["id"]) | (REVERSED_BIT if card.get("reversed") else 0) | index << POSITION_SHIFT)
+    return struct.pack(f"<{len(codes)}H", *codes)
+
+
+def _unpack_json(spread_type: str, data: bytes, cards: dict) -> list:
+    """Обратно: упакованные карты → прежний JSON расклада с текстами карт."""
+    positions = POSITIONS.get(spread_type, [])
+    items = []
+    for code in struct.unpack(f"<{len(data) // 2}H", data):
+        index, reversed_ = code >> POSITION_SHIFT, bool(code & REVERSED_BIT)
+        card = cards[code & CARD_MASK]
+        items.append({
+            "position": positions[index] if index < len(positions) else "",
+            "card": {
+                "id": card["id"], "name": card["name"], "name_ru": card["name_ru"],
+                "suit": card["suit"], "arcana": card["arcana"],
+                "reversed": reversed_, "keywords": card["keywords"],
+                "meaning": (card["reversed"] if reversed_ and card["reversed"] else card["upright"]),
+            },
+        })
+    return items
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Свежая база: init_db создаст таблицу сразу в новом виде
+    if not _has_column(bind, "cards_json"):
+        return
+
+    before = _table_size(bind)
+    op.add_column("tarot_readings", sa.Column("cards", sa.LargeBinary(), nullable=True))
+
+    total = 0
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(readings.c.id, readings.c.spread_type, readings.c.cards_json)
+            .where(readings.c.id > last_id)
+            .order_by(readings.c.id)
+            .limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            readings.update().where(readings.c.id == sa.bindparam("row_id")),
+            [{"row_id": row_id, "cards": _pack_json(spread, items)} for row_id, spread, items in rows],
+        )
+        total += len(rows)
+        last_id = rows[-1][0]
+
+    op.alter_column("tarot_readings", "cards", nullable=False)
+    op.drop_column("tarot_readings", "cards_json")
+    logger.info(
+        "tarot_readings compacted: %s rows, table %s -> %s (space returns after VACUUM FULL)",
+        total, before, _table_size(bind),
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if not _has_column(bind, "cards"):
+        return
+
+    op.add_column("tarot_readings", sa.Column("cards_json", sa.JSON(), nullable=True))
+    cards = {card["id"]: card for card in json.loads(DECK_SOURCE.read_text(encoding="utf-8"))["cards"]}
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(readings.c.id, readings.c.spread_type, readings.c.cards)
+            .where(readings.c.id > last_id)
+            .order_by(readings.c.id)
+            .limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            readings.update().where(readings.c.id == sa.bindparam("row_id")),
+            [
+                {
+                    "row_id": row_id,
+                    "cards_json": _unpack_json(spread, data, cards),
+                }
+                for row_id, spread, data in rows
+            ],
+        )
+        last_id = rows[-1][0]
+
+    op.alter_column("tarot_readings", "cards_json", nullable=False)
+    op.drop_column("tarot_readings", "cards")
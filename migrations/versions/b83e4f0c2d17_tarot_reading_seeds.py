@@ -0,0 +1,105 @@
+"""Tarot readings stored as seed plus deck version
+
+Новые расклады сохраняются зерном и версией колоды — карты повторяются
+tarot.replay_spread(). У прежних записей зерна нет, их карты остаются в
+упакованной колонке cards, которая становится необязательной.
+
+Revision ID: b83e4f0c2d17
+Revises: 7c2f1d9a4b60
+Create Date: 2026-10-19 15:00:00
+
+"""
+import random
+import struct
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b83e4f0c2d17"
+down_revision: Union[str, None] = "7c2f1d9a4b60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Вытягивание версии колоды 1 на момент ревизии — код бота сюда не импортируется:
+# 78 карт, доля перевёрнутых 0.3, на карту rnd() для выбора и rnd() для переворота
+DECK_SIZE = 78
+REVERSED_RATE = 0.3
+CARDS_COUNT = {"three_cards": 3, "decision": 3, "daily": 1, "celtic_cross": 10}
+
+
+def _replay_v1(seed: int, count: int) -> list[tuple[int, bool]]:
+    """(номер карты, перевёрнута) расклада по зерну — разреженная тасовка Фишера — Йетса."""
+    rnd = random.Random(seed).random
+    swaps: dict = {}
+    cards = []
+    for i in range(min(count, DECK_SIZE)):
+        j = i + int(rnd() * (DECK_SIZE - i))
+        pick = swaps.get(j, j)
+        swaps[j] = swaps.get(i, i)
+        cards.append((pick, rnd() < REVERSED_RATE))
+    return cards
+
+
+def _pack(cards: list[tuple[int, bool]]) -> bytes:
+    """Раскладка pack_cards: номер карты, бит переворота 0x80, позиция в старшем байте."""
+    return struct.pack(
+        f"<{len(cards)}H",
+        *(card_id | (0x80 if reversed_ else 0) | i << 8 for i, (card_id, reversed_) in enumerate(cards)),
+    )
+
+
+def _columns(bind) -> set:
+    inspector = sa.inspect(bind)
+    if "tarot_readings" not in inspector.get_table_names():
+        return set()
+    return {c["name"] for c in inspector.get_columns("tarot_readings")}
+
+
+def upgrade() -> None:
+    columns = _columns(op.get_bind())
+    # Свежая база: init_db создаст таблицу сразу в новом виде
+    if not columns or "seed" in columns:
+        return
+    op.add_column("tarot_readings", sa.Column("seed", sa.BigInteger(), nullable=True))
+    op.add_column("tarot_readings", sa.Column("deck_version", sa.SmallInteger(), nullable=True))
+    op.alter_column("tarot_readings", "cards", nullable=True)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if "seed" not in _columns(bind):
+        return
+
+    readings = sa.table(
+        "tarot_readings",
+        sa.column("id", sa.Integer),
+        sa.column("spread_type", sa.String),
+        sa.column("seed", sa.BigInteger),
+        sa.column("deck_version", sa.SmallInteger),
+        sa.column("cards", sa.LargeBinary),
+    )
+    rows = bind.execute(
+        sa.select(readings.c.id, readings.c.spread_type, readings.c.seed, readings.c.deck_version)
+        .where(readings.c.seed.is_not(None))
+    ).all()
+    versions = {version for _, _, _, version in rows} - {1}
+    if versions:
+        raise ValueError(f"Unknown deck versions: {sorted(versions)}")
+    if rows:
+        bind.execute(
+            readings.update().where(readings.c.id == sa.bindparam("row_id")),
+            [
+                {
+                    "row_id": row_id,
+                    "cards": _pack(_replay_v1(seed, CARDS_COUNT[spread])),
+                }
+                for row_id, spread, seed, _ in rows
+            ],
+        )
+
+    op.alter_column("tarot_readings", "cards", nullable=False)
+    op.drop_column("tarot_readings", "deck_version")
+    op.drop_column("tarot_readings", "seed")
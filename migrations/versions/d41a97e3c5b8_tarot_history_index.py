@@ -0,0 +1,67 @@
+"""Covering index for tarot reading history
+
+История раскладов листается по ключу (user_id, created_at, id); колонки
+списка лежат в INCLUDE, и страница читается только из индекса. Прежний
+индекс по user_id — префикс нового, он удаляется.
+
+Индекс строится CONCURRENTLY, без блокировки записи раскладов.
+
+Revision ID: d41a97e3c5b8
+Revises: b83e4f0c2d17
+Create Date: 2026-10-19 18:00:00
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d41a97e3c5b8"
+down_revision: Union[str, None] = "b83e4f0c2d17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(bind) -> bool:
+    return "tarot_readings" in sa.inspect(bind).get_table_names()
+
+
+def upgrade() -> None:
+    # Свежая база: init_db создаст таблицу сразу с индексом
+    if not _has_table(op.get_bind()):
+        return
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tarot_readings_history",
+            "tarot_readings",
+            ["user_id", "created_at", "id"],
+            postgresql_include=["spread_type", "seed", "deck_version", "cards"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_tarot_readings_user_id",
+            table_name="tarot_readings",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    if not _has_table(op.get_bind()):
+        return
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tarot_readings_user_id",
+            "tarot_readings",
+            ["user_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_tarot_readings_history",
+            table_name="tarot_readings",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
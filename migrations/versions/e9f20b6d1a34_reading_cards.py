@@ -0,0 +1,137 @@
+"""reading_cards: card occurrences per reading for search
+
+Карты раскладов построчно — для поиска «где выпала Башня перевёрнутой» и
+статистики мастей по индексам. Таблица заполняется по существующим
+раскладам: карты восстанавливаются по зерну или из упакованной колонки.
+
+Revision ID: e9f20b6d1a34
+Revises: d41a97e3c5b8
+Create Date: 2026-10-19 21:00:00
+
+"""
+import logging
+import random
+import struct
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import insert
+
+# revision identifiers, used by Alembic.
+revision: str = "e9f20b6d1a34"
+down_revision: Union[str, None] = "d41a97e3c5b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+BATCH = 5_000
+
+# Колода и вытягивание версии 1 на момент ревизии — код бота сюда не импортируется
+DECK_SIZE = 78
+REVERSED_RATE = 0.3
+CARDS_COUNT = {"three_cards": 3, "decision": 3, "daily": 1, "celtic_cross": 10}
+REVERSED_BIT = 0x80
+CARD_MASK = 0x7F
+
+readings = sa.table(
+    "tarot_readings",
+    sa.column("id", sa.Integer),
+    sa.column("user_id", sa.Integer),
+    sa.column("spread_type", sa.String),
+    sa.column("seed", sa.BigInteger),
+    sa.column("deck_version", sa.SmallInteger),
+    sa.column("cards", sa.LargeBinary),
+    sa.column("created_at", sa.DateTime(timezone=True)),
+)
+
+
+def _replay_v1(seed: int, count: int) -> list[tuple[int, bool]]:
+    """(номер карты, перевёрнута) расклада по зерну — разреженная тасовка Фишера — Йетса."""
+    rnd = random.Random(seed).random
+    swaps: dict = {}
+    cards = []
+    for i in range(min(count, DECK_SIZE)):
+        j = i + int(rnd() * (DECK_SIZE - i))
+        pick = swaps.get(j, j)
+        swaps[j] = swaps.get(i, i)
+        cards.append((pick, rnd() < REVERSED_RATE))
+    return cards
+
+
+def _reading_cards(row) -> list[tuple[int, bool]]:
+    """Карты расклада: по зерну, у старых записей — из упакованной колонки cards."""
+    if row.seed is not None:
+        if row.deck_version != 1:
+            raise ValueError(f"Unknown deck version: {row.deck_version}")
+        return _replay_v1(row.seed, CARDS_COUNT[row.spread_type])
+    codes = struct.unpack(f"<{len(row.cards) // 2}H", row.cards)
+    return [(code & CARD_MASK, bool(code & REVERSED_BIT)) for code in codes]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    tables = sa.inspect(bind).get_table_names()
+    # Свежая база: init_db создаст таблицы сами
+    if "tarot_readings" not in tables:
+        return
+
+    if "reading_cards" not in tables:
+        reading_cards = op.create_table(
+            "reading_cards",
+            sa.Column("reading_id", sa.Integer(), nullable=False),
+            sa.Column("position", sa.SmallInteger(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("card_id", sa.SmallInteger(), nullable=False),
+            sa.Column("reversed", sa.Boolean(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+            sa.PrimaryKeyConstraint("reading_id", "position"),
+        )
+    else:
+        reading_cards = sa.Table("reading_cards", sa.MetaData(), autoload_with=bind)
+
+    total = 0
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(readings).where(readings.c.id > last_id).order_by(readings.c.id).limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        values = [
+            {
+                "reading_id": row.id,
+                "position": position,
+                "user_id": row.user_id,
+                "card_id": card_id,
+                "reversed": reversed_,
+                "created_at": row.created_at,
+            }
+            for row in rows
+            for position, (card_id, reversed_) in enumerate(_reading_cards(row))
+        ]
+        # Лимит параметров asyncpg — 32767, по шесть на строку
+        for start in range(0, len(values), BATCH):
+            bind.execute(insert(reading_cards).values(values[start:start + BATCH]).on_conflict_do_nothing())
+        total += len(rows)
+        last_id = rows[-1].id
+
+    # Индексы — после заполнения, так быстрее
+    op.create_index(
+        "ix_reading_cards_search", "reading_cards",
+        ["user_id", "card_id", "reversed", "created_at"], if_not_exists=True,
+    )
+    op.create_index(
+        "ix_reading_cards_period", "reading_cards", ["user_id", "created_at"],
+        postgresql_include=["card_id", "reversed", "reading_id"], if_not_exists=True,
+    )
+    op.create_index(
+        "ix_reading_cards_created", "reading_cards", ["created_at"],
+        postgresql_using="brin", if_not_exists=True,
+    )
+    logger.info("reading_cards filled from %s readings", total)
+
+
+def downgrade() -> None:
+    op.drop_table("reading_cards", if_exists=True)
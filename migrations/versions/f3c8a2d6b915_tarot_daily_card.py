@@ -0,0 +1,63 @@
+"""Daily card: one tarot reading per user and local date
+
+Карта дня выводится из (user_id, местная дата) и сохраняется одной
+строкой на день: колонка daily_date и частичный уникальный индекс по
+(user_id, daily_date). Старые расклады «Карта дня» остаются обычными
+записями истории с пустой daily_date.
+
+Индекс строится CONCURRENTLY, без блокировки записи раскладов.
+
+Revision ID: f3c8a2d6b915
+Revises: e9f20b6d1a34
+Create Date: 2026-10-19 23:00:00
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3c8a2d6b915"
+down_revision: Union[str, None] = "e9f20b6d1a34"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns(bind) -> set:
+    inspector = sa.inspect(bind)
+    if "tarot_readings" not in inspector.get_table_names():
+        return set()
+    return {column["name"] for column in inspector.get_columns("tarot_readings")}
+
+
+def upgrade() -> None:
+    columns = _columns(op.get_bind())
+    # Свежая база: init_db создаст таблицу сразу с колонкой и индексом
+    if not columns:
+        return
+    if "daily_date" not in columns:
+        op.add_column("tarot_readings", sa.Column("daily_date", sa.Date(), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_tarot_readings_daily",
+            "tarot_readings",
+            ["user_id", "daily_date"],
+            unique=True,
+            postgresql_where=sa.text("daily_date IS NOT NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    if "daily_date" not in _columns(op.get_bind()):
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "uq_tarot_readings_daily",
+            table_name="tarot_readings",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("tarot_readings", "daily_date")